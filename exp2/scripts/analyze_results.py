@@ -12,18 +12,31 @@ from pathlib import Path
 from typing import List, Dict, Any
 from datetime import datetime
 
+from result_log import RESULTS_LOG, latest_results, prompt_mode
+
 # Configuration
 RESULTS_FILE = Path("../outputs/extraction_results.json")
 ANALYSIS_FILE = Path("../outputs/analysis_results.json")
 REPORT_FILE = Path("../outputs/final_report.md")
 
+# Claude Haiku 4.5 pricing, USD per million tokens (cache writes are 1.25x
+# the input price, cache reads 0.1x)
+PRICE_INPUT = 1.00
+PRICE_OUTPUT = 5.00
+PRICE_CACHE_WRITE = 1.25
+PRICE_CACHE_READ = 0.10
+# Message Batches requests are billed at half price
+BATCH_DISCOUNT = 0.5
+
 
 def load_results(results_file: Path) -> List[Dict[str, Any]]:
     """
-    Load extraction results from JSON file.
+    Load extraction results from the JSONL result log or a JSON file.
+
+    The log is read line by line, keeping the latest result per test.
 
     Args:
-        results_file: Path to extraction_results.json
+        results_file: Path to extraction_results.jsonl or extraction_results.json
 
     Returns:
         List of result dictionaries
@@ -31,10 +44,134 @@ def load_results(results_file: Path) -> List[Dict[str, Any]]:
     if not results_file.exists():
         raise FileNotFoundError(f"Results file not found: {results_file}")
 
+    if results_file.suffix == ".jsonl":
+        return latest_results(results_file)
+
     with open(results_file, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+def total_input_tokens(result: Dict[str, Any]) -> int:
+    """Input tokens including those written to or read from the prompt cache."""
+    return (result.get("input_tokens", 0)
+            + result.get("cache_creation_input_tokens", 0)
+            + result.get("cache_read_input_tokens", 0))
+
+
+def compute_cost(result: Dict[str, Any], with_cache: bool = True) -> float:
+    """
+    Cost of one request in USD (discounted for Message Batches results).
+
+    Args:
+        result: Single test result
+        with_cache: Price cache writes/reads at cache rates; False prices
+            every input token at the base rate (the cost without caching)
+
+    Returns:
+        Cost in USD
+    """
+    output_cost = result.get("output_tokens", 0) * PRICE_OUTPUT
+    if not with_cache:
+        cost = total_input_tokens(result) * PRICE_INPUT + output_cost
+    else:
+        cost = (
+            result.get("input_tokens", 0) * PRICE_INPUT
+            + result.get("cache_creation_input_tokens", 0) * PRICE_CACHE_WRITE
+            + result.get("cache_read_input_tokens", 0) * PRICE_CACHE_READ
+            + output_cost
+        )
+    if result.get("batch"):
+        cost *= BATCH_DISCOUNT
+    return cost / 1e6
+
+
+def compute_cache_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare cost and latency of runs per prompt mode.
+
+    Modes are "combined" (the combined files), "blocks" (one content block
+    per document, no breakpoints) and "cached" (the same blocks with cache
+    breakpoints). "blocks" and "cached" differ only by ``cache_control``,
+    so they isolate the effect of caching.
+
+    Args:
+        results: List of individual test results
+
+    Returns:
+        Metrics per mode present in the results
+    """
+    metrics = {}
+    for mode in ("combined", "blocks", "cached"):
+        tests = [r for r in results if prompt_mode(r) == mode and r.get("input_tokens", 0) > 0]
+        if not tests:
+            continue
+
+        latency_by_docs = {}
+        for t in tests:
+            latency_by_docs.setdefault(t["num_documents"], []).append(t["response_time_ms"])
+
+        cost = sum(compute_cost(t) for t in tests)
+        cost_without_cache = sum(compute_cost(t, with_cache=False) for t in tests)
+        metrics[mode] = {
+            "num_tests": len(tests),
+            "avg_response_time_ms": round(statistics.mean(t["response_time_ms"] for t in tests), 2),
+            "avg_response_time_ms_by_doc_count": {
+                str(n): round(statistics.mean(times), 2) for n, times in sorted(latency_by_docs.items())
+            },
+            "total_input_tokens": sum(total_input_tokens(t) for t in tests),
+            "cache_creation_input_tokens": sum(t.get("cache_creation_input_tokens", 0) for t in tests),
+            "cache_read_input_tokens": sum(t.get("cache_read_input_tokens", 0) for t in tests),
+            "total_cost_usd": round(cost, 4),
+            "cost_without_cache_usd": round(cost_without_cache, 4),
+            "cost_savings_pct": round((1 - cost / cost_without_cache) * 100, 1) if cost_without_cache else 0.0,
+        }
+    return metrics
+
+
+def compute_ttft_analysis(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Relate time-to-first-token to input size for streamed results.
+
+    A least-squares line ``ttft_ms = intercept + slope * input_tokens / 1000``
+    is fitted to uncached runs (cached prefixes skip most of the prefill).
+
+    Args:
+        results: List of individual test results
+
+    Returns:
+        Dict with per-request ``points`` and the fitted line, or an empty
+        dict when no streamed results are present
+    """
+    streamed = [r for r in results if "ttft_ms" in r and r.get("input_tokens", 0) > 0]
+    if not streamed:
+        return {}
+
+    points = [{
+        "num_documents": r["num_documents"],
+        "input_tokens": total_input_tokens(r),
+        "ttft_ms": r["ttft_ms"],
+        "decode_time_ms": r.get("decode_time_ms", 0),
+        "inter_token_ms": r.get("inter_token_ms", 0.0),
+        "prompt_cache": bool(r.get("prompt_cache")),
+    } for r in streamed]
+
+    analysis = {"points": points}
+    fit = [p for p in points if not p["prompt_cache"]]
+    if len(fit) >= 2:
+        x = [p["input_tokens"] / 1000 for p in fit]
+        y = [p["ttft_ms"] for p in fit]
+        mean_x, mean_y = statistics.mean(x), statistics.mean(y)
+        var_x = sum((xi - mean_x) ** 2 for xi in x)
+        slope = sum((xi - mean_x) * (yi - mean_y) for xi, yi in zip(x, y)) / var_x if var_x else 0.0
+        analysis.update({
+            "ttft_ms_per_1k_input_tokens": round(slope, 3),
+            "ttft_intercept_ms": round(mean_y - slope * mean_x, 1),
+            "correlation_tokens_vs_ttft": round(pearson_correlation(x, y), 3),
+        })
+    analysis["avg_inter_token_ms"] = round(statistics.mean(p["inter_token_ms"] for p in points), 2)
+    return analysis
+
+
 def compute_aggregate_metrics(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Compute aggregate metrics by document count.
@@ -67,12 +204,21 @@ def compute_aggregate_metrics(results: List[Dict[str, Any]]) -> List[Dict[str, A
         valid_times = [t["response_time_ms"] for t in tests if t.get("response_time_ms", 0) > 0]
         avg_time = statistics.mean(valid_times) if valid_times else 0
 
-        valid_input_tokens = [t["input_tokens"] for t in tests if t.get("input_tokens", 0) > 0]
+        valid_input_tokens = [total_input_tokens(t) for t in tests if t.get("input_tokens", 0) > 0]
         avg_input_tokens = statistics.mean(valid_input_tokens) if valid_input_tokens else 0
 
         valid_output_tokens = [t["output_tokens"] for t in tests if t.get("output_tokens", 0) > 0]
         avg_output_tokens = statistics.mean(valid_output_tokens) if valid_output_tokens else 0
 
+        streamed = [t for t in tests if "ttft_ms" in t and t.get("input_tokens", 0) > 0]
+        if streamed:
+            ttft_metrics = {
+                "avg_ttft_ms": round(statistics.mean(t["ttft_ms"] for t in streamed), 2),
+                "avg_decode_time_ms": round(statistics.mean(t.get("decode_time_ms", 0) for t in streamed), 2),
+            }
+        else:
+            ttft_metrics = {}
+
         aggregated.append({
             "num_documents": num_docs,
             "accuracy": accuracy,
@@ -80,6 +226,8 @@ def compute_aggregate_metrics(results: List[Dict[str, Any]]) -> List[Dict[str, A
             "avg_input_tokens": int(avg_input_tokens),
             "avg_output_tokens": int(avg_output_tokens),
             "total_tokens": int(avg_input_tokens + avg_output_tokens),
+            "avg_cost_usd": round(statistics.mean(compute_cost(t) for t in tests), 4),
+            **ttft_metrics,
             "num_tests": len(tests)
         })
 
@@ -257,6 +405,56 @@ some increase with document count, but scaling appears manageable.
 
 """
 
+    # Time to first token
+    ttft = analysis.get('ttft_analysis', {})
+    if ttft:
+        report += """
+## Time to First Token
+
+| Documents | Avg TTFT (ms) | Avg Decode (ms) | Avg Total (ms) |
+|-----------|---------------|-----------------|----------------|
+"""
+        for result in by_doc:
+            if 'avg_ttft_ms' in result:
+                report += f"| {result['num_documents']:2d} | {result['avg_ttft_ms']:8.0f} | {result['avg_decode_time_ms']:8.0f} | {result['avg_response_time_ms']:8.0f} |\n"
+
+        if 'ttft_ms_per_1k_input_tokens' in ttft:
+            report += f"""
+- **Prefill cost**: {ttft['ttft_ms_per_1k_input_tokens']:.2f} ms per 1k input tokens (uncached), {ttft['ttft_intercept_ms']:.0f} ms fixed
+- **Input Tokens vs TTFT correlation**: {ttft['correlation_tokens_vs_ttft']:.3f}
+"""
+        report += f"- **Mean inter-token latency**: {ttft['avg_inter_token_ms']:.2f} ms\n"
+
+    # Prompt caching
+    caching = analysis.get('prompt_caching', {})
+    if 'cached' in caching:
+        report += """
+## Prompt Caching
+
+| Mode | Tests | Avg Time (ms) | Input Tokens | Cache Write | Cache Read | Cost (USD) | Cost w/o Cache (USD) | Savings |
+|------|-------|---------------|--------------|-------------|------------|------------|----------------------|---------|
+"""
+        for mode, m in caching.items():
+            report += (f"| {mode} | {m['num_tests']} | {m['avg_response_time_ms']:8.0f} | {m['total_input_tokens']:,} "
+                       f"| {m['cache_creation_input_tokens']:,} | {m['cache_read_input_tokens']:,} "
+                       f"| {m['total_cost_usd']:.4f} | {m['cost_without_cache_usd']:.4f} | {m['cost_savings_pct']:.1f}% |\n")
+
+        baseline = 'blocks' if 'blocks' in caching else 'combined'
+        if baseline in caching:
+            report += f"""
+| Documents | Avg Time Uncached, {baseline} (ms) | Avg Time Cached (ms) |
+|-----------|------------------------------------|----------------------|
+"""
+            cached_times = caching['cached']['avg_response_time_ms_by_doc_count']
+            for num_docs, uncached_time in caching[baseline]['avg_response_time_ms_by_doc_count'].items():
+                cached_time = cached_times.get(num_docs)
+                cached_cell = f"{cached_time:8.0f}" if cached_time is not None else "-"
+                report += f"| {num_docs} | {uncached_time:8.0f} | {cached_cell} |\n"
+            if baseline == 'combined':
+                report += ("\nThe uncached runs used the combined files, a different prompt layout; "
+                           "run with `--prompt-layout blocks` for a baseline that differs only by "
+                           "cache breakpoints.\n")
+
     # Comparison to Experiment 1
     report += f"""
 ## Comparison to Experiment 1
@@ -357,8 +555,9 @@ def main():
     print()
 
     # Load results
-    print(f"Loading results from: {RESULTS_FILE}")
-    results = load_results(RESULTS_FILE)
+    results_file = RESULTS_LOG if RESULTS_LOG.exists() else RESULTS_FILE
+    print(f"Loading results from: {results_file}")
+    results = load_results(results_file)
     print(f"  Loaded {len(results)} test results")
     print()
 
@@ -374,6 +573,17 @@ def main():
         print(f"  {key}: {value:.3f}")
     print()
 
+    ttft_analysis = compute_ttft_analysis(results)
+    if 'ttft_ms_per_1k_input_tokens' in ttft_analysis:
+        print(f"TTFT: {ttft_analysis['ttft_ms_per_1k_input_tokens']:.2f} ms per 1k input tokens "
+              f"+ {ttft_analysis['ttft_intercept_ms']:.0f} ms")
+
+    cache_metrics = compute_cache_metrics(results)
+    for mode, metrics in cache_metrics.items():
+        print(f"  {mode}: {metrics['num_tests']} tests, {metrics['avg_response_time_ms']:.0f}ms avg, "
+              f"${metrics['total_cost_usd']:.4f} (${metrics['cost_without_cache_usd']:.4f} without cache)")
+    print()
+
     # Overall accuracy
     overall_accuracy = sum(r.get("is_correct", False) for r in results) / len(results) if results else 0
     print(f"Overall accuracy: {overall_accuracy * 100:.1f}%")
@@ -396,6 +606,8 @@ def main():
         },
         "results_by_doc_count": aggregated,
         "statistical_analysis": correlations,
+        "prompt_caching": cache_metrics,
+        "ttft_analysis": ttft_analysis,
         "comparison_to_exp1": {
             "exp1_overall_accuracy": 1.0,
             "exp2_overall_accuracy": round(overall_accuracy, 3),
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Async Anthropic Messages API client with rate limiting and retries.
+
+One pooled httpx.AsyncClient is shared by all requests. A RateLimiter holds
+token buckets for requests/minute and input tokens/minute, and failed calls
+(429, 5xx, connection errors) are retried with exponential backoff and
+full jitter, honouring the server's retry-after header. Responses can be
+streamed to time each text delta; an error event in a stream is retried
+only if its error type maps to a retryable status.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import httpx
+
+DEFAULT_BASE_URL = "https://api.anthropic.com"
+ANTHROPIC_VERSION = "2023-06-01"
+RETRYABLE_STATUS = {429, 500, 502, 503, 504, 529}
+# HTTP status of each API error type, for errors that arrive as stream events
+ERROR_TYPE_STATUS = {
+    "invalid_request_error": 400,
+    "authentication_error": 401,
+    "billing_error": 402,
+    "permission_error": 403,
+    "not_found_error": 404,
+    "request_too_large": 413,
+    "rate_limit_error": 429,
+    "api_error": 500,
+    "timeout_error": 504,
+    "overloaded_error": 529,
+}
+
+
+class RetryableStatus(Exception):
+    """A 429/5xx response (or streamed error event) worth retrying."""
+
+    def __init__(self, status: int, retry_after: Optional[str]):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class StreamedError(Exception):
+    """A non-retryable error event received in a streamed response."""
+
+    def __init__(self, status: int, error: Dict[str, Any]):
+        super().__init__(f"HTTP {status} {error.get('type')}: {error.get('message', '')}")
+        self.status = status
+        self.error_type = error.get("type")
+
+
+def stream_error(error: Dict[str, Any]) -> Exception:
+    """Exception for a streamed ``error`` event; unknown types count as ``api_error``."""
+    status = ERROR_TYPE_STATUS.get(error.get("type"), 500)
+    if status in RETRYABLE_STATUS:
+        return RetryableStatus(status, None)
+    return StreamedError(status, error)
+
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket for a per-minute budget.
+
+    A request larger than the bucket waits for a full bucket instead of
+    blocking forever.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Take ``amount`` tokens, sleeping until they are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self.lock:
+            self._refill()
+            while self.tokens < amount:
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self.tokens -= amount
+        return waited
+
+    def adjust(self, amount: float):
+        """Return (negative) or charge (positive) tokens after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    """Requests/minute and input tokens/minute limits (``None`` disables one)."""
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 input_tokens_per_minute: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.input_tokens = TokenBucket(input_tokens_per_minute) if input_tokens_per_minute else None
+
+    async def acquire(self, estimated_input_tokens: int) -> float:
+        """Wait for one request slot and the estimated input tokens."""
+        waited = 0.0
+        if self.requests:
+            waited += await self.requests.acquire(1)
+        if self.input_tokens:
+            waited += await self.input_tokens.acquire(estimated_input_tokens)
+        return waited
+
+    def settle(self, estimated_input_tokens: int, actual_input_tokens: int):
+        """Correct the input token bucket once real usage is known."""
+        if self.input_tokens:
+            self.input_tokens.adjust(actual_input_tokens - estimated_input_tokens)
+
+
+def backoff_delay(attempt: int, base: float, maximum: float, retry_after: Optional[str] = None) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Retry number, starting at 0
+        base: Delay scale in seconds
+        maximum: Upper bound before jitter
+        retry_after: Server ``retry-after`` header (seconds), used as a floor
+    """
+    delay = random.uniform(0, min(maximum, base * (2 ** attempt)))
+    try:
+        return max(delay, float(retry_after)) if retry_after else delay
+    except ValueError:
+        return delay
+
+
+class AsyncMessagesClient:
+    """
+    Pooled async client for POST /v1/messages.
+
+    Use as ``async with AsyncMessagesClient(...) as client``.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, api_key: Optional[str] = None,
+                 limiter: Optional[RateLimiter] = None, max_retries: int = 6,
+                 backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 max_connections: int = 16, timeout: float = 600.0):
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            headers={
+                "x-api-key": api_key or os.environ.get("ANTHROPIC_API_KEY", ""),
+                "anthropic-version": ANTHROPIC_VERSION,
+                "content-type": "application/json",
+            },
+        )
+
+    async def __aenter__(self) -> "AsyncMessagesClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.http.aclose()
+
+    async def create(self, body: Dict[str, Any], estimated_input_tokens: int = 0,
+                     stream: bool = False) -> Dict[str, Any]:
+        """
+        Send one Messages request, retrying retryable failures.
+
+        Args:
+            body: Request body (model, max_tokens, messages, ...)
+            estimated_input_tokens: Input size charged to the token bucket up front
+            stream: Stream the response and record when each text delta arrived
+
+        Returns:
+            Dict with the response ``message``, ``attempts``, ``rate_limit_wait_s``
+            (time spent in the limiter), ``latency_s`` of the successful attempt
+            and, when streaming, ``delta_times_s`` (seconds from the start of
+            the attempt to each text delta)
+
+        Raises:
+            StreamedError: On a non-retryable error event in a stream (e.g.
+                ``invalid_request_error``), without retrying
+        """
+        waited = 0.0
+        for attempt in range(self.max_retries + 1):
+            waited += await self.limiter.acquire(estimated_input_tokens)
+            start = time.perf_counter()
+            try:
+                if stream:
+                    message, delta_times = await self._stream(body, start)
+                else:
+                    message, delta_times = await self._post(body), []
+            except (httpx.TransportError, RetryableStatus) as e:
+                self.limiter.settle(estimated_input_tokens, 0)
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(backoff_delay(
+                    attempt, self.backoff_base, self.backoff_max, getattr(e, "retry_after", None)
+                ))
+                continue
+
+            # Cache reads do not count towards the input tokens/minute limit
+            usage = message["usage"]
+            self.limiter.settle(estimated_input_tokens,
+                                usage["input_tokens"] + (usage.get("cache_creation_input_tokens") or 0))
+            return {
+                "message": message,
+                "attempts": attempt + 1,
+                "rate_limit_wait_s": waited,
+                "latency_s": time.perf_counter() - start,
+                "delta_times_s": delta_times,
+            }
+
+    async def _post(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a non-streaming request and return the message."""
+        response = await self.http.post("/v1/messages", json=body)
+        if response.status_code in RETRYABLE_STATUS:
+            raise RetryableStatus(response.status_code, response.headers.get("retry-after"))
+        response.raise_for_status()
+        return response.json()
+
+    async def _stream(self, body: Dict[str, Any], start: float) -> Tuple[Dict[str, Any], List[float]]:
+        """Send a streaming request; return the assembled message and delta arrival times."""
+        text, delta_times, message = [], [], None
+        async with self.http.stream("POST", "/v1/messages", json={**body, "stream": True}) as response:
+            if response.status_code in RETRYABLE_STATUS:
+                raise RetryableStatus(response.status_code, response.headers.get("retry-after"))
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:])
+                if event["type"] == "message_start":
+                    message = event["message"]
+                elif event["type"] == "content_block_delta" and event["delta"].get("type") == "text_delta":
+                    delta_times.append(time.perf_counter() - start)
+                    text.append(event["delta"]["text"])
+                elif event["type"] == "message_delta":
+                    message["usage"].update(event.get("usage", {}))
+                    message["stop_reason"] = event["delta"].get("stop_reason")
+                elif event["type"] == "error":
+                    raise stream_error(event.get("error", {}))
+
+        message["content"] = [{"type": "text", "text": "".join(text)}]
+        return message, delta_times
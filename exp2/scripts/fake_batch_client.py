@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+File-backed stand-in for the Anthropic Message Batches API.
+
+Each batch is a directory holding ``requests.jsonl`` and ``batch.json``.
+A batch stays ``in_progress`` for a configurable number of polls, then
+every request is answered the way mock_messages_server.py answers it and
+``results.jsonl`` is written. A fraction of requests can come back
+``errored`` so retries of failed tests can be exercised offline. The
+methods return the same dicts as ``model_dump()`` of the SDK's objects.
+"""
+
+import json
+import random
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List
+
+from mock_messages_server import answer_question, approximate_tokens, prompt_text
+
+
+class FileBatchClient:
+    """Message Batches client that keeps batches in a local directory."""
+
+    def __init__(self, root: Path, polls_to_end: int = 2, error_rate: float = 0.0):
+        self.root = root
+        self.polls_to_end = polls_to_end
+        self.error_rate = error_rate
+        root.mkdir(parents=True, exist_ok=True)
+
+    def _load(self, batch_id: str) -> Dict[str, Any]:
+        with open(self.root / batch_id / "batch.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self, batch: Dict[str, Any]):
+        with open(self.root / batch["id"] / "batch.json", 'w', encoding='utf-8') as f:
+            json.dump(batch, f, indent=2)
+
+    @staticmethod
+    def _public(batch: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in batch.items() if key != "polls"}
+
+    def create(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store a batch of ``{"custom_id", "params"}`` requests."""
+        batch_id = f"msgbatch_{uuid.uuid4().hex[:24]}"
+        (self.root / batch_id).mkdir()
+        with open(self.root / batch_id / "requests.jsonl", 'w', encoding='utf-8') as f:
+            for request in requests:
+                f.write(json.dumps(request) + "\n")
+        batch = {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "in_progress",
+            "request_counts": {"processing": len(requests), "succeeded": 0, "errored": 0,
+                               "canceled": 0, "expired": 0},
+            "created_at": datetime.utcnow().isoformat() + "Z",
+            "ended_at": None,
+            "polls": 0,
+        }
+        self._save(batch)
+        return self._public(batch)
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        """Return the batch status; the batch ends after ``polls_to_end`` polls."""
+        batch = self._load(batch_id)
+        if batch["processing_status"] == "in_progress":
+            batch["polls"] += 1
+            if batch["polls"] >= self.polls_to_end:
+                self._process(batch)
+            self._save(batch)
+        return self._public(batch)
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield one ``{"custom_id", "result"}`` dict per request of an ended batch."""
+        if self._load(batch_id)["processing_status"] != "ended":
+            raise ValueError(f"Batch {batch_id} has not ended yet")
+        with open(self.root / batch_id / "results.jsonl", 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def _process(self, batch: Dict[str, Any]):
+        """Answer every request and write results.jsonl."""
+        rng = random.Random(batch["id"])
+        counts = {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+        directory = self.root / batch["id"]
+        with open(directory / "requests.jsonl", 'r', encoding='utf-8') as requests, \
+                open(directory / "results.jsonl", 'w', encoding='utf-8') as results:
+            for line in requests:
+                request = json.loads(line)
+                if rng.random() < self.error_rate:
+                    result = {"type": "errored", "error": {"type": "error", "error": {
+                        "type": "overloaded_error", "message": "Overloaded"}}}
+                else:
+                    result = {"type": "succeeded", "message": self._answer(request["params"])}
+                counts[result["type"]] += 1
+                results.write(json.dumps({"custom_id": request["custom_id"], "result": result}) + "\n")
+        batch.update({
+            "processing_status": "ended",
+            "request_counts": counts,
+            "ended_at": datetime.utcnow().isoformat() + "Z",
+        })
+
+    @staticmethod
+    def _answer(params: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = prompt_text(params)
+        text = answer_question(prompt)
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": params.get("model", "mock"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "usage": {
+                "input_tokens": approximate_tokens(prompt),
+                "output_tokens": approximate_tokens(text),
+                "cache_creation_input_tokens": 0,
+                "cache_read_input_tokens": 0,
+            },
+        }
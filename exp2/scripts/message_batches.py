@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Message Batches API mode for large offline Experiment 2 sweeps.
+
+All pending (configuration, repetition) pairs are packed into JSONL batch
+request files, each file is submitted as one batch, the batches are polled
+until they end, and their results are mapped back into the regular result
+schema and appended to the result log. Submitted batch IDs are recorded in
+a state file together with the prompt mode they were sent with, so an
+interrupted run resumes polling instead of submitting (and paying for) the
+same requests again, and labels their results correctly even if it is
+resumed with different flags.
+"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Tuple, Union
+
+from prompt_cache import cache_usage
+from result_log import ResultLog, completed_keys, prompt_fields, prompt_mode
+from run_experiment_auto import MODEL, build_prompt, check_correctness, extract_answer_from_response
+
+BATCH_DIR = Path("../outputs/batches")
+STATE_FILE = "batches.json"
+# API limits are 100,000 requests and 256 MB per batch
+MAX_BATCH_REQUESTS = 100_000
+MAX_BATCH_BYTES = 200 * 1024 * 1024
+
+
+class AnthropicBatchClient:
+    """Adapter returning plain dicts from the SDK's ``messages.batches`` API."""
+
+    def __init__(self, client: "anthropic.Anthropic"):
+        self.batches = client.messages.batches
+
+    def create(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return self.batches.create(requests=requests).model_dump(mode="json")
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        return self.batches.retrieve(batch_id).model_dump(mode="json")
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        for item in self.batches.results(batch_id):
+            yield item.model_dump(mode="json")
+
+
+def custom_id(test_id: str, repetition: int) -> str:
+    """Batch request ID for a test (letters, digits, ``_`` and ``-`` only)."""
+    return f"{test_id}-rep{repetition}"
+
+
+def parse_custom_id(request_id: str) -> Tuple[str, int]:
+    """Inverse of ``custom_id``: (test_id, repetition)."""
+    test_id, repetition = request_id.rsplit("-rep", 1)
+    return test_id, int(repetition)
+
+
+def build_batch_requests(configs: List[Dict[str, Any]], prompts: Dict[str, Union[str, List[Dict[str, Any]]]],
+                         repetitions: int, done: set) -> List[Dict[str, Any]]:
+    """
+    Batch requests for every (configuration, repetition) not yet completed.
+
+    Args:
+        configs: Test configurations from metadata
+        prompts: Prompt string or content blocks by test_id
+        repetitions: Runs per configuration
+        done: Result log keys to skip
+
+    Returns:
+        List of ``{"custom_id", "params"}`` requests
+    """
+    return [
+        {
+            "custom_id": custom_id(config["test_id"], rep),
+            "params": {
+                "model": MODEL,
+                "max_tokens": 1024,
+                "messages": [{"role": "user", "content": prompts[config["test_id"]]}],
+            },
+        }
+        for rep in range(repetitions) for config in configs
+        if (config["test_id"], rep, MODEL, prompt_mode(prompt_fields(prompts[config["test_id"]]))) not in done
+    ]
+
+
+def write_batch_files(requests: List[Dict[str, Any]], batch_dir: Path, prefix: str,
+                      max_requests: int = MAX_BATCH_REQUESTS,
+                      max_bytes: int = MAX_BATCH_BYTES) -> List[Path]:
+    """
+    Split requests into JSONL files that each fit in one batch.
+
+    Returns:
+        Paths of the written request files
+    """
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    files, lines, size = [], [], 0
+
+    def flush():
+        path = batch_dir / f"{prefix}-{len(files):03d}.jsonl"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        files.append(path)
+
+    for request in requests:
+        line = json.dumps(request) + "\n"
+        if lines and (len(lines) >= max_requests or size + len(line.encode("utf-8")) > max_bytes):
+            flush()
+            lines, size = [], 0
+        lines.append(line)
+        size += len(line.encode("utf-8"))
+    if lines:
+        flush()
+    return files
+
+
+def load_state(batch_dir: Path) -> List[Dict[str, Any]]:
+    """Submitted batches: ``{"batch_id", "file", "collected"}`` entries."""
+    state_file = batch_dir / STATE_FILE
+    if not state_file.exists():
+        return []
+    with open(state_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(batch_dir: Path, state: List[Dict[str, Any]]):
+    with open(batch_dir / STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def wait_for_batches(client: Any, batch_ids: List[str], poll_interval: float):
+    """Poll until every batch has ended, printing request counts."""
+    remaining = list(batch_ids)
+    while remaining:
+        for batch_id in list(remaining):
+            batch = client.retrieve(batch_id)
+            counts = batch["request_counts"]
+            print(f"  {batch_id}: {batch['processing_status']} "
+                  f"({counts['succeeded']} succeeded, {counts['errored']} errored, "
+                  f"{counts['processing']} processing)")
+            if batch["processing_status"] == "ended":
+                remaining.remove(batch_id)
+        if remaining:
+            time.sleep(poll_interval)
+
+
+def batch_result_entry(item: Dict[str, Any], config: Dict[str, Any], repetition: int,
+                       target_query: str, target_answer: str, batch_id: str,
+                       fields: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Map one batch result to the schema written by run_single_test.
+
+    Per-request latency is not observable in batch mode, so
+    ``response_time_ms`` is 0 (analysis skips zero times). ``fields`` are
+    the ``prompt_layout``/``prompt_cache`` values the batch was submitted
+    with (combined when omitted).
+    """
+    entry = {
+        "test_id": config["test_id"],
+        "repetition": repetition,
+        "num_documents": config["num_documents"],
+        "target_position": config["target_position"],
+        "target_position_normalized": config["target_position_normalized"],
+        "query": target_query,
+        "expected_answer": target_answer,
+        "response_time_ms": 0,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "model": MODEL,
+        **(fields or prompt_fields(None)),
+        "batch": True,
+        "batch_id": batch_id,
+    }
+    result = item["result"]
+    if result["type"] != "succeeded":
+        error = (result.get("error") or {}).get("error", {}).get("type", result["type"])
+        entry.update({
+            "extracted_answer": "API_ERROR",
+            "is_correct": False,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "total_tokens": 0,
+            "error": f"batch request {result['type']}: {error}",
+        })
+        return entry
+
+    message = result["message"]
+    response_text = message["content"][0]["text"]
+    usage = message["usage"]
+    input_tokens = usage["input_tokens"]
+    output_tokens = usage["output_tokens"]
+    cached = cache_usage(usage)
+    cache_creation_tokens = cached["cache_creation_input_tokens"]
+    cache_read_tokens = cached["cache_read_input_tokens"]
+    extracted_answer, source_file, confidence = extract_answer_from_response(response_text, target_answer)
+    entry.update({
+        "extracted_answer": extracted_answer,
+        "is_correct": check_correctness(extracted_answer, target_answer),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_creation_input_tokens": cache_creation_tokens,
+        "cache_read_input_tokens": cache_read_tokens,
+        "total_tokens": input_tokens + cache_creation_tokens + cache_read_tokens + output_tokens,
+        "source_file": source_file,
+        "confidence": confidence,
+        "raw_response": response_text[:500],
+    })
+    return entry
+
+
+def collect_results(client: Any, batch_id: str, metadata: Dict[str, Any], log: ResultLog,
+                    fields: Dict[str, Any] = None) -> int:
+    """Append every result of an ended batch to the log; returns the number of successes.
+
+    ``fields`` are the ``prompt_layout``/``prompt_cache`` values recorded
+    when the batch was submitted, so results record its prompt mode.
+    """
+    configs = {config["test_id"]: config for config in metadata["test_configurations"]}
+    succeeded = 0
+    for item in client.results(batch_id):
+        test_id, repetition = parse_custom_id(item["custom_id"])
+        entry = batch_result_entry(item, configs[test_id], repetition, metadata["target_query"],
+                                   metadata["target_answer"], batch_id, fields)
+        log.append(entry)
+        succeeded += "error" not in entry
+    return succeeded
+
+
+def run_batch(client: Any, metadata: Dict[str, Any], combined_dir: Path,
+              contents: Dict[str, List[Dict[str, Any]]], repetitions: int, log_file: Path,
+              batch_dir: Path = BATCH_DIR, poll_interval: float = 60.0):
+    """
+    Run the sweep through the Message Batches API.
+
+    Batches submitted by an earlier, interrupted run are polled and
+    collected first; then whatever the result log still lacks (including
+    errored requests) is packed, submitted and collected.
+
+    Args:
+        client: AnthropicBatchClient or FileBatchClient
+        metadata: Experiment metadata
+        combined_dir: Directory containing combined documents
+        contents: Content blocks by test_id, with or without cache
+            breakpoints (empty to send the combined files)
+        repetitions: Runs per configuration
+        log_file: JSONL result log
+        batch_dir: Directory for request files and the state file
+        poll_interval: Seconds between status polls
+    """
+    configs = metadata["test_configurations"]
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    state = load_state(batch_dir)
+    # Every request of one run shares the prompt mode of its first content
+    fields = prompt_fields(next(iter(contents.values()), None))
+
+    def finish(entries: List[Dict[str, Any]]):
+        wait_for_batches(client, [entry["batch_id"] for entry in entries], poll_interval)
+        for entry in entries:
+            # State written before modes were recorded falls back to this run's mode
+            submitted_fields = {key: entry[key] for key in fields if key in entry} or fields
+            succeeded = collect_results(client, entry["batch_id"], metadata, log, submitted_fields)
+            entry["collected"] = True
+            save_state(batch_dir, state)
+            print(f"Collected {entry['batch_id']}: {succeeded} succeeded")
+
+    with ResultLog(log_file) as log:
+        unfinished = [entry for entry in state if not entry["collected"]]
+        if unfinished:
+            print(f"Resuming {len(unfinished)} submitted batch(es)")
+            finish(unfinished)
+
+        prompts = {}
+        for config in configs:
+            if config["test_id"] in contents:
+                prompts[config["test_id"]] = contents[config["test_id"]]
+            else:
+                with open(combined_dir / config["combined_file"], 'r', encoding='utf-8') as f:
+                    prompts[config["test_id"]] = build_prompt(f.read(), metadata["target_query"])
+
+        requests = build_batch_requests(configs, prompts, repetitions, completed_keys(log_file))
+        if not requests:
+            print("All tests already completed")
+            return
+        print(f"Packing {len(requests)} requests")
+
+        submitted = []
+        prefix = datetime.utcnow().strftime("requests-%Y%m%dT%H%M%S")
+        for path in write_batch_files(requests, batch_dir, prefix):
+            with open(path, 'r', encoding='utf-8') as f:
+                batch = client.create([json.loads(line) for line in f])
+            submitted.append({"batch_id": batch["id"], "file": path.name, "collected": False, **fields})
+            state.append(submitted[-1])
+            save_state(batch_dir, state)
+            print(f"Submitted {path.name} as {batch['id']}")
+        finish(submitted)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Local mock of the Anthropic Messages API for offline runs of Experiment 2.
+
+Answers the question on the prompt's "Question:" line with the sentence of
+the context sharing the most words with it, wrapped in the JSON format the
+experiment asks for. Latency grows with input size, and a configurable
+fraction of requests fails with 429 or 529 so retry handling can be tested.
+Content blocks marked with ``cache_control`` are cached by prefix (5 minute
+TTL, 20-block lookback) and reported as cache creation/read tokens; cached
+tokens are processed at a tenth of the normal latency. With ``"stream": true``
+the reply is sent as server-sent events, one word per text delta, after the
+prefill delay.
+
+Usage:
+    python mock_messages_server.py --port 8766 --error-rate 0.1
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List
+
+WORD_PATTERN = re.compile(r"\w+")
+SENTENCE_PATTERN = re.compile(r"[^.!?\n]+[.!?]?")
+CACHE_TTL_SECONDS = 300
+CACHE_LOOKBACK_BLOCKS = 20
+
+
+def approximate_tokens(text: str) -> int:
+    """Approximate token count (word_count * 1.3, as in run_experiment.py)."""
+    return int(len(text.split()) * 1.3)
+
+
+def prompt_text(body: Dict[str, Any]) -> str:
+    """Concatenate the text of all user message content."""
+    parts = []
+    for message in body.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content if block.get("type") == "text")
+    return "\n".join(parts)
+
+
+def user_blocks(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """All user content as text blocks (string content becomes one block)."""
+    blocks = []
+    for message in body.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            blocks.append({"type": "text", "text": content})
+        else:
+            blocks.extend(block for block in content if block.get("type") == "text")
+    return blocks
+
+
+def answer_question(prompt: str) -> str:
+    """Return the context sentence that best matches the question, as JSON."""
+    match = re.search(r"^Question:\s*(.+)$", prompt, re.MULTILINE)
+    question = set(WORD_PATTERN.findall(match.group(1).lower())) if match else set()
+    context = prompt[: match.start()] if match else prompt
+    best, best_score = "", 0
+    for sentence in SENTENCE_PATTERN.findall(context):
+        score = len(question & set(WORD_PATTERN.findall(sentence.lower())))
+        if score > best_score:
+            best, best_score = sentence.strip(), score
+    year = re.search(r"\b(19\d{2}|20\d{2})\b", best)
+    answer = year.group(1) if year else best or "UNKNOWN"
+    return json.dumps({"answer": answer, "source_file": "unknown", "confidence": "medium"})
+
+
+class MockMessagesHandler(BaseHTTPRequestHandler):
+    """Handles POST /v1/messages."""
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/messages":
+            self._send_json(404, {"type": "error", "error": {"type": "not_found_error"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        server = self.server
+
+        if server.rng.random() < server.error_rate:
+            status = server.rng.choice([429, 529])
+            error_type = "rate_limit_error" if status == 429 else "overloaded_error"
+            self._send_json(status, {"type": "error", "error": {"type": error_type}},
+                            {"retry-after": "0"})
+            return
+
+        prompt = prompt_text(body)
+        usage = server.cache_usage(user_blocks(body))
+        text = answer_question(prompt)
+        output_tokens = approximate_tokens(text)
+        uncached = usage["input_tokens"] + usage["cache_creation_input_tokens"]
+        prefill_ms = (server.base_ms
+                      + (uncached + 0.1 * usage["cache_read_input_tokens"]) / 1000 * server.per_1k_input_ms)
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "mock"),
+            "content": [],
+            "stop_reason": None,
+            "usage": {**usage, "output_tokens": 0},
+        }
+
+        time.sleep(prefill_ms / 1000)
+        if body.get("stream"):
+            self._stream(message, text, output_tokens)
+            return
+
+        time.sleep(output_tokens * server.per_output_ms / 1000)
+        message["content"] = [{"type": "text", "text": text}]
+        message["stop_reason"] = "end_turn"
+        message["usage"]["output_tokens"] = output_tokens
+        self._send_json(200, message)
+
+    def _stream(self, message: Dict[str, Any], text: str, output_tokens: int):
+        """Send the reply as Messages streaming events, one word per delta."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self._event("message_start", {"type": "message_start", "message": message})
+        self._event("content_block_start", {"type": "content_block_start", "index": 0,
+                                            "content_block": {"type": "text", "text": ""}})
+        words = re.findall(r"\S+\s*", text)
+        delay = output_tokens * self.server.per_output_ms / 1000 / max(len(words), 1)
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(delay)
+            self._event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                "delta": {"type": "text_delta", "text": word}})
+        self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self._event("message_delta", {"type": "message_delta",
+                                      "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                      "usage": {"output_tokens": output_tokens}})
+        self._event("message_stop", {"type": "message_stop"})
+
+    def _event(self, name: str, data: Dict[str, Any]):
+        self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+
+class MockMessagesServer(ThreadingHTTPServer):
+    """Threaded mock server; ``with MockMessagesServer() as server`` runs it in the background."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, base_ms: float = 200.0,
+                 per_1k_input_ms: float = 5.0, per_output_ms: float = 5.0,
+                 error_rate: float = 0.0, seed: int = 0):
+        super().__init__((host, port), MockMessagesHandler)
+        self.base_ms = base_ms
+        self.per_1k_input_ms = per_1k_input_ms
+        self.per_output_ms = per_output_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.cache = {}
+        self.cache_lock = threading.Lock()
+
+    def cache_usage(self, blocks: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Token usage for a request, reading and writing the prefix cache.
+
+        The longest cached prefix ending at a block boundary at most
+        CACHE_LOOKBACK_BLOCKS before a breakpoint is read; the rest up to
+        the last breakpoint is written.
+        """
+        digest = hashlib.sha256()
+        prefixes, totals, breakpoints = [], [0], []
+        for i, block in enumerate(blocks, 1):
+            digest.update(block["text"].encode("utf-8"))
+            prefixes.append(digest.hexdigest())
+            totals.append(totals[-1] + approximate_tokens(block["text"]))
+            if block.get("cache_control"):
+                breakpoints.append(i)
+
+        read = last = 0
+        now = time.monotonic()
+        with self.cache_lock:
+            for point in breakpoints:
+                for boundary in range(point, max(0, point - CACHE_LOOKBACK_BLOCKS), -1):
+                    if self.cache.get(prefixes[boundary - 1], 0) > now:
+                        read = max(read, boundary)
+                        self.cache[prefixes[boundary - 1]] = now + CACHE_TTL_SECONDS
+                        break
+            for point in breakpoints:
+                self.cache[prefixes[point - 1]] = now + CACHE_TTL_SECONDS
+                last = max(last, point)
+
+        return {
+            "input_tokens": totals[-1] - totals[max(read, last)],
+            "cache_creation_input_tokens": totals[last] - totals[read] if last > read else 0,
+            "cache_read_input_tokens": totals[read],
+        }
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MockMessagesServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Mock Anthropic Messages API")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--base-ms", type=float, default=200.0)
+    parser.add_argument("--per-1k-input-ms", type=float, default=5.0)
+    parser.add_argument("--per-output-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with 429/529")
+    args = parser.parse_args()
+
+    server = MockMessagesServer("127.0.0.1", args.port, args.base_ms, args.per_1k_input_ms,
+                                args.per_output_ms, args.error_rate)
+    print(f"Mock Messages API listening on {server.url}/v1/messages")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cache-friendly prompt layout for Experiment 2.
+
+Consecutive configurations cycle through the same source files, so their
+document orders share long prefixes (everything before the target). The
+combined files cannot be reused for caching because every separator says
+"DOCUMENT n OF total", which changes with the configuration. Here the
+prompt is rebuilt from ``document_order`` with one content block per
+document and separators that omit the total, and ``cache_control``
+breakpoints are placed where the prefix is shared with other
+configurations.
+"""
+
+from typing import List, Dict, Any
+
+from generate_combined_docs import SOURCE_DIR, load_source_files
+from run_experiment_auto import PROMPT_HEADER, build_question
+
+CACHED_SEPARATOR_TEMPLATE = """====================================
+DOCUMENT {num}
+FILE: {filename}
+====================================
+
+"""
+MAX_BREAKPOINTS = 4
+
+
+def common_prefix_length(a: List[str], b: List[str]) -> int:
+    """Number of leading documents two orders have in common."""
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+def cache_breakpoints(order: List[str], all_orders: List[List[str]]) -> List[int]:
+    """
+    Document counts after which to place a cache breakpoint.
+
+    Breakpoints go after the prefix shared with every other configuration,
+    after the longest prefix shared with any of them, and after the last
+    document (so repetitions of the same configuration hit the cache).
+    Prefixes in between are still found by the API's lookback from the
+    next breakpoint.
+
+    Args:
+        order: Document order of this configuration
+        all_orders: Document orders of all configurations
+
+    Returns:
+        Sorted document counts (at most MAX_BREAKPOINTS)
+    """
+    shared = [common_prefix_length(order, other) for other in all_orders if other is not order]
+    points = {len(order)}
+    if shared:
+        points.update({min(shared), max(shared)})
+    return sorted(p for p in points if p > 0)[-MAX_BREAKPOINTS:]
+
+
+def build_cached_content(files: Dict[str, str], order: List[str], all_orders: List[List[str]],
+                         target_query: str, cache: bool = True) -> List[Dict[str, Any]]:
+    """
+    Build the user message content blocks for one configuration.
+
+    Args:
+        files: Source file contents by name
+        order: Document order of this configuration
+        all_orders: Document orders of all configurations
+        target_query: Question to ask
+        cache: Add ``cache_control`` breakpoints (False gives the same
+            layout uncached, for a like-for-like baseline)
+
+    Returns:
+        List of text content blocks
+    """
+    breakpoints = set(cache_breakpoints(order, all_orders)) if cache else set()
+    blocks = []
+    for num, filename in enumerate(order, 1):
+        text = CACHED_SEPARATOR_TEMPLATE.format(num=num, filename=filename) + files[filename] + "\n"
+        if num == 1:
+            text = PROMPT_HEADER + text
+        block = {"type": "text", "text": text}
+        if num in breakpoints:
+            block["cache_control"] = {"type": "ephemeral"}
+        blocks.append(block)
+    blocks.append({"type": "text", "text": "\n" + build_question(target_query)})
+    return blocks
+
+
+def build_all_cached_content(metadata: Dict[str, Any], cache: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+    """Content blocks for every configuration in the metadata, keyed by test_id."""
+    files = load_source_files(SOURCE_DIR)
+    configs = metadata["test_configurations"]
+    all_orders = [config["document_order"] for config in configs]
+    return {
+        config["test_id"]: build_cached_content(
+            files, config["document_order"], all_orders, metadata["target_query"], cache
+        )
+        for config in configs
+    }
+
+
+def cache_usage(usage: Any) -> Dict[str, int]:
+    """Cache token counts from an SDK usage object or a usage dict (0 when absent)."""
+    get = usage.get if isinstance(usage, dict) else lambda key: getattr(usage, key, None)
+    return {
+        "cache_creation_input_tokens": get("cache_creation_input_tokens") or 0,
+        "cache_read_input_tokens": get("cache_read_input_tokens") or 0,
+    }
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Append-only JSONL result log for resumable Experiment 2 runs.
+
+Every finished test is appended to the log as one JSON line and flushed to
+disk, so an interrupted run keeps every result it already paid for. On
+restart, tests whose (test_id, repetition, model, prompt mode) key already
+has a successful result are skipped; failed tests are run again and their
+new result supersedes the old line. Runs with different prompt layouts can
+share one log, so they can be compared.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Set, Tuple, Union
+
+RESULTS_LOG = Path("../outputs/extraction_results.jsonl")
+
+
+def prompt_fields(prompt: Union[str, List[Dict[str, Any]], None]) -> Dict[str, Any]:
+    """``prompt_layout`` and ``prompt_cache`` result fields for a prompt.
+
+    ``prompt`` is the combined prompt string (or None for it) or a list of
+    content blocks from prompt_cache.py, with or without breakpoints.
+    """
+    blocks = isinstance(prompt, list)
+    return {
+        "prompt_layout": "blocks" if blocks else "combined",
+        "prompt_cache": blocks and any("cache_control" in block for block in prompt),
+    }
+
+
+def prompt_mode(result: Dict[str, Any]) -> str:
+    """How a result's prompt was sent: "combined", "blocks" or "cached" (blocks with breakpoints).
+
+    Results logged before ``prompt_layout`` existed are either combined or cached.
+    """
+    if result.get("prompt_cache"):
+        return "cached"
+    return result.get("prompt_layout", "combined")
+
+
+def result_key(result: Dict[str, Any]) -> Tuple[str, int, str, str]:
+    """Identity of a test run: (test_id, repetition, model, prompt mode)."""
+    return result["test_id"], result.get("repetition", 0), result.get("model", ""), prompt_mode(result)
+
+
+def iter_log(log_file: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield results from a log one line at a time.
+
+    A partial last line (left by a crash mid-write) is skipped.
+
+    Args:
+        log_file: Path to the JSONL log
+
+    Yields:
+        Result dictionaries in the order they were appended
+    """
+    if not log_file.exists():
+        return
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+def completed_keys(log_file: Path) -> Set[Tuple[str, int, str]]:
+    """Keys of the tests with a successful (error-free) result in the log."""
+    return {result_key(r) for r in iter_log(log_file) if "error" not in r}
+
+
+def latest_results(log_file: Path) -> List[Dict[str, Any]]:
+    """The last logged result for each key, in first-seen order."""
+    latest = {}
+    for result in iter_log(log_file):
+        latest[result_key(result)] = result
+    return list(latest.values())
+
+
+class ResultLog:
+    """
+    Appends results to a JSONL log, fsyncing after each one.
+
+    Use as ``with ResultLog(path) as log: log.append(result)``.
+    """
+
+    def __init__(self, log_file: Path):
+        self.log_file = log_file
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        self._drop_partial_line()
+        self.file = open(log_file, 'a', encoding='utf-8')
+
+    def _drop_partial_line(self):
+        """Truncate a partial last line so the next append starts on a fresh line."""
+        if not self.log_file.exists():
+            return
+        with open(self.log_file, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def append(self, result: Dict[str, Any]):
+        """Write one result and flush it to disk."""
+        self.file.write(json.dumps(result) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "ResultLog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
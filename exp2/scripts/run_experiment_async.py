@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Concurrent Experiment 2 runner for the Anthropic Messages API.
+
+Runs every test configuration (optionally repeated) with a bounded number
+of requests in flight, limited by requests/minute and input tokens/minute
+token buckets. 429/5xx responses are retried with jittered exponential
+backoff. Each result is appended to the JSONL result log as it finishes,
+and tests already completed in the log are skipped, so an interrupted
+sweep can be rerun without repeating API calls.
+
+Usage:
+    python run_experiment_async.py --concurrency 8 --rpm 50 --itpm 400000
+    python run_experiment_async.py --mock --repetitions 3 --error-rate 0.2
+    python run_experiment_async.py --prompt-cache --concurrency 1
+    python run_experiment_async.py --mock --stream
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Union
+
+from async_client import AsyncMessagesClient, RateLimiter, DEFAULT_BASE_URL
+from mock_messages_server import MockMessagesServer
+from prompt_cache import build_all_cached_content, cache_usage
+from result_log import RESULTS_LOG, ResultLog, completed_keys, latest_results, prompt_fields, prompt_mode
+from run_experiment_auto import (
+    COMBINED_DIR, METADATA_FILE, MODEL, OUTPUT_FILE,
+    build_prompt, check_correctness, extract_answer_from_response, streaming_metrics,
+)
+
+
+def write_results(results: List[Dict[str, Any]], output_file: Path):
+    """Atomically replace the output file with the final results.
+
+    Called once the run ends; progress during the run is kept in the
+    JSONL result log, which ``results`` are read back from.
+    """
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_file.with_suffix(output_file.suffix + ".tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    os.replace(tmp_file, output_file)
+
+
+async def run_single_test(client: AsyncMessagesClient, config: Dict[str, Any], repetition: int,
+                          prompt: Union[str, List[Dict[str, Any]]], target_query: str,
+                          target_answer: str, stream: bool = False) -> Dict[str, Any]:
+    """
+    Execute one test configuration.
+
+    ``prompt`` is either the combined prompt string or prompt_cache content
+    blocks (with or without cache breakpoints).
+
+    ``response_time_ms`` covers only the successful attempt; time spent in
+    the rate limiter and on retried attempts is reported separately. With
+    ``stream`` it is split into time-to-first-token and decode time.
+    """
+    entry = {
+        "test_id": config["test_id"],
+        "repetition": repetition,
+        "num_documents": config["num_documents"],
+        "target_position": config["target_position"],
+        "target_position_normalized": config["target_position_normalized"],
+        "query": target_query,
+        "expected_answer": target_answer,
+        "model": MODEL,
+        **prompt_fields(prompt),
+    }
+    body = {"model": MODEL, "max_tokens": 1024, "messages": [{"role": "user", "content": prompt}]}
+    start_time = time.perf_counter()
+
+    try:
+        reply = await client.create(body, estimated_input_tokens=config["estimated_tokens"], stream=stream)
+    except Exception as e:
+        entry.update({
+            "extracted_answer": "API_ERROR",
+            "is_correct": False,
+            "response_time_ms": int((time.perf_counter() - start_time) * 1000),
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "total_tokens": 0,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "error": str(e),
+        })
+        return entry
+
+    message = reply["message"]
+    response_text = message["content"][0]["text"]
+    input_tokens = message["usage"]["input_tokens"]
+    output_tokens = message["usage"]["output_tokens"]
+    cached = cache_usage(message["usage"])
+    extracted_answer, source_file, confidence = extract_answer_from_response(response_text, target_answer)
+
+    entry.update({
+        "extracted_answer": extracted_answer,
+        "is_correct": check_correctness(extracted_answer, target_answer),
+        "response_time_ms": int(reply["latency_s"] * 1000),
+        **(streaming_metrics(reply["delta_times_s"], reply["latency_s"], output_tokens) if stream else {}),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        **cached,
+        "total_tokens": input_tokens + sum(cached.values()) + output_tokens,
+        "attempts": reply["attempts"],
+        "rate_limit_wait_ms": int(reply["rate_limit_wait_s"] * 1000),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "source_file": source_file,
+        "confidence": confidence,
+        "raw_response": response_text[:500],
+    })
+    return entry
+
+
+async def run_all(client: AsyncMessagesClient, metadata: Dict[str, Any], combined_dir: Path,
+                  log_file: Path, concurrency: int, repetitions: int,
+                  prompt_cache: bool = False, stream: bool = False,
+                  prompt_layout: str = "combined") -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Run all configurations with at most ``concurrency`` requests in flight.
+
+    Results are appended to ``log_file``; (configuration, repetition, model,
+    prompt mode) keys that already have a successful result there are skipped.
+
+    With ``prompt_cache`` the configurations are sent smallest first, so a
+    configuration can read the prefix cached by a smaller one; requests in
+    flight at the same time cannot share a cache entry yet. ``prompt_layout``
+    "blocks" without ``prompt_cache`` sends the same blocks in the same order
+    without breakpoints, the baseline for measuring the cache alone.
+
+    Returns:
+        Tuple of (latest result per key in the log, requests sent by this run)
+    """
+    target_query = metadata["target_query"]
+    target_answer = metadata["target_answer"]
+    semaphore = asyncio.Semaphore(concurrency)
+    configs = metadata["test_configurations"]
+
+    if prompt_cache or prompt_layout == "blocks":
+        prompts = build_all_cached_content(metadata, cache=prompt_cache)
+        configs = sorted(configs, key=lambda c: c["num_documents"])
+    else:
+        prompts = {}
+        for config in configs:
+            with open(combined_dir / config["combined_file"], 'r', encoding='utf-8') as f:
+                prompts[config["test_id"]] = build_prompt(f.read(), target_query)
+
+    async def bounded(config: Dict[str, Any], repetition: int) -> Dict[str, Any]:
+        async with semaphore:
+            return await run_single_test(client, config, repetition, prompts[config["test_id"]],
+                                         target_query, target_answer, stream)
+
+    done = completed_keys(log_file)
+    pending = [(config, rep) for rep in range(repetitions) for config in configs
+               if (config["test_id"], rep, MODEL, prompt_mode(prompt_fields(prompts[config["test_id"]])))
+               not in done]
+    if len(pending) < repetitions * len(configs):
+        print(f"Resuming: {repetitions * len(configs) - len(pending)} requests already in {log_file}")
+
+    # Scheduled in list order, so the semaphore admits requests in that order
+    tasks = [asyncio.ensure_future(bounded(config, rep)) for config, rep in pending]
+    finished_count = 0
+    with ResultLog(log_file) as log:
+        for finished in asyncio.as_completed(tasks):
+            result = await finished
+            log.append(result)
+            finished_count += 1
+            print_progress(result, finished_count, len(tasks))
+
+    results = latest_results(log_file)
+    results.sort(key=lambda r: (r["num_documents"], r["repetition"]))
+    return results, len(tasks)
+
+
+def print_progress(result: Dict[str, Any], finished: int, total: int):
+    """Print one line for a finished request."""
+    status = "✓" if result["is_correct"] else "✗"
+    print(f"[{finished}/{total}] {status} {result['test_id']} rep {result['repetition']}: "
+          f"{result['response_time_ms']}ms"
+          f"{' (TTFT %dms)' % result['ttft_ms'] if 'ttft_ms' in result else ''}, "
+          f"{result['input_tokens']:,} input tokens "
+          f"({result.get('cache_read_input_tokens', 0):,} cached), "
+          f"{result.get('attempts', 0)} attempt(s), {result.get('rate_limit_wait_ms', 0)}ms throttled")
+
+
+def main():
+    """Parse options and run the experiment."""
+    parser = argparse.ArgumentParser(description="Concurrent Experiment 2 runner")
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight")
+    parser.add_argument("--rpm", type=float, default=50, help="requests per minute limit")
+    parser.add_argument("--itpm", type=float, default=None, help="input tokens per minute limit")
+    parser.add_argument("--repetitions", type=int, default=1, help="runs per configuration")
+    parser.add_argument("--max-retries", type=int, default=6)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--mock", action="store_true", help="run against a local mock server")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="with --mock: fraction of requests failing with 429/529")
+    parser.add_argument("--prompt-cache", action="store_true",
+                        help="send documents as content blocks with cache breakpoints")
+    parser.add_argument("--prompt-layout", choices=["combined", "blocks"],
+                        help="send the combined file, or one content block per document "
+                             "(default: blocks with --prompt-cache, else combined); "
+                             "blocks without --prompt-cache is the like-for-like uncached baseline")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream responses and record time-to-first-token")
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE,
+                        help="JSON snapshot of the results, written at the end")
+    parser.add_argument("--log", type=Path, default=RESULTS_LOG,
+                        help="JSONL result log; completed requests in it are skipped")
+    args = parser.parse_args()
+    if args.prompt_cache and args.prompt_layout == "combined":
+        parser.error("--prompt-cache needs --prompt-layout blocks")
+
+    with open(METADATA_FILE, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    total = len(metadata["test_configurations"]) * args.repetitions
+    print(f"Running {total} requests, concurrency {args.concurrency}, "
+          f"{args.rpm} requests/min, {args.itpm or 'unlimited'} input tokens/min")
+
+    async def run(base_url: str):
+        limiter = RateLimiter(args.rpm, args.itpm)
+        async with AsyncMessagesClient(base_url, limiter=limiter, max_retries=args.max_retries,
+                                       backoff_base=0.05 if args.mock else 1.0,
+                                       max_connections=args.concurrency) as client:
+            return await run_all(client, metadata, COMBINED_DIR, args.log,
+                                 args.concurrency, args.repetitions, args.prompt_cache,
+                                 args.stream, args.prompt_layout or "combined")
+
+    start = time.perf_counter()
+    if args.mock:
+        with MockMessagesServer(error_rate=args.error_rate) as server:
+            results, sent = asyncio.run(run(server.url))
+    else:
+        if not os.environ.get("ANTHROPIC_API_KEY"):
+            print("ERROR: ANTHROPIC_API_KEY environment variable not set (or use --mock).")
+            exit(1)
+        results, sent = asyncio.run(run(args.base_url))
+
+    write_results(results, args.output)
+    correct = sum(1 for r in results if r["is_correct"])
+    print(f"\nCompleted {sent} new requests in {time.perf_counter() - start:.1f}s "
+          f"({len(results)} results in the log)")
+    print(f"Correct answers: {correct}/{len(results)}")
+    print(f"Results saved to: {args.output} (log: {args.log})")
+
+
+if __name__ == "__main__":
+    main()
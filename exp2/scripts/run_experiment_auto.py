@@ -3,15 +3,20 @@
 Automated Experiment 2 runner using Anthropic API.
 
 This script automatically runs all 7 test configurations by querying
-Claude via the Anthropic API with each combined document.
+Claude via the Anthropic API with each combined document. Each result is
+appended to a JSONL log as soon as it finishes; rerunning skips tests that
+already have a successful result in the log.
 """
 
+import argparse
 import json
 import time
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from result_log import RESULTS_LOG, ResultLog, completed_keys, latest_results, prompt_fields
 
 # Try to import anthropic
 try:
@@ -19,9 +24,6 @@ try:
     ANTHROPIC_AVAILABLE = True
 except ImportError:
     ANTHROPIC_AVAILABLE = False
-    print("Error: anthropic package not installed.")
-    print("Install with: pip install anthropic")
-    exit(1)
 
 # Configuration
 METADATA_FILE = Path("../inputs/metadata.json")
@@ -63,11 +65,68 @@ def extract_answer_from_response(response_text: str, target_answer: str) -> tupl
     return ("EXTRACTION_FAILED", "unknown", "low")
 
 
-def run_single_test(client: anthropic.Anthropic,
+PROMPT_HEADER = "You are analyzing a multi-document collection. Your task is to find and extract specific information.\n\n"
+
+
+def build_question(target_query: str) -> str:
+    """Build the question and answer-format instructions that end every prompt."""
+    return f"""Question: {target_query}
+
+Please provide your answer in the following JSON format:
+{{
+  "answer": "your answer here",
+  "source_document_number": <document number where you found the answer>,
+  "source_file": "filename where you found the answer",
+  "confidence": "high|medium|low"
+}}"""
+
+
+def build_prompt(combined_text: str, target_query: str) -> str:
+    """Build the extraction prompt for one combined document."""
+    return f"{PROMPT_HEADER}{combined_text}\n\n{build_question(target_query)}"
+
+
+def streaming_metrics(delta_times: List[float], total_seconds: float,
+                      output_tokens: int) -> Dict[str, Any]:
+    """
+    Split a streamed response's latency into prefill and decode.
+
+    Args:
+        delta_times: Seconds from the request to each text delta
+        total_seconds: Seconds from the request to the end of the stream
+        output_tokens: Output tokens reported in usage
+
+    Returns:
+        Dict with ``ttft_ms`` (time to first token), ``decode_time_ms``
+        (first token to end of stream) and ``inter_token_ms`` (mean gap
+        per output token after the first)
+    """
+    if not delta_times:
+        return {"ttft_ms": int(total_seconds * 1000), "decode_time_ms": 0, "inter_token_ms": 0.0}
+    decode_seconds = total_seconds - delta_times[0]
+    return {
+        "ttft_ms": int(delta_times[0] * 1000),
+        "decode_time_ms": int(decode_seconds * 1000),
+        "inter_token_ms": round((delta_times[-1] - delta_times[0]) * 1000 / max(output_tokens - 1, 1), 2),
+    }
+
+
+def check_correctness(extracted_answer: str, target_answer: str) -> bool:
+    """Exact or containment match, ignoring case and surrounding whitespace."""
+    return (
+        extracted_answer.strip().lower() == target_answer.strip().lower() or
+        target_answer.strip().lower() in extracted_answer.strip().lower()
+    )
+
+
+def run_single_test(client: "anthropic.Anthropic",
                    config: Dict[str, Any],
                    combined_dir: Path,
                    target_query: str,
-                   target_answer: str) -> Dict[str, Any]:
+                   target_answer: str,
+                   content: Optional[List[Dict[str, Any]]] = None,
+                   stream: bool = False,
+                   repetition: int = 0) -> Dict[str, Any]:
     """
     Execute a single test configuration using Anthropic API.
 
@@ -77,6 +136,11 @@ def run_single_test(client: anthropic.Anthropic,
         combined_dir: Directory containing combined documents
         target_query: Query to ask
         target_answer: Expected answer
+        content: Content blocks from prompt_cache.py (with or without cache
+            breakpoints); the combined file is sent as one prompt when None
+        stream: Stream the response and record time-to-first-token and
+            inter-token latency separately from total time
+        repetition: Repetition number of this configuration
 
     Returns:
         Result dictionary with all metrics
@@ -85,46 +149,51 @@ def run_single_test(client: anthropic.Anthropic,
     print(f"Test: {config['test_id']} ({config['num_documents']} documents)")
     print(f"{'=' * 70}")
 
-    # Load combined document
-    combined_file = combined_dir / config["combined_file"]
-    print(f"Loading: {combined_file.name}")
+    if content is None:
+        # Load combined document
+        combined_file = combined_dir / config["combined_file"]
+        print(f"Loading: {combined_file.name}")
 
-    with open(combined_file, 'r', encoding='utf-8') as f:
-        combined_text = f.read()
+        with open(combined_file, 'r', encoding='utf-8') as f:
+            combined_text = f.read()
 
-    print(f"Document size: {len(combined_text):,} characters")
-    print(f"Estimated tokens: {config['estimated_tokens']:,}")
-
-    # Prepare the prompt
-    prompt = f"""You are analyzing a multi-document collection. Your task is to find and extract specific information.
-
-{combined_text}
-
-Question: {target_query}
+        print(f"Document size: {len(combined_text):,} characters")
+        content = build_prompt(combined_text, target_query)
+    else:
+        breakpoints = sum(1 for block in content if "cache_control" in block)
+        print(f"Prompt layout: {len(content)} content blocks, {breakpoints} cache breakpoints")
+    fields = prompt_fields(content)
 
-Please provide your answer in the following JSON format:
-{{
-  "answer": "your answer here",
-  "source_document_number": <document number where you found the answer>,
-  "source_file": "filename where you found the answer",
-  "confidence": "high|medium|low"
-}}"""
+    print(f"Estimated tokens: {config['estimated_tokens']:,}")
 
     # Time the API call
     print(f"Executing query: \"{target_query}\"")
     print("Calling Anthropic API...")
-    start_time = time.time()
+    start_time = time.perf_counter()
+    delta_times = []
 
     try:
-        response = client.messages.create(
-            model=MODEL,
-            max_tokens=1024,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+        if stream:
+            with client.messages.stream(
+                model=MODEL,
+                max_tokens=1024,
+                messages=[
+                    {"role": "user", "content": content}
+                ]
+            ) as response_stream:
+                for _ in response_stream.text_stream:
+                    delta_times.append(time.perf_counter() - start_time)
+                response = response_stream.get_final_message()
+        else:
+            response = client.messages.create(
+                model=MODEL,
+                max_tokens=1024,
+                messages=[
+                    {"role": "user", "content": content}
+                ]
+            )
 
-        end_time = time.time()
+        end_time = time.perf_counter()
         response_time_ms = int((end_time - start_time) * 1000)
 
         # Extract response text
@@ -133,11 +202,24 @@ Please provide your answer in the following JSON format:
         # Get token usage
         input_tokens = response.usage.input_tokens
         output_tokens = response.usage.output_tokens
+        # Imported here: prompt_cache builds on this module's prompt helpers
+        from prompt_cache import cache_usage
+        cached = cache_usage(response.usage)
+        cache_creation_tokens = cached["cache_creation_input_tokens"]
+        cache_read_tokens = cached["cache_read_input_tokens"]
 
         print(f"Response time: {response_time_ms}ms")
         print(f"Input tokens: {input_tokens:,}")
+        if cache_creation_tokens or cache_read_tokens:
+            print(f"Cache write/read tokens: {cache_creation_tokens:,} / {cache_read_tokens:,}")
         print(f"Output tokens: {output_tokens:,}")
 
+        timing = {}
+        if stream:
+            timing = streaming_metrics(delta_times, end_time - start_time, output_tokens)
+            print(f"Time to first token: {timing['ttft_ms']}ms, "
+                  f"inter-token latency: {timing['inter_token_ms']:.1f}ms")
+
         # Extract answer
         extracted_answer, source_file, confidence = extract_answer_from_response(
             response_text, target_answer
@@ -146,15 +228,13 @@ Please provide your answer in the following JSON format:
         print(f"Extracted answer: {extracted_answer}")
 
         # Check correctness
-        is_correct = (
-            extracted_answer.strip().lower() == target_answer.strip().lower() or
-            target_answer.strip().lower() in extracted_answer.strip().lower()
-        )
+        is_correct = check_correctness(extracted_answer, target_answer)
         print(f"Correctness: {'✓ CORRECT' if is_correct else '✗ INCORRECT'}")
 
         # Build result entry
         result_entry = {
             "test_id": config["test_id"],
+            "repetition": repetition,
             "num_documents": config["num_documents"],
             "target_position": config["target_position"],
             "target_position_normalized": config["target_position_normalized"],
@@ -163,9 +243,13 @@ Please provide your answer in the following JSON format:
             "extracted_answer": extracted_answer,
             "is_correct": is_correct,
             "response_time_ms": response_time_ms,
+            **timing,
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
-            "total_tokens": input_tokens + output_tokens,
+            "cache_creation_input_tokens": cache_creation_tokens,
+            "cache_read_input_tokens": cache_read_tokens,
+            "total_tokens": input_tokens + cache_creation_tokens + cache_read_tokens + output_tokens,
+            **fields,
             "timestamp": datetime.utcnow().isoformat() + "Z",
             "model": MODEL,
             "source_file": source_file,
@@ -176,13 +260,14 @@ Please provide your answer in the following JSON format:
         return result_entry
 
     except Exception as e:
-        end_time = time.time()
+        end_time = time.perf_counter()
         response_time_ms = int((end_time - start_time) * 1000)
 
         print(f"ERROR: {e}")
 
         return {
             "test_id": config["test_id"],
+            "repetition": repetition,
             "num_documents": config["num_documents"],
             "target_position": config["target_position"],
             "target_position_normalized": config["target_position_normalized"],
@@ -194,6 +279,7 @@ Please provide your answer in the following JSON format:
             "input_tokens": 0,
             "output_tokens": 0,
             "total_tokens": 0,
+            **fields,
             "timestamp": datetime.utcnow().isoformat() + "Z",
             "model": MODEL,
             "error": str(e)
@@ -202,26 +288,64 @@ Please provide your answer in the following JSON format:
 
 def main():
     """Run all experiment tests automatically."""
+    parser = argparse.ArgumentParser(description="Automated Experiment 2 runner")
+    parser.add_argument("--prompt-cache", action="store_true",
+                        help="send documents as content blocks with cache breakpoints")
+    parser.add_argument("--prompt-layout", choices=["combined", "blocks"],
+                        help="send the combined file, or one content block per document "
+                             "(default: blocks with --prompt-cache, else combined); "
+                             "blocks without --prompt-cache is the like-for-like uncached baseline")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream responses and record time-to-first-token")
+    parser.add_argument("--repetitions", type=int, default=1, help="runs per configuration")
+    parser.add_argument("--log", type=Path, default=RESULTS_LOG,
+                        help="JSONL result log; completed tests in it are skipped")
+    parser.add_argument("--batch", action="store_true",
+                        help="submit all tests through the Message Batches API")
+    parser.add_argument("--fake-batch", action="store_true",
+                        help="with --batch: use the local file-backed batch client")
+    parser.add_argument("--poll-interval", type=float,
+                        help="with --batch: seconds between batch status polls "
+                             "(default 60, or 1 with --fake-batch)")
+    parser.add_argument("--fake-batch-error-rate", type=float, default=0.0,
+                        help="with --fake-batch: fraction of requests that come back errored")
+    args = parser.parse_args()
+    if args.prompt_cache and args.prompt_layout == "combined":
+        parser.error("--prompt-cache needs --prompt-layout blocks")
+    if args.stream and args.batch:
+        parser.error("--stream cannot be combined with --batch (batch results are not streamed)")
+    layout = args.prompt_layout or ("blocks" if args.prompt_cache else "combined")
+
     print("=" * 70)
     print("Experiment 2: Automated Multi-Document Extraction Tests")
     print("=" * 70)
     print()
 
-    # Check for API key
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        print("ERROR: ANTHROPIC_API_KEY environment variable not set.")
-        print()
-        print("Please set your API key:")
-        print("  export ANTHROPIC_API_KEY='your-api-key-here'")
-        print()
-        print("Or run with:")
-        print("  ANTHROPIC_API_KEY='your-key' python3 run_experiment_auto.py")
-        exit(1)
-
-    # Initialize Anthropic client
-    client = anthropic.Anthropic(api_key=api_key)
-    print("✓ Anthropic API client initialized")
+    fake_batch = args.batch and args.fake_batch
+    if fake_batch:
+        client = None
+        print("✓ Using the local file-backed batch client")
+    else:
+        if not ANTHROPIC_AVAILABLE:
+            print("Error: anthropic package not installed.")
+            print("Install with: pip install anthropic")
+            exit(1)
+
+        # Check for API key
+        api_key = os.environ.get("ANTHROPIC_API_KEY")
+        if not api_key:
+            print("ERROR: ANTHROPIC_API_KEY environment variable not set.")
+            print()
+            print("Please set your API key:")
+            print("  export ANTHROPIC_API_KEY='your-api-key-here'")
+            print()
+            print("Or run with:")
+            print("  ANTHROPIC_API_KEY='your-key' python3 run_experiment_auto.py")
+            exit(1)
+
+        # Initialize Anthropic client
+        client = anthropic.Anthropic(api_key=api_key)
+        print("✓ Anthropic API client initialized")
     print(f"✓ Using model: {MODEL}")
     print()
 
@@ -246,57 +370,107 @@ def main():
     print()
 
     print("Starting automated experiment...")
-    print("This will take approximately 3-5 minutes.")
+    if fake_batch:
+        print("The local batch client ends its batches within a few polls.")
+    elif args.batch:
+        print("Batches usually end within an hour, but can take up to 24 hours.")
+    else:
+        print("This will take approximately 3-5 minutes.")
     print()
 
-    results = []
+    contents = {}
+    if layout == "blocks":
+        # Imported here: prompt_cache builds on this module's prompt helpers
+        from prompt_cache import build_all_cached_content
+        contents = build_all_cached_content(metadata, cache=args.prompt_cache)
+        # Smallest configuration first, so each one writes the prefix the next reads
+        # (uncached runs use the same order, so the two differ only by cache_control)
+        configs = sorted(configs, key=lambda c: c["num_documents"])
+        if args.prompt_cache:
+            print("Prompt caching enabled (shared document prefixes are cached)")
+        else:
+            print("Block prompt layout without cache breakpoints (uncached baseline)")
+        print()
 
-    # Run each test
-    for i, config in enumerate(configs, 1):
-        print(f"\n\nTest {i}/{len(configs)}")
+    if args.batch:
+        # Imported here: message_batches builds on this module's prompt helpers
+        from message_batches import BATCH_DIR, AnthropicBatchClient, run_batch
+        if fake_batch:
+            from fake_batch_client import FileBatchClient
+            batch_client = FileBatchClient(BATCH_DIR / "fake", polls_to_end=2,
+                                           error_rate=args.fake_batch_error_rate)
+        else:
+            batch_client = AnthropicBatchClient(client)
+        poll_interval = args.poll_interval
+        if poll_interval is None:
+            poll_interval = 1.0 if fake_batch else 60.0
+        print(f"Batch mode: request files and state in {BATCH_DIR}, results logged to {args.log}")
+        print()
+        run_batch(batch_client, metadata, COMBINED_DIR, contents, args.repetitions, args.log,
+                  BATCH_DIR, poll_interval=poll_interval)
+    else:
+        done = completed_keys(args.log)
+        mode = "cached" if args.prompt_cache else layout
+        pending = [(rep, config) for rep in range(args.repetitions) for config in configs
+                   if (config["test_id"], rep, MODEL, mode) not in done]
+        print(f"Logging results to: {args.log}")
+        if len(pending) < args.repetitions * len(configs):
+            print(f"Resuming: {args.repetitions * len(configs) - len(pending)} tests already completed")
+        print()
 
-        try:
-            result = run_single_test(
-                client,
-                config,
-                COMBINED_DIR,
-                target_query,
-                target_answer
-            )
-            results.append(result)
-
-            # Small delay between requests to avoid rate limiting
-            if i < len(configs):
-                time.sleep(1)
-
-        except KeyboardInterrupt:
-            print("\n\nExperiment interrupted by user.")
-            break
-        except Exception as e:
-            print(f"\nError in test {config['test_id']}: {e}")
-            import traceback
-            traceback.print_exc()
-
-            # Add error entry
-            results.append({
-                "test_id": config["test_id"],
-                "num_documents": config["num_documents"],
-                "target_position": config["target_position"],
-                "target_position_normalized": config["target_position_normalized"],
-                "query": target_query,
-                "expected_answer": target_answer,
-                "extracted_answer": "ERROR",
-                "is_correct": False,
-                "response_time_ms": 0,
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "total_tokens": 0,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "model": MODEL,
-                "error": str(e)
-            })
-
-    # Save results
+        # Run each pending test, appending its result to the log immediately
+        with ResultLog(args.log) as log:
+            for i, (rep, config) in enumerate(pending, 1):
+                print(f"\n\nTest {i}/{len(pending)} (repetition {rep})")
+
+                try:
+                    result = run_single_test(
+                        client,
+                        config,
+                        COMBINED_DIR,
+                        target_query,
+                        target_answer,
+                        contents.get(config["test_id"]),
+                        args.stream,
+                        rep
+                    )
+                    log.append(result)
+
+                    # Small delay between requests to avoid rate limiting
+                    if i < len(pending):
+                        time.sleep(1)
+
+                except KeyboardInterrupt:
+                    print("\n\nExperiment interrupted by user. Rerun to resume.")
+                    break
+                except Exception as e:
+                    print(f"\nError in test {config['test_id']}: {e}")
+                    import traceback
+                    traceback.print_exc()
+
+                    # Add error entry (retried on the next run)
+                    log.append({
+                        "test_id": config["test_id"],
+                        "repetition": rep,
+                        "num_documents": config["num_documents"],
+                        "target_position": config["target_position"],
+                        "target_position_normalized": config["target_position_normalized"],
+                        "query": target_query,
+                        "expected_answer": target_answer,
+                        "extracted_answer": "ERROR",
+                        "is_correct": False,
+                        "response_time_ms": 0,
+                        "input_tokens": 0,
+                        "output_tokens": 0,
+                        "total_tokens": 0,
+                        **prompt_fields(contents.get(config["test_id"])),
+                        "timestamp": datetime.utcnow().isoformat() + "Z",
+                        "model": MODEL,
+                        "error": str(e)
+                    })
+
+    # Save a JSON snapshot of the latest result per test
+    results = latest_results(args.log)
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
 
     print(f"\n\nSaving results to: {OUTPUT_FILE}")
@@ -310,7 +484,7 @@ def main():
     print(f"  Total tests: {len(results)}")
     correct = sum(1 for r in results if r.get("is_correct", False))
     print(f"  Correct answers: {correct}/{len(results)} ({correct/len(results)*100:.1f}%)")
-    print(f"  Results saved to: {OUTPUT_FILE}")
+    print(f"  Results saved to: {OUTPUT_FILE} (log: {args.log})")
     print()
     print("Next step: Run analyze_results.py to analyze the data")
     print("=" * 70)
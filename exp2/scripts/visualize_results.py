@@ -299,6 +299,45 @@ def plot_combined_dashboard(data, analysis, output_file):
     print(f"  ✓ Created: {output_file.name}")
 
 
+def plot_ttft_vs_tokens(ttft, output_file):
+    """
+    Plot time-to-first-token against input tokens for streamed runs.
+
+    Args:
+        ttft: ``ttft_analysis`` section of the analysis results
+        output_file: Path to save plot
+    """
+    points = ttft["points"]
+
+    plt.figure(figsize=(10, 6))
+
+    for cached, color, label in ((False, '#2E86AB', 'Uncached'), (True, '#F18F01', 'Prompt cache')):
+        subset = [p for p in points if p["prompt_cache"] == cached]
+        if subset:
+            plt.scatter([p["input_tokens"] / 1000 for p in subset], [p["ttft_ms"] for p in subset],
+                        s=120, color=color, alpha=0.7, edgecolors='black', linewidth=1.2, label=label)
+
+    # Fitted prefill line (uncached runs)
+    if "ttft_ms_per_1k_input_tokens" in ttft:
+        x = np.linspace(0, max(p["input_tokens"] for p in points) / 1000, 100)
+        y = ttft["ttft_intercept_ms"] + ttft["ttft_ms_per_1k_input_tokens"] * x
+        plt.plot(x, y, "r--", alpha=0.8, linewidth=2,
+                 label=f'Fit: {ttft["ttft_ms_per_1k_input_tokens"]:.2f} ms / 1k tokens')
+
+    # Formatting
+    plt.xlabel('Input Tokens (thousands)', fontsize=12, fontweight='bold')
+    plt.ylabel('Time to First Token (ms)', fontsize=12, fontweight='bold')
+    plt.title('Time to First Token vs Input Tokens', fontsize=16, fontweight='bold')
+    plt.grid(True, alpha=0.3, linestyle=':', linewidth=0.8)
+    plt.legend(loc='best', framealpha=0.9)
+
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.close()
+
+    print(f"  ✓ Created: {output_file.name}")
+
+
 def main():
     """Generate all visualizations."""
     print("=" * 70)
@@ -329,15 +368,19 @@ def main():
 
     plot_combined_dashboard(data, analysis, VIZ_DIR / "combined_metrics.png")
 
+    plots = ["accuracy_vs_doc_count.png", "response_time_vs_doc_count.png",
+             "token_count_vs_doc_count.png", "combined_metrics.png"]
+    if analysis.get("ttft_analysis"):
+        plot_ttft_vs_tokens(analysis["ttft_analysis"], VIZ_DIR / "ttft_vs_input_tokens.png")
+        plots.append("ttft_vs_input_tokens.png")
+
     # Summary
     print("\n" + "=" * 70)
     print("Visualization Complete!")
     print("=" * 70)
-    print(f"  Generated 4 plots in: {VIZ_DIR}")
-    print(f"    - accuracy_vs_doc_count.png")
-    print(f"    - response_time_vs_doc_count.png")
-    print(f"    - token_count_vs_doc_count.png")
-    print(f"    - combined_metrics.png")
+    print(f"  Generated {len(plots)} plots in: {VIZ_DIR}")
+    for plot in plots:
+        print(f"    - {plot}")
     print()
     print("All files saved at 300 DPI for publication quality.")
     print("=" * 70)
@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from async_client import AsyncMessagesClient, StreamedError
+
+START = {"type": "message_start", "message": {"usage": {"input_tokens": 5, "output_tokens": 0}}}
+DELTA = {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "hi"}}
+END = {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 1}}
+
+
+def sse(*events):
+    return "".join(f"event: {e['type']}\ndata: {json.dumps(e)}\n\n" for e in events).encode()
+
+
+def error_event(error_type):
+    return {"type": "error", "error": {"type": error_type, "message": error_type}}
+
+
+def run_stream(bodies):
+    """Stream one request against responses served in order; return (result or error, calls)."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, content=bodies[min(len(calls), len(bodies)) - 1])
+
+    async def main():
+        async with AsyncMessagesClient("http://mock", max_retries=3, backoff_base=0.001) as client:
+            await client.http.aclose()
+            client.http = httpx.AsyncClient(base_url="http://mock", transport=httpx.MockTransport(handler))
+            return await client.create({"model": "m", "max_tokens": 8, "messages": []}, stream=True)
+
+    try:
+        return asyncio.run(main()), len(calls)
+    except Exception as e:
+        return e, len(calls)
+
+
+def test_overloaded_stream_is_retried():
+    result, calls = run_stream([sse(START, error_event("overloaded_error")), sse(START, DELTA, END)])
+    assert calls == 2
+    assert result["attempts"] == 2
+    assert result["message"]["content"][0]["text"] == "hi"
+
+
+def test_invalid_request_stream_is_not_retried():
+    error, calls = run_stream([sse(START, error_event("invalid_request_error"))])
+    assert calls == 1
+    assert isinstance(error, StreamedError)
+    assert error.status == 400
+
+
+@pytest.mark.parametrize("error_type, status", [("rate_limit_error", 429), ("something_new", 500)])
+def test_retryable_stream_errors(error_type, status):
+    error, calls = run_stream([sse(START, error_event(error_type))])
+    assert calls == 4  # first attempt plus max_retries
+    assert error.status == status
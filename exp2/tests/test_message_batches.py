@@ -0,0 +1,136 @@
+import re
+
+import pytest
+
+from fake_batch_client import FileBatchClient
+from message_batches import (build_batch_requests, custom_id, load_state, parse_custom_id,
+                             run_batch, write_batch_files)
+from prompt_cache import build_cached_content
+from result_log import iter_log
+
+FILES = {
+    "a.txt": "The bridge opened to traffic in 1932.",
+    "b.txt": "The museum was founded in 1971.",
+}
+QUERY = "When was the museum founded?"
+
+
+def config(test_id, order):
+    return {
+        "test_id": test_id,
+        "num_documents": len(order),
+        "target_position": order.index("b.txt"),
+        "target_position_normalized": order.index("b.txt") / len(order),
+        "combined_file": f"{test_id}.txt",
+        "document_order": order,
+    }
+
+
+@pytest.fixture
+def sweep():
+    configs = [config("test_01_two_docs", ["a.txt", "b.txt"]), config("test_02_one_doc", ["b.txt"])]
+    orders = [c["document_order"] for c in configs]
+    metadata = {"test_configurations": configs, "target_query": QUERY, "target_answer": "1971"}
+    contents = {c["test_id"]: build_cached_content(FILES, c["document_order"], orders, QUERY)
+                for c in configs}
+    return metadata, contents
+
+
+@pytest.mark.parametrize("test_id", ["test_01_two_docs", "test-rep-7", "x"])
+@pytest.mark.parametrize("repetition", [0, 12])
+def test_custom_id_round_trip(test_id, repetition):
+    request_id = custom_id(test_id, repetition)
+    assert re.fullmatch(r"[a-zA-Z0-9_-]{1,64}", request_id)
+    assert parse_custom_id(request_id) == (test_id, repetition)
+
+
+def test_batch_files_respect_limits(tmp_path, sweep):
+    metadata, contents = sweep
+    requests = build_batch_requests(metadata["test_configurations"], contents, 3, set())
+    assert len(requests) == 6
+    files = write_batch_files(requests, tmp_path, "req", max_requests=4)
+    assert [sum(1 for _ in open(f, encoding="utf-8")) for f in files] == [4, 2]
+
+
+def test_file_batch_client_lifecycle(tmp_path, sweep):
+    metadata, contents = sweep
+    client = FileBatchClient(tmp_path, polls_to_end=2)
+    requests = build_batch_requests(metadata["test_configurations"], contents, 1, set())
+    batch = client.create(requests)
+    assert batch["processing_status"] == "in_progress"
+    with pytest.raises(ValueError):
+        list(client.results(batch["id"]))
+
+    assert client.retrieve(batch["id"])["processing_status"] == "in_progress"
+    ended = client.retrieve(batch["id"])
+    assert ended["processing_status"] == "ended"
+    assert ended["request_counts"]["succeeded"] == 2
+    assert "polls" not in ended
+
+    results = list(client.results(batch["id"]))
+    assert [r["custom_id"] for r in results] == [r["custom_id"] for r in requests]
+    assert all('"1971"' in r["result"]["message"]["content"][0]["text"] for r in results)
+
+
+def test_errored_requests_are_resubmitted(tmp_path, sweep):
+    metadata, contents = sweep
+    log_file = tmp_path / "log.jsonl"
+    batch_dir = tmp_path / "batches"
+    run_batch(FileBatchClient(tmp_path / "fake", polls_to_end=1, error_rate=1.0),
+              metadata, tmp_path, contents, 4, log_file, batch_dir, poll_interval=0)
+    results = list(iter_log(log_file))
+    assert len(results) == 8
+    assert all("overloaded_error" in r["error"] for r in results)
+
+    run_batch(FileBatchClient(tmp_path / "fake", polls_to_end=1),
+              metadata, tmp_path, contents, 4, log_file, batch_dir, poll_interval=0)
+    results = list(iter_log(log_file))[8:]
+    assert len(results) == 8
+    assert all("error" not in r and r["is_correct"] for r in results)
+    assert all(r["prompt_cache"] and r["batch"] for r in results)
+
+
+def test_interrupted_run_resumes_without_resubmitting(tmp_path, sweep):
+    metadata, contents = sweep
+    log_file = tmp_path / "log.jsonl"
+    batch_dir = tmp_path / "batches"
+
+    class Interrupted(FileBatchClient):
+        def retrieve(self, batch_id):
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(Interrupted(tmp_path / "fake"), metadata, tmp_path, contents, 2, log_file,
+                  batch_dir, poll_interval=0)
+    assert [entry["collected"] for entry in load_state(batch_dir)] == [False]
+
+    client = FileBatchClient(tmp_path / "fake", polls_to_end=1)
+    run_batch(client, metadata, tmp_path, contents, 2, log_file, batch_dir, poll_interval=0)
+    assert len(list((tmp_path / "fake").iterdir())) == 1
+    assert [entry["collected"] for entry in load_state(batch_dir)] == [True]
+    assert sorted((r["test_id"], r["repetition"]) for r in iter_log(log_file)) == [
+        ("test_01_two_docs", 0), ("test_01_two_docs", 1), ("test_02_one_doc", 0), ("test_02_one_doc", 1),
+    ]
+
+
+def test_resumed_batches_keep_their_submitted_prompt_mode(tmp_path, sweep):
+    metadata, cached = sweep
+    log_file = tmp_path / "log.jsonl"
+    batch_dir = tmp_path / "batches"
+
+    class Interrupted(FileBatchClient):
+        def retrieve(self, batch_id):
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(Interrupted(tmp_path / "fake"), metadata, tmp_path, cached, 1, log_file,
+                  batch_dir, poll_interval=0)
+    assert load_state(batch_dir)[0]["prompt_cache"] is True
+
+    orders = [c["document_order"] for c in metadata["test_configurations"]]
+    uncached = {c["test_id"]: build_cached_content(FILES, c["document_order"], orders, QUERY, cache=False)
+                for c in metadata["test_configurations"]}
+    run_batch(FileBatchClient(tmp_path / "fake", polls_to_end=1), metadata, tmp_path, uncached, 1,
+              log_file, batch_dir, poll_interval=0)
+    modes = [(r["prompt_layout"], r["prompt_cache"]) for r in iter_log(log_file)]
+    assert modes == [("blocks", True)] * 2 + [("blocks", False)] * 2
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from async_client import AsyncMessagesClient, RetryableStatus
+from mock_messages_server import MockMessagesServer, answer_question
+from prompt_cache import build_cached_content
+
+FILES = {
+    "a.txt": "The bridge opened to traffic in 1932 after years of work.",
+    "b.txt": "The museum was founded by the city council in 1971.",
+    "c.txt": "The river floods every spring.",
+}
+ORDERS = [["a.txt", "b.txt"], ["a.txt", "b.txt", "c.txt"]]
+QUERY = "When was the museum founded?"
+
+
+def request(order, cache=True):
+    content = build_cached_content(FILES, order, ORDERS, QUERY, cache)
+    return {"model": "mock", "max_tokens": 64, "messages": [{"role": "user", "content": content}]}
+
+
+def send(server, bodies, stream=False, max_retries=0):
+    async def main():
+        async with AsyncMessagesClient(server.url, max_retries=max_retries, backoff_base=0.001) as client:
+            return [await client.create(body, stream=stream) for body in bodies]
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def server():
+    with MockMessagesServer(base_ms=0, per_1k_input_ms=0, per_output_ms=0) as server:
+        yield server
+
+
+def test_answers_from_the_best_matching_sentence():
+    prompt = "\n".join(FILES.values()) + f"\nQuestion: {QUERY}"
+    assert '"answer": "1971"' in answer_question(prompt)
+
+
+def test_cached_prefix_is_written_then_read(server):
+    first, second = (reply["message"]["usage"] for reply in send(server, [request(ORDERS[0]), request(ORDERS[1])]))
+    assert first["cache_read_input_tokens"] == 0
+    assert first["cache_creation_input_tokens"] > 0
+    # the second configuration starts with the first one's documents
+    assert second["cache_read_input_tokens"] == first["cache_creation_input_tokens"]
+
+
+def test_blocks_without_breakpoints_are_not_cached(server):
+    replies = send(server, [request(ORDERS[0], cache=False)] * 2)
+    for reply in replies:
+        usage = reply["message"]["usage"]
+        assert usage["cache_creation_input_tokens"] == usage["cache_read_input_tokens"] == 0
+
+
+def test_streamed_reply_matches_answer(server):
+    (reply,) = send(server, [request(ORDERS[0])], stream=True)
+    assert '"answer": "1971"' in reply["message"]["content"][0]["text"]
+    assert reply["message"]["usage"]["output_tokens"] > 0
+    assert len(reply["delta_times_s"]) > 1
+
+
+def test_error_rate_fails_requests():
+    with MockMessagesServer(base_ms=0, error_rate=1.0) as server:
+        with pytest.raises(RetryableStatus) as raised:
+            send(server, [request(ORDERS[0])], max_retries=2)
+    assert raised.value.status in (429, 529)
@@ -0,0 +1,37 @@
+from prompt_cache import build_cached_content, cache_breakpoints
+from result_log import prompt_fields, prompt_mode, result_key
+
+ORDERS = [list("abcx"), list("abcdy"), list("abz")]
+FILES = {name: f"text of {name}" for name in "abcdxyz"}
+
+
+def test_breakpoints_after_shared_prefixes_and_last_document():
+    # shared with all: "ab" (2); longest shared with one: "abc" (3); end: 4
+    assert cache_breakpoints(ORDERS[0], ORDERS) == [2, 3, 4]
+    assert cache_breakpoints(ORDERS[2], ORDERS) == [2, 3]
+
+
+def test_breakpoints_without_other_configurations():
+    order = list("abc")
+    assert cache_breakpoints(order, [order]) == [3]
+
+
+def test_uncached_layout_differs_only_by_cache_control():
+    cached = build_cached_content(FILES, ORDERS[0], ORDERS, "question?")
+    uncached = build_cached_content(FILES, ORDERS[0], ORDERS, "question?", cache=False)
+    assert [block["text"] for block in cached] == [block["text"] for block in uncached]
+    assert [i for i, block in enumerate(cached) if "cache_control" in block] == [1, 2, 3]
+    assert not any("cache_control" in block for block in uncached)
+
+
+def test_prompt_modes_key_results_separately():
+    blocks = build_cached_content(FILES, ORDERS[0], ORDERS, "question?", cache=False)
+    cached = build_cached_content(FILES, ORDERS[0], ORDERS, "question?")
+    modes = [prompt_mode(prompt_fields(prompt)) for prompt in ("combined prompt", None, blocks, cached)]
+    assert modes == ["combined", "combined", "blocks", "cached"]
+
+    base = {"test_id": "t", "repetition": 0, "model": "m"}
+    assert result_key({**base, **prompt_fields(blocks)}) != result_key({**base, **prompt_fields(cached)})
+    # results logged before prompt_layout existed
+    assert prompt_mode({**base, "prompt_cache": True}) == "cached"
+    assert prompt_mode(base) == "combined"
@@ -0,0 +1,45 @@
+import json
+
+from result_log import ResultLog, completed_keys, iter_log, latest_results
+
+
+def result(test_id, repetition=0, **fields):
+    return {"test_id": test_id, "repetition": repetition, "model": "m", **fields}
+
+
+def test_truncated_last_line_is_skipped_and_dropped(tmp_path):
+    log_file = tmp_path / "log.jsonl"
+    with ResultLog(log_file) as log:
+        log.append(result("a"))
+        log.append(result("b"))
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result("c"))[:20])  # crash mid-write
+
+    assert [r["test_id"] for r in iter_log(log_file)] == ["a", "b"]
+
+    with ResultLog(log_file) as log:
+        log.append(result("c"))
+    assert [r["test_id"] for r in iter_log(log_file)] == ["a", "b", "c"]
+    assert log_file.read_text(encoding="utf-8").count("\n") == 3
+
+
+def test_errors_are_retried_and_superseded(tmp_path):
+    log_file = tmp_path / "log.jsonl"
+    with ResultLog(log_file) as log:
+        log.append(result("a", error="HTTP 529"))
+        log.append(result("b"))
+        log.append(result("b", 1, error="HTTP 429"))
+
+    assert completed_keys(log_file) == {("b", 0, "m", "combined")}
+
+    with ResultLog(log_file) as log:
+        log.append(result("a", is_correct=True))
+    latest = {(r["test_id"], r["repetition"]): r for r in latest_results(log_file)}
+    assert "error" not in latest[("a", 0)]
+    assert "error" in latest[("b", 1)]
+    assert ("a", 0, "m", "combined") in completed_keys(log_file)
+
+
+def test_missing_log_is_empty(tmp_path):
+    assert list(iter_log(tmp_path / "missing.jsonl")) == []
+    assert completed_keys(tmp_path / "missing.jsonl") == set()
@@ -6,6 +6,8 @@ from typing import Dict, List, Any
 import matplotlib.pyplot as plt
 import numpy as np
 
+from timing import LatencyHistogram
+
 
 class ResultsAnalyzer:
     """Analyzes experiment results and generates visualizations."""
@@ -126,6 +128,161 @@ class ResultsAnalyzer:
 
         print(f"Chart saved to {output_path}")
 
+    def latency_percentiles(self) -> Dict[str, Dict[str, Any]]:
+        """Retrieval-time percentile summaries per mode from loaded results.
+
+        Returns:
+            Mode name -> summary from ``LatencyHistogram.summary``
+        """
+        summaries = {}
+        for mode in ("full_context", "rag"):
+            histogram = LatencyHistogram()
+            for r in self.results:
+                histogram.record(r[mode]["retrieval_time"] * 1e9)
+            summaries[mode] = histogram.summary()
+        return summaries
+
+    def latency_table(self, summaries: Dict[str, Dict[str, Any]]) -> str:
+        """Format latency summaries (per mode or per stage) as a markdown table.
+
+        Args:
+            summaries: Name -> summary, e.g. ``latency_report()["stages"]``
+
+        Returns:
+            Markdown table string
+        """
+        table = "| Span | Count | Mean (ms) | p50 (ms) | p90 (ms) | p95 (ms) | p99 (ms) | Max (ms) |\n"
+        table += "|---|---|---|---|---|---|---|---|\n"
+        for name, s in summaries.items():
+            table += (
+                f"| {name} | {s['count']} | {s['mean_ms']:.3f} | {s['p50_ms']:.3f} "
+                f"| {s['p90_ms']:.3f} | {s['p95_ms']:.3f} | {s['p99_ms']:.3f} | {s['max_ms']:.3f} |\n"
+            )
+        return table
+
+    def hnsw_table(self, rows: List[Dict[str, Any]]) -> str:
+        """Format HNSW sweep results as a markdown table.
+
+        Args:
+            rows: Result rows from ``hnsw_benchmark.run_hnsw_benchmark``
+
+        Returns:
+            Markdown table string
+        """
+        table = "| M | ef_construction | ef_search | Build (s) | Index (KB) | p50 (ms) | p95 (ms) | p99 (ms) | Recall@k |\n"
+        table += "|---|---|---|---|---|---|---|---|---|\n"
+        for r in rows:
+            p = r["params"]
+            table += (
+                f"| {p.get('M', '-')} | {p.get('construction_ef', '-')} | {p.get('search_ef', '-')} "
+                f"| {r['build_seconds']:.3f} | {r['index_bytes'] / 1024:.0f} "
+                f"| {r['p50_ms']:.2f} | {r['p95_ms']:.2f} | {r['p99_ms']:.2f} "
+                f"| {r['recall_at_k']:.3f} |\n"
+            )
+        return table
+
+    def create_hnsw_chart(self, rows: List[Dict[str, Any]], output_path: str = "charts/hnsw_sweep.png"):
+        """Plot recall vs p95 latency and build time per HNSW setting.
+
+        Args:
+            rows: Result rows from ``hnsw_benchmark.run_hnsw_benchmark``
+            output_path: Output file path
+        """
+        if not rows:
+            return
+
+        Path(output_path).parent.mkdir(exist_ok=True)
+
+        labels = [r["label"] for r in rows]
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+
+        ax1.scatter([r["p95_ms"] for r in rows], [r["recall_at_k"] for r in rows], alpha=0.8)
+        for r in rows:
+            ax1.annotate(r["label"], (r["p95_ms"], r["recall_at_k"]), fontsize=7,
+                         textcoords="offset points", xytext=(3, 3))
+        ax1.set_xlabel("p95 Query Latency (ms)")
+        ax1.set_ylabel(f"Recall@{rows[0]['k']}")
+        ax1.set_title("Recall vs Latency")
+        ax1.grid(alpha=0.3)
+
+        x = np.arange(len(rows))
+        ax2.bar(x, [r["build_seconds"] for r in rows], alpha=0.8)
+        ax2.set_xticks(x)
+        ax2.set_xticklabels(labels, rotation=45, ha="right", fontsize=7)
+        ax2.set_ylabel("Build Time (s)")
+        ax2.set_title("Index Build Time")
+
+        plt.tight_layout()
+        plt.savefig(output_path, dpi=100, bbox_inches="tight")
+        plt.close()
+
+        print(f"Chart saved to {output_path}")
+
+    def scale_table(self, rows: List[Dict[str, Any]]) -> str:
+        """Format scale benchmark results as a markdown table.
+
+        Args:
+            rows: Result rows from ``scale_benchmark.run_scale_benchmark``
+
+        Returns:
+            Markdown table string
+        """
+        table = "| Documents | Chunks | Chunk (s) | Index (s) | Index (MB) | Peak RSS (MB) | p50 (ms) | p95 (ms) | p99 (ms) | Recall@k |\n"
+        table += "|---|---|---|---|---|---|---|---|---|---|\n"
+        for r in rows:
+            latency = r["latency"]
+            table += (
+                f"| {r['documents']} | {r['chunks']} | {r['chunk_seconds']:.2f} | {r['index_seconds']:.2f} "
+                f"| {r['index_bytes'] / 2**20:.1f} | {r['peak_rss_mb']:.0f} "
+                f"| {latency['p50_ms']:.2f} | {latency['p95_ms']:.2f} | {latency['p99_ms']:.2f} "
+                f"| {r['recall_at_k']:.3f} |\n"
+            )
+        return table
+
+    def create_scale_chart(self, rows: List[Dict[str, Any]], output_path: str = "charts/scale.png"):
+        """Plot index time, query latency and peak memory against corpus size.
+
+        Args:
+            rows: Result rows from ``scale_benchmark.run_scale_benchmark``
+            output_path: Output file path
+        """
+        if not rows:
+            return
+
+        Path(output_path).parent.mkdir(exist_ok=True)
+
+        sizes = [r["documents"] for r in rows]
+        fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(16, 5))
+
+        ax1.plot(sizes, [r["chunk_seconds"] for r in rows], "o-", label="Chunking")
+        ax1.plot(sizes, [r["index_seconds"] for r in rows], "o-", label="Indexing")
+        ax1.set_ylabel("Time (s)")
+        ax1.set_title("Index Time")
+        ax1.legend()
+
+        for p in (50, 95, 99):
+            ax2.plot(sizes, [r["latency"][f"p{p}_ms"] for r in rows], "o-", label=f"p{p}")
+        ax2.set_ylabel("Query Latency (ms)")
+        ax2.set_title("Query Latency")
+        ax2.legend()
+
+        ax3.plot(sizes, [r["peak_rss_mb"] for r in rows], "o-", label="Peak RSS")
+        ax3.plot(sizes, [r["index_bytes"] / 2**20 for r in rows], "o-", label="Index on disk")
+        ax3.set_ylabel("MB")
+        ax3.set_title("Memory and Index Size")
+        ax3.legend()
+
+        for ax in (ax1, ax2, ax3):
+            ax.set_xscale("log")
+            ax.set_xlabel("Documents")
+            ax.grid(alpha=0.3)
+
+        plt.tight_layout()
+        plt.savefig(output_path, dpi=100, bbox_inches="tight")
+        plt.close()
+
+        print(f"Chart saved to {output_path}")
+
     def generate_summary(self) -> str:
         """Generate a text summary of results.
 
@@ -144,5 +301,11 @@ class ResultsAnalyzer:
         summary += f"Avg context size reduction: {self.aggregate.get('avg_context_size_reduction', 0):.2f}%\n"
         summary += f"Full Context avg time: {self.aggregate.get('full_context_avg_time', 0):.6f}s\n"
         summary += f"RAG avg time: {self.aggregate.get('rag_avg_time', 0):.6f}s\n"
+        for mode, label in (("full_context", "Full Context"), ("rag", "RAG")):
+            if f"{mode}_p50_ms" in self.aggregate:
+                summary += (
+                    f"{label} latency p50/p95/p99: {self.aggregate[f'{mode}_p50_ms']:.3f} / "
+                    f"{self.aggregate[f'{mode}_p95_ms']:.3f} / {self.aggregate[f'{mode}_p99_ms']:.3f} ms\n"
+                )
 
         return summary
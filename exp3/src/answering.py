@@ -0,0 +1,163 @@
+"""Answer generation: send retrieved context to an LLM and measure the call."""
+
+import json
+import os
+import time
+from typing import List, Dict, Any
+
+import httpx
+
+SYSTEM_PROMPT = "Answer the question using only the provided context. Answer in Hebrew."
+ANTHROPIC_VERSION = "2023-06-01"
+
+
+class StreamError(Exception):
+    """An ``error`` event received in the middle of a streamed response."""
+
+    def __init__(self, error: Dict[str, Any]):
+        super().__init__(f"{error.get('type', 'error')}: {error.get('message', '')}")
+        self.error_type = error.get("type")
+
+
+class MessagesClient:
+    """Minimal streaming client for the Anthropic Messages API.
+
+    Works against the real API or ``mock_llm_server`` (pass its ``url``).
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://api.anthropic.com",
+        api_key: str = None,
+        model: str = "claude-haiku-4-5",
+        timeout: float = 120.0,
+    ):
+        """Initialize client.
+
+        Args:
+            base_url: API root (without ``/v1/messages``)
+            api_key: API key (defaults to ``ANTHROPIC_API_KEY``)
+            model: Model name sent with each request
+            timeout: Request timeout in seconds
+        """
+        self.model = model
+        self.http = httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            headers={
+                "x-api-key": api_key or os.environ.get("ANTHROPIC_API_KEY", "mock"),
+                "anthropic-version": ANTHROPIC_VERSION,
+                "content-type": "application/json",
+            },
+        )
+
+    def complete(self, system: str, prompt: str, max_tokens: int = 256) -> Dict[str, Any]:
+        """Stream one completion.
+
+        Args:
+            system: System prompt
+            prompt: User message
+            max_tokens: Output token limit
+
+        Returns:
+            Dict with ``text``, ``ttft_seconds``, ``latency_seconds``,
+            ``input_tokens`` and ``output_tokens``
+
+        Raises:
+            StreamError: If the stream ends with an ``error`` event (e.g.
+                ``overloaded_error`` after the response has started)
+        """
+        body = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "system": system,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True,
+        }
+        start = time.perf_counter()
+        first_token = None
+        text, usage = [], {"input_tokens": 0, "output_tokens": 0}
+
+        with self.http.stream("POST", "/v1/messages", json=body) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:])
+                if event["type"] == "message_start":
+                    usage["input_tokens"] = event["message"]["usage"]["input_tokens"]
+                elif event["type"] == "content_block_delta" and "text" in event["delta"]:
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    text.append(event["delta"]["text"])
+                elif event["type"] == "message_delta":
+                    usage["output_tokens"] = event["usage"]["output_tokens"]
+                elif event["type"] == "error":
+                    raise StreamError(event.get("error", {}))
+
+        finished = time.perf_counter()
+        return {
+            "text": "".join(text),
+            "ttft_seconds": (first_token or finished) - start,
+            "latency_seconds": finished - start,
+            **usage,
+        }
+
+    def close(self):
+        """Close the HTTP connection pool."""
+        self.http.close()
+
+
+def answer_correctness(answer: str, keywords: List[str]) -> float:
+    """Fraction of expected keywords found in the answer (0.5 when none given)."""
+    if not keywords:
+        return 0.5
+    return sum(1 for keyword in keywords if keyword in answer) / len(keywords)
+
+
+class AnswerStage:
+    """Generates an answer from each mode's context in a comparison result."""
+
+    def __init__(self, client: MessagesClient, max_tokens: int = 256, system: str = SYSTEM_PROMPT):
+        """Initialize answer stage.
+
+        Args:
+            client: MessagesClient used for generation
+            max_tokens: Output token limit per answer
+            system: System prompt
+        """
+        self.client = client
+        self.max_tokens = max_tokens
+        self.system = system
+
+    @staticmethod
+    def format_context(documents) -> str:
+        """Context text; a precomputed ``ContextBuffer`` is used as-is."""
+        text = getattr(documents, "text", None)
+        if text is not None:
+            return text
+        return "\n\n".join(doc["content"] for doc in documents)
+
+    def answer(self, query: str, documents, keywords: List[str] = None) -> Dict[str, Any]:
+        """Answer ``query`` from ``documents`` and score the answer.
+
+        The question is the prompt's last line, after the context.
+
+        Returns:
+            ``MessagesClient.complete`` output plus ``correctness``
+        """
+        prompt = f"Context:\n{self.format_context(documents)}\n\nQuestion:\n{query}"
+        result = self.client.complete(self.system, prompt, self.max_tokens)
+        result["correctness"] = answer_correctness(result["text"], keywords or [])
+        return result
+
+    def answer_result(self, result: Dict[str, Any], keywords: List[str] = None) -> Dict[str, Any]:
+        """Answer from both modes of a ``RetrievalComparison`` result.
+
+        Returns:
+            Dict with ``full_context`` and ``rag`` answers
+        """
+        return {
+            mode: self.answer(result["query"], result[mode]["documents"], keywords)
+            for mode in ("full_context", "rag")
+        }
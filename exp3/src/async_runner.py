@@ -0,0 +1,90 @@
+"""Concurrent query runner: both modes per query, many queries at once."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable
+
+from evaluation import Evaluator
+from retrieval import RetrievalComparison
+
+ResultCallback = Callable[[int, str, Dict[str, Any], Dict[str, Any]], None]
+
+
+async def evaluate_concurrently(
+    comparison: RetrievalComparison,
+    evaluator: Evaluator,
+    queries: List[Dict[str, str]],
+    concurrency: int = 8,
+    on_result: ResultCallback = None,
+    answer_stage=None,
+) -> List[Dict[str, Any]]:
+    """Compare modes for all queries with at most ``concurrency`` in flight.
+
+    Each query's full-context and RAG retrievals run concurrently, and
+    results are evaluated as they complete, so ``evaluator.results`` is in
+    completion order.
+
+    Args:
+        comparison: RetrievalComparison holding both modes
+        evaluator: Evaluator receiving each result
+        queries: Dicts with ``query`` and ``category``
+        concurrency: Maximum number of queries in flight
+        on_result: Called with (query number, query text, result, metrics)
+        answer_stage: Optional AnswerStage run on each result while its
+            query still holds its concurrency slot
+
+    Returns:
+        Metrics per query, in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def compare(idx: int, q_data: Dict[str, str]):
+        async with semaphore:
+            result = await comparison.acompare(q_data["query"])
+            answers = None
+            if answer_stage:
+                answers = await asyncio.to_thread(
+                    answer_stage.answer_result, result, q_data.get("answer_keywords")
+                )
+            return idx, q_data, result, answers
+
+    tasks = [compare(idx, q_data) for idx, q_data in enumerate(queries, 1)]
+    metrics_by_idx = {}
+    for finished in asyncio.as_completed(tasks):
+        idx, q_data, result, answers = await finished
+        metrics = evaluator.evaluate_result(
+            q_data["query"],
+            result["full_context"],
+            result["rag"],
+            expected_category=q_data["category"],
+            answers=answers,
+        )
+        metrics_by_idx[idx] = metrics
+        if on_result:
+            on_result(idx, q_data["query"], result, metrics)
+
+    return [metrics_by_idx[idx] for idx in sorted(metrics_by_idx)]
+
+
+def run_concurrently(
+    comparison: RetrievalComparison,
+    evaluator: Evaluator,
+    queries: List[Dict[str, str]],
+    concurrency: int = 8,
+    on_result: ResultCallback = None,
+    answer_stage=None,
+) -> List[Dict[str, Any]]:
+    """Synchronous entry point for ``evaluate_concurrently``.
+
+    Blocking retrievals run on a thread pool sized for two calls (one per
+    mode) per query in flight.
+    """
+    async def main():
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=2 * concurrency) as executor:
+            loop.set_default_executor(executor)
+            return await evaluate_concurrently(
+                comparison, evaluator, queries, concurrency, on_result, answer_stage
+            )
+
+    return asyncio.run(main())
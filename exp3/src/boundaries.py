@@ -0,0 +1,81 @@
+"""Pluggable boundary detectors for structure-aware chunking."""
+
+import re
+from typing import Iterator, Tuple
+
+# Sentence enders, including Hebrew sof pasuq, followed by closing quotes
+# (ASCII or Hebrew geresh/gershayim) and whitespace.
+SENTENCE_END = re.compile(r"[.!?׃]+[\"'׳״)\]]*\s+")
+PARAGRAPH_END = re.compile(r"\n[ \t]*\n\s*")
+WORD_END = re.compile(r"\s+")
+
+
+class BoundaryDetector:
+    """Finds offsets where a chunk may end.
+
+    Subclasses set ``pattern``; every match end is a candidate boundary.
+    Detection is a single regex scan, so it is linear in the text length.
+    """
+
+    pattern = WORD_END
+
+    def boundaries(self, text: str) -> Iterator[int]:
+        """Yield increasing boundary offsets in ``text``.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Iterator over offsets (the end of text is always included)
+        """
+        last = 0
+        for match in self.pattern.finditer(text):
+            if match.end() > last:
+                last = match.end()
+                yield last
+        if last < len(text):
+            yield len(text)
+
+    def segments(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield ``(start, end)`` spans between consecutive boundaries."""
+        start = 0
+        for end in self.boundaries(text):
+            yield start, end
+            start = end
+
+
+class WordBoundaryDetector(BoundaryDetector):
+    """Splits on whitespace so words are never cut."""
+
+    pattern = WORD_END
+
+
+class SentenceBoundaryDetector(BoundaryDetector):
+    """Splits after sentence-ending punctuation."""
+
+    pattern = SENTENCE_END
+
+
+class ParagraphBoundaryDetector(BoundaryDetector):
+    """Splits on blank lines."""
+
+    pattern = PARAGRAPH_END
+
+
+class RegexBoundaryDetector(BoundaryDetector):
+    """Boundary detector for an arbitrary regular expression."""
+
+    def __init__(self, pattern: str):
+        """Initialize with a pattern whose match ends are boundaries.
+
+        Args:
+            pattern: Regular expression
+        """
+        self.pattern = re.compile(pattern)
+
+
+DETECTORS = {
+    "word": WordBoundaryDetector,
+    "sentence": SentenceBoundaryDetector,
+    "paragraph": ParagraphBoundaryDetector,
+}
@@ -0,0 +1,152 @@
+"""Structure-aware chunking on sentence, paragraph, word or token boundaries."""
+
+from collections import deque
+from typing import Iterator, Tuple, Union
+
+from boundaries import BoundaryDetector, WordBoundaryDetector, DETECTORS
+from chunking import DocumentChunker, NON_SPACE
+
+
+class BoundaryChunker(DocumentChunker):
+    """Packs whole segments into chunks under a character or token budget.
+
+    Segments come from a pluggable ``BoundaryDetector``; segments larger than
+    the budget are split on token (or word) boundaries. Every segment is
+    measured once, then each chunk's end is found by a binary search that
+    measures candidate joined texts, so the budget holds for the joined text.
+    With a tokenizer that costs O(n log max_size) tokenizer work for a text
+    of n characters; measuring characters is constant time per span. With a
+    tokenizer and ``detector=None`` the text is cut into chunks of exactly
+    ``max_size`` tokens (the last one may be shorter).
+    """
+
+    def __init__(
+        self,
+        max_size: int = 120,
+        detector: Union[str, BoundaryDetector, None] = "sentence",
+        tokenizer=None,
+        overlap_segments: int = 0,
+    ):
+        """Initialize boundary chunker.
+
+        Args:
+            max_size: Chunk budget, in tokens if ``tokenizer`` is set else characters
+            detector: Detector instance, a name from ``DETECTORS``, or None
+            tokenizer: Tokenizer from ``tokens`` (None measures characters)
+            overlap_segments: Trailing segments repeated at the next chunk start
+        """
+        super().__init__(chunk_size=max_size, overlap=0)
+        if isinstance(detector, str):
+            detector = DETECTORS[detector]()
+        self.detector = detector
+        self.tokenizer = tokenizer
+        self.overlap_segments = overlap_segments
+        self.max_size = max_size
+
+    def measure(self, text: str, start: int, end: int) -> int:
+        """Size of ``text[start:end]`` in budget units."""
+        if self.tokenizer:
+            return self.tokenizer.count(text, start, end)
+        return end - start
+
+    def chunk_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield ``(start, end)`` offsets of boundary-aligned chunks.
+
+        Args:
+            text: Text to chunk
+
+        Returns:
+            Iterator over chunk offsets
+        """
+        if self.detector is None:
+            segments = iter([(0, len(text))])
+        else:
+            segments = self.detector.segments(text)
+
+        window = deque()
+        total = 0
+        carried = 0  # leading window segments already emitted (overlap carry-over)
+
+        for start, end in segments:
+            size = self.measure(text, start, end)
+
+            if size > self.max_size:
+                if len(window) > carried:
+                    yield from self._emit_fitting(text, list(window))
+                window.clear()
+                total = carried = 0
+                yield from self._split(text, start, end)
+                continue
+
+            # Count the whitespace between segments too; it is part of the chunk
+            if window:
+                size += self.measure(text, window[-1][1], start)
+
+            if window and total + size > self.max_size:
+                yield from self._emit_fitting(text, list(window))
+                while window and (
+                    len(window) > self.overlap_segments or total + size > self.max_size
+                ):
+                    total -= window.popleft()[2]
+                carried = len(window)
+
+            window.append((start, end, size))
+            total += size
+
+        if len(window) > carried:
+            yield from self._emit_fitting(text, list(window))
+
+    def _fits(self, text: str, start: int, end: int) -> bool:
+        return self.measure(text, start, end) <= self.max_size
+
+    def _longest_fit(self, text: str, spans: list, i: int) -> int:
+        """Largest ``j > i`` such that ``spans[i:j]`` measured as one text fits the budget.
+
+        Measuring the joined text (not summing parts) keeps the budget exact
+        for tokenizers whose tokens can merge or split across span borders.
+        """
+        lo, hi = i + 1, min(len(spans), i + max(self.max_size, 1))
+        if self._fits(text, spans[i][0], spans[hi - 1][1]):
+            return hi
+        while lo < hi - 1:
+            mid = (lo + hi) // 2
+            if self._fits(text, spans[i][0], spans[mid - 1][1]):
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def _emit_fitting(self, text: str, spans: list) -> Iterator[Tuple[int, int]]:
+        """Emit consecutive spans as chunks that each fit the budget."""
+        i = 0
+        while i < len(spans):
+            j = self._longest_fit(text, spans, i)
+            yield from self._emit(text, spans[i][0], spans[j - 1][1])
+            i = j
+
+    def _split(self, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Split an oversized segment on token or word boundaries."""
+        if self.tokenizer:
+            yield from self._emit_fitting(text, self.tokenizer.token_spans(text, start, end))
+            return
+
+        chunk_start = chunk_end = start
+        for _, word_end in WordBoundaryDetector().segments(text[start:end]):
+            word_end += start
+            if word_end - chunk_start > self.max_size and chunk_end > chunk_start:
+                yield from self._emit(text, chunk_start, chunk_end)
+                chunk_start = chunk_end
+            while word_end - chunk_start > self.max_size:
+                yield from self._emit(text, chunk_start, chunk_start + self.max_size)
+                chunk_start += self.max_size
+            chunk_end = word_end
+        if chunk_end > chunk_start:
+            yield from self._emit(text, chunk_start, chunk_end)
+
+    @staticmethod
+    def _emit(text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Yield the span with trailing whitespace trimmed, unless it is blank."""
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if NON_SPACE.search(text, start, end):
+            yield start, end
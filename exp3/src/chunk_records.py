@@ -0,0 +1,144 @@
+"""Compact chunk records that reference source text by offsets."""
+
+from array import array
+from typing import List, Dict, Any, Iterator, Sequence
+
+
+class Chunk:
+    """A chunk stored as a span into its source text.
+
+    The chunk text is only sliced out of ``source`` when ``content`` is read,
+    so overlapping windows do not duplicate bytes. Records also support
+    ``chunk["field"]`` access so they can be passed wherever chunk dicts are.
+    """
+
+    __slots__ = ("id", "doc_id", "title", "category", "chunk_idx", "start", "end", "source")
+
+    def __init__(
+        self,
+        id: int,
+        doc_id: Any,
+        title: str,
+        category: str,
+        chunk_idx: int,
+        start: int,
+        end: int,
+        source: Sequence,
+    ):
+        """Initialize a chunk record.
+
+        Args:
+            id: Global chunk id
+            doc_id: Id of the source document
+            title: Source document title
+            category: Source document category
+            chunk_idx: Position of the chunk within its document
+            start: Start offset into ``source``
+            end: End offset into ``source`` (exclusive)
+            source: Source text or any sliceable buffer
+        """
+        self.id = id
+        self.doc_id = doc_id
+        self.title = title
+        self.category = category
+        self.chunk_idx = chunk_idx
+        self.start = start
+        self.end = end
+        self.source = source
+
+    @property
+    def content(self) -> str:
+        """Materialize the chunk text."""
+        return self.source[self.start : self.end]
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__ and key != "content":
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access with a default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the record as a regular chunk dictionary."""
+        return {
+            "id": self.id,
+            "doc_id": self.doc_id,
+            "title": self.title,
+            "category": self.category,
+            "chunk_idx": self.chunk_idx,
+            "content": self.content,
+        }
+
+
+class ChunkTable:
+    """Column-oriented table of chunk spans over a list of source texts.
+
+    Each chunk costs four machine integers instead of a dict plus a copied
+    string; source texts are stored once per document.
+    """
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self.sources: List[Sequence] = []
+        self.documents: List[Dict[str, Any]] = []
+        self.source_idx = array("l")
+        self.chunk_idx = array("l")
+        self.starts = array("q")
+        self.ends = array("q")
+
+    def add_document(self, doc: Dict[str, Any], source: Sequence, spans) -> int:
+        """Register a document's source text and its chunk spans.
+
+        Args:
+            doc: Document dictionary with ``id``, ``title`` and ``category``
+            source: Text the spans index into
+            spans: Iterable of ``(start, end)`` offsets
+
+        Returns:
+            Number of chunks added for the document
+        """
+        index = len(self.sources)
+        self.sources.append(source)
+        self.documents.append(
+            {"doc_id": doc["id"], "title": doc["title"], "category": doc["category"]}
+        )
+
+        count = 0
+        for start, end in spans:
+            self.source_idx.append(index)
+            self.chunk_idx.append(count)
+            self.starts.append(start)
+            self.ends.append(end)
+            count += 1
+        return count
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> Chunk:
+        doc = self.documents[self.source_idx[i]]
+        return Chunk(
+            i, doc["doc_id"], doc["title"], doc["category"],
+            self.chunk_idx[i], self.starts[i], self.ends[i],
+            self.sources[self.source_idx[i]],
+        )
+
+    def __iter__(self) -> Iterator[Chunk]:
+        return (self[i] for i in range(len(self)))
+
+    def content(self, i: int) -> str:
+        """Materialize the text of chunk ``i``."""
+        return self.sources[self.source_idx[i]][self.starts[i] : self.ends[i]]
+
+    def span_bytes(self) -> int:
+        """Bytes used by the span columns (excluding source texts)."""
+        columns = (self.source_idx, self.chunk_idx, self.starts, self.ends)
+        return sum(col.itemsize * len(col) for col in columns)
@@ -1,8 +1,12 @@
 """Document chunking module for splitting documents into manageable chunks."""
 
-import json
-from pathlib import Path
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+from chunk_records import Chunk, ChunkTable
+from loaders import iter_documents
+
+NON_SPACE = re.compile(r"\S")
 
 
 class DocumentChunker:
@@ -18,6 +22,24 @@ class DocumentChunker:
         self.chunk_size = chunk_size
         self.overlap = overlap
 
+    def chunk_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield ``(start, end)`` offsets of overlapping windows over text.
+
+        Windows containing only whitespace are skipped without slicing.
+
+        Args:
+            text: Text to chunk
+
+        Returns:
+            Iterator over window offsets
+        """
+        step = self.chunk_size - self.overlap
+
+        for i in range(0, len(text), step):
+            end = min(i + self.chunk_size, len(text))
+            if NON_SPACE.search(text, i, end):
+                yield i, end
+
     def chunk_text(self, text: str) -> List[str]:
         """Split text into overlapping chunks.
 
@@ -27,15 +49,57 @@ class DocumentChunker:
         Returns:
             List of text chunks
         """
-        chunks = []
-        step = self.chunk_size - self.overlap
+        return [text[start:end] for start, end in self.chunk_spans(text)]
 
-        for i in range(0, len(text), step):
-            chunk = text[i : i + self.chunk_size]
-            if chunk.strip():
-                chunks.append(chunk)
+    def iter_chunk_records(self, documents: Iterable[Dict]) -> Iterator[Chunk]:
+        """Lazily chunk documents into offset-based ``Chunk`` records.
+
+        Each document's text is built once and shared by all of its chunks.
+
+        Args:
+            documents: Iterable of document dictionaries
+
+        Returns:
+            Iterator over chunk records
+        """
+        chunk_id = 0
+
+        for doc in documents:
+            text = f"{doc['title']}. {doc['content']}"
 
-        return chunks
+            for chunk_idx, (start, end) in enumerate(self.chunk_spans(text)):
+                yield Chunk(
+                    chunk_id, doc["id"], doc["title"], doc["category"],
+                    chunk_idx, start, end, text,
+                )
+                chunk_id += 1
+
+    def iter_chunks(self, documents: Iterable[Dict]) -> Iterator[Dict[str, Any]]:
+        """Lazily chunk a stream of documents.
+
+        Args:
+            documents: Iterable of document dictionaries
+
+        Returns:
+            Iterator over chunked documents with metadata
+        """
+        for record in self.iter_chunk_records(documents):
+            yield record.to_dict()
+
+    def build_table(self, documents: Iterable[Dict]) -> ChunkTable:
+        """Chunk documents into a compact span table.
+
+        Args:
+            documents: Iterable of document dictionaries
+
+        Returns:
+            ChunkTable referencing each document's text
+        """
+        table = ChunkTable()
+        for doc in documents:
+            text = f"{doc['title']}. {doc['content']}"
+            table.add_document(doc, text, self.chunk_spans(text))
+        return table
 
     def chunk_documents(self, documents: List[Dict]) -> List[Dict[str, Any]]:
         """Chunk a list of documents.
@@ -46,25 +110,21 @@ class DocumentChunker:
         Returns:
             List of chunked documents with metadata
         """
-        chunked = []
-        chunk_id = 0
+        return list(self.iter_chunks(documents))
 
-        for doc in documents:
-            text = f"{doc['title']}. {doc['content']}"
-            chunks = self.chunk_text(text)
-
-            for chunk_idx, chunk in enumerate(chunks):
-                chunked.append({
-                    "id": chunk_id,
-                    "doc_id": doc["id"],
-                    "title": doc["title"],
-                    "category": doc["category"],
-                    "chunk_idx": chunk_idx,
-                    "content": chunk,
-                })
-                chunk_id += 1
+    def stream_chunks(self, path: str) -> Iterator[Chunk]:
+        """Stream chunk records from a JSON array or JSONL file.
 
-        return chunked
+        Documents are read incrementally, so peak memory does not grow
+        with corpus size.
+
+        Args:
+            path: Path to JSON or JSONL file with documents
+
+        Returns:
+            Iterator over chunk records
+        """
+        return self.iter_chunk_records(iter_documents(path))
 
     def load_and_chunk(self, json_path: str) -> List[Dict[str, Any]]:
         """Load documents from JSON and chunk them.
@@ -75,7 +135,4 @@ class DocumentChunker:
         Returns:
             List of chunked documents
         """
-        with open(json_path, "r", encoding="utf-8") as f:
-            documents = json.load(f)
-
-        return self.chunk_documents(documents)
+        return list(self.iter_chunks(iter_documents(json_path)))
@@ -0,0 +1,92 @@
+"""Immutable, precomputed full context shared by every query."""
+
+from array import array
+from collections import Counter
+from typing import List, Dict, Any, Iterator, Tuple
+
+
+class ContextView:
+    """One chunk of a ``ContextBuffer``, sliced out only when read.
+
+    Supports ``view["content"]`` / ``view["metadata"]`` so it can be passed
+    wherever retrieved document dicts are.
+    """
+
+    __slots__ = ("buffer", "index")
+
+    def __init__(self, buffer: "ContextBuffer", index: int):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def content(self) -> str:
+        """Materialize the chunk text."""
+        return self.buffer.text[self.buffer.starts[self.index] : self.buffer.ends[self.index]]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.buffer.metadatas[self.index]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in ("content", "metadata"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access with a default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class ContextBuffer:
+    """All chunks joined once into a single string plus an offsets index.
+
+    Built once and never modified, so it can be returned for every query
+    at O(1) cost. Character, token and category totals are computed once
+    and exposed for ``Evaluator``.
+    """
+
+    def __init__(self, documents: List[Dict[str, Any]], separator: str = "\n\n"):
+        """Assemble the context.
+
+        Args:
+            documents: Chunks with ``content`` and ``metadata``
+            separator: Text placed between chunks in ``text``
+        """
+        contents = [doc["content"] for doc in documents]
+        self.text = separator.join(contents)
+        self.metadatas: Tuple[Dict[str, Any], ...] = tuple(doc["metadata"] for doc in documents)
+        self.starts = array("q")
+        self.ends = array("q")
+
+        position = 0
+        for content in contents:
+            self.starts.append(position)
+            self.ends.append(position + len(content))
+            position += len(content) + len(separator)
+
+        self.char_count = sum(len(content) for content in contents)
+        self.category_counts = Counter(meta.get("category") for meta in self.metadatas)
+        self._token_counts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> ContextView:
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        return ContextView(self, i % len(self))
+
+    def __iter__(self) -> Iterator[ContextView]:
+        return (ContextView(self, i) for i in range(len(self)))
+
+    def token_count(self, tokenizer) -> int:
+        """Sum of per-chunk token counts, computed once per tokenizer."""
+        key = getattr(tokenizer, "name", type(tokenizer).__name__)
+        if key not in self._token_counts:
+            self._token_counts[key] = sum(
+                tokenizer.count(self.text, start, end) for start, end in zip(self.starts, self.ends)
+            )
+        return self._token_counts[key]
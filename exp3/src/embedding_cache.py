@@ -0,0 +1,135 @@
+"""Persistent SQLite cache of embeddings keyed by model id and text hash."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Callable, Optional
+
+import numpy as np
+
+# SQLite limits the number of bound parameters per statement.
+_QUERY_CHUNK = 500
+
+
+def cache_key(model_id: str, text: str) -> str:
+    """Key of ``text`` embedded by ``model_id``."""
+    return hashlib.sha256(f"{model_id}\x1f{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """On-disk embedding cache with LRU eviction and hit/miss statistics.
+
+    Vectors are stored as float32 blobs. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = "./embedding_cache.sqlite3", max_entries: int = 1_000_000):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            max_entries: Entries kept before least recently used ones are evicted
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used);
+            """
+        )
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model_id: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up cached vectors; missing texts map to None."""
+        keys = [cache_key(model_id, text) for text in texts]
+        found = {}
+        now = time.time()
+
+        with self._lock:
+            for i in range(0, len(keys), _QUERY_CHUNK):
+                part = keys[i : i + _QUERY_CHUNK]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", part
+                ).fetchall()
+                found.update(rows)
+                self._conn.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE key IN ({marks})", [now, *part]
+                )
+            self._conn.commit()
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
+
+    def put_many(self, model_id: str, texts: List[str], vectors: List[Any]):
+        """Store vectors and evict least recently used entries over capacity."""
+        now = time.time()
+        rows = [
+            (cache_key(model_id, text), np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?)", rows)
+            self._entries += self._conn.total_changes - before
+            excess = self._entries - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._entries -= excess
+            self._conn.commit()
+
+    def embed(
+        self, model_id: str, texts: List[str], embed_fn: Callable[[List[str]], List[Any]]
+    ) -> List[np.ndarray]:
+        """Return embeddings for texts, computing and storing only the misses.
+
+        Args:
+            model_id: Identifier of the embedding model
+            texts: Texts to embed
+            embed_fn: Function embedding a list of texts
+
+        Returns:
+            One float32 vector per text
+        """
+        vectors = self.get_many(model_id, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            computed = embed_fn([texts[i] for i in missing])
+            self.put_many(model_id, [texts[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = np.asarray(vector, dtype=np.float32)
+
+        return vectors
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since the cache was opened."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self._entries,
+        }
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
@@ -1,46 +1,171 @@
 """Embedding and vector store management using ChromaDB."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 import chromadb
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
 
+from embedding_cache import EmbeddingCache
+from incremental import IncrementalIndexMixin
+from ingest import BatchIngestor, ProgressCallback
+from loaders import DEFAULT_BATCH_SIZE
+from timing import span
 
-class EmbeddingStore:
-    """Manages embeddings and vector store operations."""
 
-    def __init__(self, persist_dir: str = "./chroma_db"):
+def model_id(embedding_function) -> str:
+    """Identifier of an embedding function, used to key cached vectors."""
+    name = getattr(embedding_function, "name", None)
+    if callable(name):
+        try:
+            name = name()
+        except TypeError:
+            name = None
+    model = getattr(embedding_function, "model_name", None) or getattr(
+        embedding_function, "MODEL_NAME", ""
+    )
+    return ":".join(filter(None, [name or type(embedding_function).__name__, model]))
+
+
+class EmbeddingStore(IncrementalIndexMixin):
+    """Manages embeddings and vector store operations.
+
+    ``version`` increases whenever the collection's content changes, so
+    callers caching search results can tell when they are stale. Derived
+    indexes registered with ``add_listener`` are instead told about each
+    change as it happens.
+    """
+
+    version = 0
+
+    def __init__(
+        self,
+        persist_dir: str = "./chroma_db",
+        embedding_function=None,
+        embedding_cache: EmbeddingCache = None,
+    ):
         """Initialize embedding store with ChromaDB.
 
         Args:
             persist_dir: Directory to persist ChromaDB
+            embedding_function: Chroma embedding function (defaults to
+                Chroma's built-in model)
+            embedding_cache: Optional persistent cache consulted before embedding
         """
+        self.persist_dir = persist_dir
         self.client = chromadb.PersistentClient(path=persist_dir)
+        self.embedding_function = embedding_function or DefaultEmbeddingFunction()
+        self.embedding_cache = embedding_cache
+        self.model_id = model_id(self.embedding_function)
         self.collection = None
+        self.listeners = []
+
+    def add_listener(self, listener):
+        """Keep ``listener`` in step with the collection's content.
 
-    def create_collection(self, name: str = "documents"):
+        After every write ``listener.add(ids, records)`` is called with
+        ``{"content", "metadata"}`` records (upserted ids are first passed
+        to ``listener.remove(ids)``), and after every delete
+        ``listener.remove(ids)``. Opening or clearing a collection calls
+        ``listener.sync(store)`` to rebuild from scratch.
+        """
+        self.listeners.append(listener)
+
+    def _notify(self, event: str, *args):
+        """Call ``event`` on every listener."""
+        for listener in self.listeners:
+            getattr(listener, event)(*args)
+
+    def create_collection(self, name: str = "documents", hnsw_params: Dict[str, int] = None):
         """Create or get a collection.
 
         Args:
             name: Name of the collection
+            hnsw_params: Optional HNSW settings, e.g. ``{"M": 16,
+                "construction_ef": 100, "search_ef": 50}`` (Chroma defaults
+                are used for omitted keys)
 
         Returns:
             ChromaDB collection
         """
+        metadata = {"hnsw:space": "cosine"}
+        for key, value in (hnsw_params or {}).items():
+            metadata[f"hnsw:{key}"] = value
+
         self.collection = self.client.get_or_create_collection(
             name=name,
-            metadata={"hnsw:space": "cosine"}
+            metadata=metadata,
+            embedding_function=self.embedding_function,
         )
+        self.version += 1
+        self._notify("sync", self)
         return self.collection
 
-    def add_documents(self, documents: List[Dict[str, Any]]):
+    def embed(self, texts: List[str]) -> List[Any]:
+        """Embed texts, serving repeats from the embedding cache if configured.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per text
+        """
+        if self.embedding_cache:
+            return self.embedding_cache.embed(
+                self.model_id, texts, lambda missing: list(self.embedding_function(missing))
+            )
+        return list(self.embedding_function(texts))
+
+    def max_batch_size(self) -> int:
+        """Largest number of records Chroma accepts in one write."""
+        try:
+            return self.client.get_max_batch_size()
+        except AttributeError:
+            return getattr(self.client, "max_batch_size", DEFAULT_BATCH_SIZE)
+
+    def add_documents(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prefetch: bool = False,
+        on_progress: ProgressCallback = None,
+    ) -> int:
         """Add documents to the vector store.
 
+        Accepts a list or any iterator (e.g. ``DocumentChunker.stream_chunks``)
+        and embeds and writes it in fixed-size batches, so memory stays
+        bounded and Chroma's batch limit is never exceeded.
+
         Args:
-            documents: List of document chunks with metadata
+            documents: Iterable of document chunks with metadata
+            batch_size: Number of chunks per collection write
+            prefetch: Embed the next batch while the current one is written
+            on_progress: Called with a progress dict after every batch
+
+        Returns:
+            Number of chunks added
         """
         if not self.collection:
             self.create_collection()
 
-        ids = [str(doc["id"]) for doc in documents]
+        ingestor = BatchIngestor(self, batch_size, prefetch, on_progress)
+        pairs = ((str(doc["id"]), doc) for doc in documents)
+        return ingestor.run(pairs)["documents"]
+
+    def _add_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        embeddings: List[Any] = None,
+        ids: List[str] = None,
+        upsert: bool = False,
+    ):
+        """Write one batch of chunks to the collection.
+
+        Args:
+            documents: List of document chunks with metadata
+            embeddings: Precomputed embeddings (computed by Chroma if omitted)
+            ids: Store ids (defaults to each chunk's ``id``)
+            upsert: Overwrite existing ids instead of adding
+        """
+        ids = ids or [str(doc["id"]) for doc in documents]
         documents_text = [doc["content"] for doc in documents]
         metadatas = [
             {
@@ -52,45 +177,93 @@ class EmbeddingStore:
             for doc in documents
         ]
 
-        self.collection.add(
+        write = self.collection.upsert if upsert else self.collection.add
+        write(
             ids=ids,
             documents=documents_text,
             metadatas=metadatas,
+            embeddings=embeddings,
         )
+        self.version += 1
+        if self.listeners:
+            if upsert:
+                self._notify("remove", ids)
+            records = [
+                {"content": text, "metadata": metadata}
+                for text, metadata in zip(documents_text, metadatas)
+            ]
+            self._notify("add", ids, records)
 
     def similarity_search(
-        self, query: str, k: int = 3
+        self, query: str, k: int = 3, where: Dict[str, Any] = None
     ) -> tuple[List[Dict[str, Any]], List[float]]:
         """Search for similar documents.
 
         Args:
             query: Query text
             k: Number of results to return
+            where: Optional metadata filter, e.g. ``{"category": "law"}``
 
         Returns:
             Tuple of (documents, distances)
         """
-        if not self.collection:
-            return [], []
+        return self.similarity_search_many([query], k=k, where=where)[0]
 
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=k,
-        )
+    def similarity_search_many(
+        self,
+        queries: List[str],
+        k: int = 3,
+        where: Dict[str, Any] = None,
+        query_embeddings: List[Any] = None,
+    ) -> List[tuple[List[Dict[str, Any]], List[float]]]:
+        """Search for several queries with one embedding call and one query.
 
-        documents = []
-        distances = []
+        Args:
+            queries: Query texts
+            k: Number of results per query
+            where: Optional metadata filter applied to every query
+            query_embeddings: Precomputed query vectors (skips embedding)
 
-        if results["documents"] and results["documents"][0]:
-            for i, doc_text in enumerate(results["documents"][0]):
-                doc_data = {
-                    "content": doc_text,
-                    "metadata": results["metadatas"][0][i],
-                }
-                documents.append(doc_data)
-                distances.append(results["distances"][0][i])
+        Returns:
+            One (documents, distances) tuple per query, in input order
+        """
+        if not self.collection or not queries:
+            return [([], []) for _ in queries]
+
+        if query_embeddings is None:
+            with span("embed"):
+                query_embeddings = self.embed(list(queries))
+
+        with span("search"):
+            results = self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=k,
+                where=where,
+            )
 
-        return documents, distances
+        with span("hydrate"):
+            return self._hydrate(results, len(queries))
+
+    @staticmethod
+    def _hydrate(results: Dict[str, Any], count: int) -> List[tuple[List[Dict[str, Any]], List[float]]]:
+        """Turn a collection query result into (documents, distances) per query."""
+        batch = []
+        for q in range(count):
+            documents = []
+            distances = []
+
+            if results["documents"] and results["documents"][q]:
+                for i, doc_text in enumerate(results["documents"][q]):
+                    doc_data = {
+                        "content": doc_text,
+                        "metadata": results["metadatas"][q][i],
+                    }
+                    documents.append(doc_data)
+                    distances.append(results["distances"][q][i])
+
+            batch.append((documents, distances))
+
+        return batch
 
     def get_all_documents(self) -> List[Dict[str, Any]]:
         """Get all documents from the collection.
@@ -114,8 +287,32 @@ class EmbeddingStore:
 
         return documents
 
+    def iter_embeddings(self, page_size: int = 1000) -> Iterator[tuple[Any, List[Dict[str, Any]]]]:
+        """Yield stored ``(embeddings, metadatas)`` pages without re-embedding.
+
+        Args:
+            page_size: Records fetched per ``collection.get`` call
+
+        Returns:
+            Iterator over pages of vectors and their metadata
+        """
+        if not self.collection:
+            return
+        for offset in range(0, self.collection.count(), page_size):
+            page = self.collection.get(
+                include=["embeddings", "metadatas"], limit=page_size, offset=offset
+            )
+            if len(page["metadatas"]):
+                yield page["embeddings"], page["metadatas"]
+
+    def save(self):
+        """Persist the store (Chroma writes through, so nothing to do)."""
+
     def clear(self):
         """Clear the collection."""
         if self.collection:
+            self.manifest_path().unlink(missing_ok=True)
             self.client.delete_collection(name=self.collection.name)
             self.collection = None
+            self.version += 1
+            self._notify("sync", self)
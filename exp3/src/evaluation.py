@@ -3,13 +3,22 @@
 from typing import List, Dict, Any
 import json
 
+from timing import SPANS, LatencyHistogram, SpanRecorder
+
 
 class Evaluator:
     """Evaluates retrieval performance."""
 
-    def __init__(self):
-        """Initialize evaluator."""
+    def __init__(self, tokenizer=None):
+        """Initialize evaluator.
+
+        Args:
+            tokenizer: Optional tokenizer from ``tokens``; when set, context
+                sizes are also reported in tokens
+        """
         self.results = []
+        self.tokenizer = tokenizer
+        self.latency = {"full_context": LatencyHistogram(), "rag": LatencyHistogram()}
 
     def calculate_context_size(self, documents: List[Dict]) -> int:
         """Calculate total context size in characters.
@@ -20,11 +29,30 @@ class Evaluator:
         Returns:
             Total character count
         """
+        precomputed = getattr(documents, "char_count", None)
+        if precomputed is not None:
+            return precomputed
+
         total = 0
         for doc in documents:
             total += len(doc["content"])
         return total
 
+    def calculate_context_tokens(self, documents: List[Dict]) -> int:
+        """Calculate total context size in tokens.
+
+        Args:
+            documents: List of documents
+
+        Returns:
+            Total token count (0 without a tokenizer)
+        """
+        if not self.tokenizer:
+            return 0
+        if hasattr(documents, "token_count"):
+            return documents.token_count(self.tokenizer)
+        return sum(self.tokenizer.count(doc["content"]) for doc in documents)
+
     def calculate_relevance_score(
         self, query: str, documents: List[Dict], expected_category: str = None
     ) -> float:
@@ -41,6 +69,10 @@ class Evaluator:
         if not documents or not expected_category:
             return 0.5
 
+        category_counts = getattr(documents, "category_counts", None)
+        if category_counts is not None:
+            return category_counts[expected_category] / len(documents)
+
         relevant_count = 0
         for doc in documents:
             metadata = doc.get("metadata", {})
@@ -49,12 +81,18 @@ class Evaluator:
 
         return relevant_count / len(documents) if documents else 0.0
 
+    @staticmethod
+    def relevance_per_1k_tokens(relevance: float, tokens: int) -> float:
+        """Relevance delivered per thousand context tokens (0 without tokens)."""
+        return relevance * 1000 / tokens if tokens else 0.0
+
     def evaluate_result(
         self,
         query: str,
         full_result: Dict[str, Any],
         rag_result: Dict[str, Any],
         expected_category: str = None,
+        answers: Dict[str, Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Evaluate a comparison result.
 
@@ -63,6 +101,7 @@ class Evaluator:
             full_result: Result from full context mode
             rag_result: Result from RAG mode
             expected_category: Expected category for evaluation
+            answers: Optional ``AnswerStage.answer_result`` output
 
         Returns:
             Evaluation metrics
@@ -73,6 +112,9 @@ class Evaluator:
         full_size = self.calculate_context_size(full_context)
         rag_size = self.calculate_context_size(rag_context)
 
+        full_tokens = self.calculate_context_tokens(full_context)
+        rag_tokens = self.calculate_context_tokens(rag_context)
+
         full_relevance = self.calculate_relevance_score(
             query, full_context, expected_category
         )
@@ -80,20 +122,28 @@ class Evaluator:
             query, rag_context, expected_category
         )
 
+        full_efficiency = self.relevance_per_1k_tokens(full_relevance, full_tokens)
+        rag_efficiency = self.relevance_per_1k_tokens(rag_relevance, rag_tokens)
+
         metrics = {
             "query": query,
             "expected_category": expected_category,
             "full_context": {
                 "context_size": full_size,
+                "context_tokens": full_tokens,
                 "retrieval_time": full_result["retrieval_time"],
                 "doc_count": full_result["documents_count"],
                 "relevance_score": full_relevance,
+                "relevance_per_1k_tokens": full_efficiency,
             },
             "rag": {
                 "context_size": rag_size,
+                "context_tokens": rag_tokens,
                 "retrieval_time": rag_result["retrieval_time"],
                 "doc_count": rag_result["documents_count"],
                 "relevance_score": rag_relevance,
+                "relevance_per_1k_tokens": rag_efficiency,
+                "cache": rag_result.get("stages", {}).get("cache"),
             },
             "comparison": {
                 "size_reduction": (1 - rag_size / full_size) * 100 if full_size > 0 else 0,
@@ -102,6 +152,17 @@ class Evaluator:
             },
         }
 
+        for mode, answer in (answers or {}).items():
+            metrics[mode]["answer"] = {
+                "ttft_ms": answer["ttft_seconds"] * 1000,
+                "latency_ms": answer["latency_seconds"] * 1000,
+                "input_tokens": answer["input_tokens"],
+                "output_tokens": answer["output_tokens"],
+                "correctness": answer["correctness"],
+            }
+
+        self.latency["full_context"].record(full_result["retrieval_time"] * 1e9)
+        self.latency["rag"].record(rag_result["retrieval_time"] * 1e9)
         self.results.append(metrics)
         return metrics
 
@@ -119,16 +180,61 @@ class Evaluator:
         avg_full_relevance = sum(r["full_context"]["relevance_score"] for r in self.results) / len(self.results)
         avg_rag_relevance = sum(r["rag"]["relevance_score"] for r in self.results) / len(self.results)
         avg_size_reduction = sum(r["comparison"]["size_reduction"] for r in self.results) / len(self.results)
+        avg_full_efficiency = sum(r["full_context"]["relevance_per_1k_tokens"] for r in self.results) / len(self.results)
+        avg_rag_efficiency = sum(r["rag"]["relevance_per_1k_tokens"] for r in self.results) / len(self.results)
 
-        return {
+        aggregate = {
             "total_queries": len(self.results),
             "full_context_avg_time": avg_full_time,
             "rag_avg_time": avg_rag_time,
             "full_context_avg_relevance": avg_full_relevance,
             "rag_avg_relevance": avg_rag_relevance,
             "avg_context_size_reduction": avg_size_reduction,
+            "full_context_avg_relevance_per_1k_tokens": avg_full_efficiency,
+            "rag_avg_relevance_per_1k_tokens": avg_rag_efficiency,
         }
 
+        for mode, histogram in self.latency.items():
+            for p in (50, 95, 99):
+                aggregate[f"{mode}_p{p}_ms"] = histogram.percentile(p) / 1e6
+
+        for mode in ("full_context", "rag"):
+            answered = [r[mode]["answer"] for r in self.results if "answer" in r[mode]]
+            for key in ("ttft_ms", "latency_ms", "input_tokens", "correctness") if answered else ():
+                aggregate[f"{mode}_avg_answer_{key}"] = sum(a[key] for a in answered) / len(answered)
+
+        cached = [r["rag"]["cache"] for r in self.results if r["rag"].get("cache")]
+        if cached:
+            hits = sum(1 for status in cached if status != "miss")
+            aggregate["query_cache_hit_rate"] = hits / len(cached)
+            aggregate["query_cache_semantic_hits"] = cached.count("semantic")
+
+        return aggregate
+
+    def latency_report(self, spans: SpanRecorder = SPANS) -> Dict[str, Any]:
+        """Retrieval-time percentiles per mode and per recorded stage.
+
+        Args:
+            spans: Recorder holding the stage spans (defaults to the global one)
+
+        Returns:
+            Dictionary with ``modes`` and ``stages`` percentile summaries
+        """
+        return {
+            "modes": {mode: histogram.summary() for mode, histogram in self.latency.items()},
+            "stages": spans.summary(),
+        }
+
+    def save_latency(self, filepath: str, spans: SpanRecorder = SPANS):
+        """Save ``latency_report`` to JSON.
+
+        Args:
+            filepath: Path to save the report
+            spans: Recorder holding the stage spans
+        """
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.latency_report(spans), f, indent=2)
+
     def save_results(self, filepath: str):
         """Save evaluation results to JSON.
 
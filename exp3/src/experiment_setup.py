@@ -0,0 +1,85 @@
+"""Experiment setup: index the corpus and build the retrieval modes to compare."""
+
+from chunking import DocumentChunker
+from embeddings import EmbeddingStore
+from embedding_cache import EmbeddingCache
+from hybrid import HybridMode
+from ingest import print_progress
+from lexical import BM25Index
+from loaders import iter_documents
+from numpy_store import NumpyEmbeddingStore
+from packing import ContextPacker, PackedRAGMode
+from pipeline import IndexingPipeline, format_stats
+from query_cache import CachedMode
+from rerank import Reranker, RerankedRAGMode, default_scorer
+from retrieval import FullContextMode, RAGMode, RetrievalComparison
+from routing import CategoryRouter, RoutedRAGMode
+
+STORE_BACKENDS = {
+    "chroma": (EmbeddingStore, "./chroma_db"),
+    "numpy": (NumpyEmbeddingStore, "./numpy_store"),
+}
+
+
+def setup_experiment(
+    workers: int = 1,
+    backend: str = "chroma",
+    route: bool = False,
+    hybrid: bool = False,
+    rerank: str = None,
+    token_budget: int = None,
+    cache: bool = False,
+):
+    """Initialize experiment components.
+
+    Args:
+        workers: Chunking processes; above 1 the parallel pipeline is used
+        backend: Vector store backend, a key of ``STORE_BACKENDS``
+        route: Search only the partition of each query's predicted category
+        hybrid: Fuse BM25 keyword search with dense search
+        rerank: Over-fetch candidates and rerank them to the top 3 with this
+            scorer ("lexical" or "cross-encoder")
+        token_budget: Pack retrieved chunks into this many tokens instead of k=3
+        cache: Put an exact + semantic result cache in front of the RAG mode
+    """
+    print("Streaming and chunking documents into vector store...")
+    chunker = DocumentChunker(chunk_size=500, overlap=50)
+    store_class, persist_dir = STORE_BACKENDS[backend]
+    store = store_class(
+        persist_dir=persist_dir,
+        embedding_cache=EmbeddingCache("./embedding_cache.sqlite3"),
+    )
+    store.create_collection("documents")
+
+    if workers > 1:
+        pipeline = IndexingPipeline(store, chunker, workers=workers)
+        stats = pipeline.run(iter_documents("data/documents.json"))
+        chunk_count = stats["write"]["items"] + stats["unchanged"]
+        print(format_stats(stats))
+    else:
+        counts = store.sync_documents(
+            chunker.stream_chunks("data/documents.json"), prefetch=True, on_progress=print_progress
+        )
+        chunk_count = counts["added"] + counts["unchanged"]
+        print(f"Indexed {counts['added']} new chunks, {counts['unchanged']} unchanged, "
+              f"{counts['deleted']} stale removed")
+    print(f"Created {chunk_count} chunks")
+    print("Vector store ready")
+
+    all_documents = store.get_all_documents()
+
+    full_mode = FullContextMode(all_documents)
+    if hybrid:
+        rag_mode = HybridMode(store, BM25Index(), k=3)
+    elif token_budget:
+        rag_mode = PackedRAGMode(store, ContextPacker(max_tokens=token_budget))
+    elif rerank:
+        rag_mode = RerankedRAGMode(store, Reranker(default_scorer(cross_encoder=rerank == "cross-encoder")), k=3)
+    elif route:
+        rag_mode = RoutedRAGMode(store, CategoryRouter.from_store(store), k=3)
+    else:
+        rag_mode = RAGMode(store, k=3)
+    if cache:
+        rag_mode = CachedMode(rag_mode, store, semantic_threshold=0.95)
+
+    return RetrievalComparison(full_mode, rag_mode), all_documents
@@ -0,0 +1,141 @@
+"""HNSW parameter sweep: build time, index size, latency and recall@k."""
+
+import argparse
+import itertools
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import List, Dict, Any
+
+import numpy as np
+
+from analysis import ResultsAnalyzer
+from chunking import DocumentChunker
+from embedding_cache import EmbeddingCache
+from embeddings import EmbeddingStore
+from incremental import chunk_hash
+from loaders import batched, iter_documents
+from numpy_store import NumpyEmbeddingStore
+
+HNSW_GRID = {
+    "M": [8, 16, 32],
+    "construction_ef": [64, 128],
+    "search_ef": [16, 64, 128],
+}
+
+
+def param_grid(grid: Dict[str, List[int]]) -> List[Dict[str, int]]:
+    """Expand a grid of HNSW settings into one dict per combination."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def directory_size(path: Path) -> int:
+    """Total size in bytes of all files under ``path``."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def run_hnsw_benchmark(
+    chunks: List[Dict[str, Any]],
+    queries: List[str],
+    grid: Dict[str, List[int]] = None,
+    k: int = 10,
+    workdir: str = "./hnsw_bench",
+    embedding_cache: EmbeddingCache = None,
+) -> List[Dict[str, Any]]:
+    """Build one Chroma collection per HNSW setting and measure it.
+
+    Chunks and queries are embedded once; exact NumPy search provides the
+    ground truth for recall. Build time covers only collection inserts.
+
+    Args:
+        chunks: Chunk dictionaries or records
+        queries: Query texts
+        grid: Parameter grid (defaults to ``HNSW_GRID``)
+        k: Neighbours per query
+        workdir: Scratch directory for the benchmark collections
+        embedding_cache: Optional embedding cache
+
+    Returns:
+        One result row per parameter combination
+    """
+    workdir = Path(workdir)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    exact = NumpyEmbeddingStore(str(workdir / "exact"), embedding_cache=embedding_cache)
+    exact.create_collection("bench")
+    pairs = list({chunk_hash(chunk): chunk for chunk in chunks}.items())
+    vectors = exact.embed([chunk["content"] for _, chunk in pairs])
+    exact._add_batch([c for _, c in pairs], vectors, ids=[i for i, _ in pairs])
+
+    query_vectors = exact.embed(queries)
+    truth = exact.collection.query(query_vectors, n_results=k)["ids"]
+    expected_total = sum(len(expected) for expected in truth)
+
+    rows = []
+    for params in param_grid(grid or HNSW_GRID):
+        label = "_".join(f"{key}{value}" for key, value in params.items())
+        store = EmbeddingStore(str(workdir / label), embedding_cache=embedding_cache)
+        store.create_collection("bench", hnsw_params=params)
+
+        start = time.perf_counter()
+        for batch in batched(zip(pairs, vectors), store.max_batch_size()):
+            store._add_batch(
+                [chunk for (_, chunk), _ in batch],
+                [vector for _, vector in batch],
+                ids=[chunk_id for (chunk_id, _), _ in batch],
+            )
+        build_seconds = time.perf_counter() - start
+
+        latencies = []
+        hits = 0
+        for vector, expected in zip(query_vectors, truth):
+            begin = time.perf_counter()
+            found = store.collection.query(query_embeddings=[vector], n_results=k)["ids"][0]
+            latencies.append((time.perf_counter() - begin) * 1000)
+            hits += len(set(found) & set(expected))
+
+        rows.append({
+            "params": params,
+            "label": label,
+            "build_seconds": build_seconds,
+            "index_bytes": directory_size(workdir / label),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "recall_at_k": hits / expected_total if expected_total else 0.0,
+            "k": k,
+        })
+
+    return rows
+
+
+def main(argv=None):
+    """Run the sweep on the experiment corpus and report it."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", default="data/documents.json")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--workdir", default="./hnsw_bench")
+    parser.add_argument("--output", default="hnsw_results.json")
+    args = parser.parse_args(argv)
+
+    documents = list(iter_documents(args.documents))
+    chunks = DocumentChunker(chunk_size=500, overlap=50).chunk_documents(documents)
+    queries = [doc["title"] for doc in documents]
+
+    rows = run_hnsw_benchmark(
+        chunks, queries, k=args.k, workdir=args.workdir,
+        embedding_cache=EmbeddingCache("./embedding_cache.sqlite3"),
+    )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2)
+
+    analyzer = ResultsAnalyzer()
+    print(analyzer.hnsw_table(rows))
+    analyzer.create_hnsw_chart(rows, "charts/hnsw_sweep.png")
+
+
+if __name__ == "__main__":
+    main()
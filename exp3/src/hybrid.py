@@ -0,0 +1,102 @@
+"""Hybrid retrieval: BM25 and dense results fused by reciprocal rank."""
+
+from typing import List, Dict, Any, Tuple
+
+from embeddings import EmbeddingStore
+from lexical import BM25Index
+from retrieval import RetrievalMode
+from timing import span
+
+
+def chunk_key(document: Dict[str, Any]) -> Tuple[str, str]:
+    """Identity of a retrieved chunk shared by the dense and lexical results."""
+    metadata = document["metadata"]
+    return str(metadata["doc_id"]), str(metadata["chunk_idx"])
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Dict[str, Any]]], k: int = 60
+) -> List[Dict[str, Any]]:
+    """Merge ranked lists, scoring each chunk by ``sum(1 / (k + rank))``.
+
+    Args:
+        rankings: Ranked document lists, best first
+        k: Rank offset damping the influence of top positions
+
+    Returns:
+        Unique documents ordered by fused score
+    """
+    scores: Dict[Tuple[str, str], float] = {}
+    documents: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, 1):
+            key = chunk_key(document)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            documents.setdefault(key, document)
+    return [documents[key] for key in sorted(scores, key=scores.get, reverse=True)]
+
+
+class HybridMode(RetrievalMode):
+    """Retrieval mode fusing BM25 keyword search with dense similarity search.
+
+    The BM25 index is attached to the store, so every write or delete is
+    applied to it incrementally as it happens.
+    """
+
+    def __init__(
+        self,
+        store: EmbeddingStore,
+        index: BM25Index,
+        k: int = 3,
+        candidates: int = 20,
+        rrf_k: int = 60,
+    ):
+        """Initialize hybrid mode.
+
+        Args:
+            store: EmbeddingStore instance
+            index: BM25Index over the same chunks (attached to ``store`` here)
+            k: Number of documents to retrieve
+            candidates: Results taken from each retriever before fusion
+            rrf_k: Reciprocal rank fusion constant
+        """
+        self.store = store
+        self.index = index
+        self.k = k
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        index.attach(store)
+
+    def retrieve(self, query: str) -> tuple[List[Dict], float]:
+        """Retrieve documents ranked by fused BM25 and dense scores.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Tuple of (relevant_documents, retrieval_time)
+        """
+        batch, elapsed = self.retrieve_many([query])
+        return batch[0], elapsed
+
+    def retrieve_many(self, queries: List[str]) -> tuple[List[List[Dict]], float]:
+        """Run one batched dense search, then fuse with BM25 per query.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Tuple of (documents per query, total retrieval_time)
+        """
+        with span("hybrid") as timed:
+            dense = self.store.similarity_search_many(queries, k=self.candidates)
+
+            documents = []
+            for query, (dense_docs, _) in zip(queries, dense):
+                with span("bm25"):
+                    lexical = [doc for doc, _ in self.index.search(query, self.candidates)]
+                with span("fuse"):
+                    fused = reciprocal_rank_fusion([dense_docs, lexical], self.rrf_k)
+                documents.append(fused[: self.k])
+
+        return documents, timed.seconds
@@ -0,0 +1,218 @@
+"""Content-hashed incremental indexing for EmbeddingStore."""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+
+from ingest import BatchIngestor, ProgressCallback
+from loaders import DEFAULT_BATCH_SIZE, batched
+
+# SQLite limits the number of bound parameters per statement.
+_QUERY_CHUNK = 500
+
+
+def chunk_hash(chunk: Dict[str, Any]) -> str:
+    """Stable id for a chunk derived from its content and metadata.
+
+    Identical chunks always hash to the same id across runs, so re-indexing
+    an unchanged corpus produces no new ids.
+
+    Args:
+        chunk: Chunk dictionary or record
+
+    Returns:
+        Hex digest used as the vector store id
+    """
+    h = hashlib.sha256()
+    for field in ("doc_id", "title", "category", "chunk_idx", "content"):
+        h.update(str(chunk[field]).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()[:32]
+
+
+class IndexManifest:
+    """Chunk ids present in a collection, kept in SQLite with a generation each.
+
+    Every sync opens a new generation and stamps each id found in the corpus
+    with it, so ids left on an older generation are stale and are pruned
+    with one query; the id set is never held in memory. All changes of a
+    sync form one transaction, committed by ``save``: an interrupted sync
+    leaves the previous manifest intact.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the manifest database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                id TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_generation ON chunks(generation);
+            """
+        )
+        # user_version is set by the first save, so a file left by an
+        # interrupted first sync does not count as a manifest
+        self.loaded = self._conn.execute("PRAGMA user_version").fetchone()[0] > 0
+        last = self._conn.execute("SELECT MAX(generation) FROM chunks").fetchone()[0]
+        self.generation = (last or 0) + 1
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def add(self, ids: Iterable[str], generation: int = None):
+        """Record ids as indexed (in the current generation by default)."""
+        generation = self.generation if generation is None else generation
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO chunks (id, generation) VALUES (?, ?)",
+            ((chunk_id, generation) for chunk_id in ids),
+        )
+
+    def claim(self, ids: List[str]) -> List[str]:
+        """Mark ids as seen in this generation.
+
+        Returns:
+            The ids that were not indexed yet, deduplicated, in order
+        """
+        ids = list(dict.fromkeys(ids))
+        known = set()
+        for i in range(0, len(ids), _QUERY_CHUNK):
+            part = ids[i : i + _QUERY_CHUNK]
+            marks = ",".join("?" * len(part))
+            known.update(row[0] for row in self._conn.execute(
+                f"SELECT id FROM chunks WHERE id IN ({marks})", part
+            ))
+        self.add(ids)
+        return [chunk_id for chunk_id in ids if chunk_id not in known]
+
+    def seen(self) -> int:
+        """Number of distinct ids seen in this generation."""
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM chunks WHERE generation = ?", (self.generation,)
+        ).fetchone()[0]
+
+    def stale(self) -> Iterator[str]:
+        """Ids not seen in this generation."""
+        for (chunk_id,) in self._conn.execute(
+            "SELECT id FROM chunks WHERE generation < ?", (self.generation,)
+        ):
+            yield chunk_id
+
+    def discard_stale(self) -> int:
+        """Forget every id not seen in this generation; returns how many."""
+        return self._conn.execute(
+            "DELETE FROM chunks WHERE generation < ?", (self.generation,)
+        ).rowcount
+
+    def save(self):
+        """Commit this sync's changes."""
+        if not self.loaded:
+            self._conn.execute("PRAGMA user_version = 1")
+        self._conn.commit()
+        self.loaded = True
+
+    def close(self):
+        """Close the database, discarding uncommitted changes."""
+        self._conn.close()
+
+
+class IncrementalIndexMixin:
+    """Adds hash-keyed upserts on top of ``EmbeddingStore`` primitives.
+
+    Relies on ``collection``, ``persist_dir``, ``create_collection``,
+    ``embed``, ``_add_batch``, ``_notify``, ``save`` and ``version`` from
+    the store.
+    """
+
+    def sync_documents(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prefetch: bool = False,
+        on_progress: ProgressCallback = None,
+    ) -> Dict[str, int]:
+        """Incrementally index chunks keyed by content hash.
+
+        Only chunks whose hash is not in the collection manifest are embedded
+        and upserted; ids in the manifest that no longer appear in
+        ``documents`` are deleted. The store is saved before the manifest
+        is committed, so the manifest never lists unsaved chunks.
+
+        Args:
+            documents: Iterable of document chunks (the complete corpus)
+            batch_size: Number of chunks per collection write
+            prefetch: Embed the next batch while the current one is written
+            on_progress: Called with a progress dict after every batch
+
+        Returns:
+            Counts of added, unchanged and deleted chunks
+        """
+        if not self.collection:
+            self.create_collection()
+
+        manifest = self.load_manifest()
+        try:
+            ingestor = BatchIngestor(self, batch_size, prefetch, on_progress)
+            added = ingestor.run(self.new_chunks(documents, manifest), upsert=True)["documents"]
+            deleted = self.prune_stale(manifest, batch_size)
+            unchanged = manifest.seen() - added
+            self.save()
+            manifest.save()
+        finally:
+            manifest.close()
+        return {"added": added, "unchanged": unchanged, "deleted": deleted}
+
+    def manifest_path(self) -> Path:
+        """Path of the manifest database for the current collection."""
+        return Path(self.persist_dir) / f"manifest_{self.collection.name}.sqlite3"
+
+    def load_manifest(self) -> IndexManifest:
+        """Open the manifest of the current collection.
+
+        A collection without a manifest (e.g. indexed by an older run) is
+        bootstrapped from the ids it already holds, read in pages.
+
+        Returns:
+            IndexManifest for the collection
+        """
+        manifest = IndexManifest(self.manifest_path())
+        if not manifest.loaded:
+            for offset in range(0, self.collection.count(), _QUERY_CHUNK):
+                page = self.collection.get(include=[], limit=_QUERY_CHUNK, offset=offset)
+                manifest.add(page["ids"], generation=manifest.generation - 1)
+        return manifest
+
+    @staticmethod
+    def new_chunks(
+        documents: Iterable[Dict[str, Any]], manifest: IndexManifest
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``(hash_id, chunk)`` for chunks missing from the manifest.
+
+        Every hash is also marked as seen in the manifest for later pruning.
+        """
+        for batch in batched(documents, _QUERY_CHUNK):
+            chunks = {chunk_hash(chunk): chunk for chunk in batch}
+            for chunk_id in manifest.claim(list(chunks)):
+                yield chunk_id, chunks[chunk_id]
+
+    def prune_stale(self, manifest: IndexManifest, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Delete manifest ids that were not seen in the latest corpus.
+
+        Returns:
+            Number of deleted chunks
+        """
+        for batch in batched(manifest.stale(), batch_size):
+            self.collection.delete(ids=batch)
+            self._notify("remove", batch)
+        deleted = manifest.discard_stale()
+        if deleted:
+            self.version += 1
+        return deleted
@@ -0,0 +1,115 @@
+"""Batched, bounded-memory ingestion into an EmbeddingStore."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable, Tuple
+
+from loaders import DEFAULT_BATCH_SIZE, batched
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class BatchIngestor:
+    """Embeds and writes ``(id, chunk)`` pairs in fixed-size batches.
+
+    At most two batches are alive at once: with ``prefetch`` the next batch
+    is embedded on a background thread while the current one is written.
+    The batch size is clamped to the collection's maximum batch size.
+    """
+
+    def __init__(
+        self,
+        store,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prefetch: bool = False,
+        on_progress: ProgressCallback = None,
+    ):
+        """Initialize ingestor.
+
+        Args:
+            store: EmbeddingStore with an open collection
+            batch_size: Chunks per embedding call and collection write
+            prefetch: Embed the next batch while the current one is written
+            on_progress: Called with a progress dict after every write
+        """
+        self.store = store
+        self.batch_size = max(1, min(batch_size, store.max_batch_size()))
+        self.prefetch = prefetch
+        self.on_progress = on_progress
+
+    def run(
+        self,
+        pairs: Iterable[Tuple[str, Dict[str, Any]]],
+        upsert: bool = False,
+        on_written: Callable[[List[str]], None] = None,
+    ) -> Dict[str, Any]:
+        """Ingest a stream of ``(id, chunk)`` pairs.
+
+        Args:
+            pairs: Iterable of store ids and chunks
+            upsert: Overwrite existing ids instead of adding
+            on_written: Called with the ids of each batch after it is written
+
+        Returns:
+            Final progress dict
+        """
+        progress = {
+            "batches": 0,
+            "documents": 0,
+            "embed_seconds": 0.0,
+            "write_seconds": 0.0,
+            "elapsed": 0.0,
+            "docs_per_second": 0.0,
+        }
+        start = time.perf_counter()
+        batches = batched(pairs, self.batch_size)
+
+        if not self.prefetch:
+            for batch in batches:
+                self._write(batch, self._embed(batch), progress, upsert, on_written, start)
+            return progress
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batch = next(batches, None)
+            future = executor.submit(self._embed, batch) if batch else None
+            while batch:
+                embedded = future.result()
+                next_batch = next(batches, None)
+                if next_batch:
+                    future = executor.submit(self._embed, next_batch)
+                self._write(batch, embedded, progress, upsert, on_written, start)
+                batch = next_batch
+
+        return progress
+
+    def _embed(self, batch: List[Tuple[str, Dict[str, Any]]]) -> Tuple[List[Any], float]:
+        """Embed one batch, returning (embeddings, seconds)."""
+        begin = time.perf_counter()
+        embeddings = self.store.embed([chunk["content"] for _, chunk in batch])
+        return embeddings, time.perf_counter() - begin
+
+    def _write(self, batch, embedded, progress, upsert, on_written, start):
+        """Write one embedded batch and report progress."""
+        embeddings, embed_seconds = embedded
+        ids = [chunk_id for chunk_id, _ in batch]
+
+        begin = time.perf_counter()
+        self.store._add_batch([chunk for _, chunk in batch], embeddings, ids=ids, upsert=upsert)
+        progress["write_seconds"] += time.perf_counter() - begin
+        progress["embed_seconds"] += embed_seconds
+
+        if on_written:
+            on_written(ids)
+
+        progress["batches"] += 1
+        progress["documents"] += len(batch)
+        progress["elapsed"] = time.perf_counter() - start
+        progress["docs_per_second"] = progress["documents"] / progress["elapsed"]
+        if self.on_progress:
+            self.on_progress(dict(progress))
+
+
+def print_progress(progress: Dict[str, Any]):
+    """Progress callback that prints one line per batch."""
+    print(f"  batch {progress['batches']}: {progress['documents']} chunks, "
+          f"{progress['docs_per_second']:.1f} chunks/s")
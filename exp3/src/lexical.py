@@ -0,0 +1,178 @@
+"""In-process BM25 inverted index with Hebrew-aware tokenization."""
+
+import math
+import re
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+NIQQUD = re.compile(r"[\u0591-\u05BD\u05BF\u05C1\u05C2\u05C4\u05C5\u05C7]")
+HEBREW_WORD = re.compile(r"[\u05D0-\u05EA]+")
+FINAL_LETTERS = str.maketrans("ךםןףץ", "כמנפצ")
+# Single-letter proclitics: ו (and), ה (the), ב/ל/מ/כ (prepositions), ש (that).
+HEBREW_PREFIXES = "והבלמשכ"
+
+
+def hebrew_terms(text: str) -> List[str]:
+    """Index terms of ``text``.
+
+    Niqqud is removed, final letter forms are folded and Latin text is
+    lowercased. A Hebrew word with leading proclitics also yields its
+    stripped stem (keeping at least three letters), so ``בתרופה`` matches
+    ``תרופה``.
+    """
+    terms = []
+    for word in WORD_PATTERN.findall(NIQQUD.sub("", text)):
+        word = word.lower().translate(FINAL_LETTERS)
+        terms.append(word)
+        if HEBREW_WORD.fullmatch(word):
+            stem = word
+            while len(stem) > 3 and stem[0] in HEBREW_PREFIXES and len(word) - len(stem) < 2:
+                stem = stem[1:]
+            if stem != word:
+                terms.append(stem)
+    return terms
+
+
+class BM25Index:
+    """Okapi BM25 over an append-only inverted index keyed by store ids.
+
+    Postings are appended as documents arrive and converted to NumPy
+    arrays on first use, so scoring a term is one vectorized pass over its
+    postings, summed into a dense score vector with ``np.bincount``.
+    Removed documents are masked out and compacted away once they make up
+    half of the index. ``attach`` keeps the index in step with an
+    ``EmbeddingStore`` as it is written, without rescanning it.
+    """
+
+    PAGE_SIZE = 1000
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: Term-frequency saturation
+            b: Document-length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.records: List[Dict[str, Any]] = []
+        self.slots: Dict[str, int] = {}
+        self.lengths: List[int] = []
+        self.alive: List[bool] = []
+        self.postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._stats = None
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add(self, ids: Iterable[str], documents: Iterable[Dict[str, Any]]):
+        """Index documents (``{"content", "metadata"}``); known ids are skipped."""
+        for chunk_id, doc in zip(ids, documents):
+            if chunk_id in self.slots:
+                continue
+            slot = len(self.records)
+            counts = Counter(hebrew_terms(doc["content"]))
+            for term, tf in counts.items():
+                docs, tfs = self.postings.setdefault(term, ([], []))
+                docs.append(slot)
+                tfs.append(tf)
+                self._arrays.pop(term, None)
+            self.slots[chunk_id] = slot
+            self.records.append({"content": doc["content"], "metadata": doc["metadata"]})
+            self.lengths.append(sum(counts.values()))
+            self.alive.append(True)
+            self._stats = None
+
+    def remove(self, ids: Iterable[str]):
+        """Drop documents by id."""
+        for chunk_id in ids:
+            slot = self.slots.pop(chunk_id, None)
+            if slot is not None:
+                self.alive[slot] = False
+                self._stats = None
+        if len(self.slots) * 2 < len(self.records):
+            self._compact()
+
+    def _compact(self):
+        """Rebuild the index from live documents only."""
+        live = sorted(self.slots.items(), key=lambda item: item[1])
+        records = [self.records[slot] for _, slot in live]
+        self.__init__(self.k1, self.b)
+        self.add([chunk_id for chunk_id, _ in live], records)
+
+    def attach(self, store):
+        """Build the index from ``store`` and follow its later writes and deletes."""
+        self.sync(store)
+        store.add_listener(self)
+
+    def sync(self, store) -> int:
+        """Rebuild the index from ``store``'s collection, read in pages.
+
+        Returns:
+            Number of documents indexed
+        """
+        self.__init__(self.k1, self.b)
+        if store.collection:
+            for offset in range(0, store.collection.count(), self.PAGE_SIZE):
+                page = store.collection.get(
+                    include=["documents", "metadatas"], limit=self.PAGE_SIZE, offset=offset
+                )
+                self.add(page["ids"], [
+                    {"content": text, "metadata": meta}
+                    for text, meta in zip(page["documents"], page["metadatas"])
+                ])
+        return len(self)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+        """Top-``k`` documents by BM25 score.
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            List of (document, score) pairs, best first
+        """
+        if not self.slots or k <= 0:
+            return []
+        lengths, alive, avgdl = self._doc_stats()
+        total = len(self.slots)
+        scores = np.zeros(len(self.records))
+
+        for term in set(hebrew_terms(query)):
+            docs, tfs = self._postings_arrays(term)
+            live = alive[docs]
+            df = int(live.sum())
+            if df == 0:
+                continue
+            docs, tfs = docs[live], tfs[live]
+            idf = math.log(1.0 + (total - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * lengths[docs] / avgdl)
+            contributions = idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+            scores += np.bincount(docs, contributions, minlength=len(scores))
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        best = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(self.records[slot], float(scores[slot])) for slot in best]
+
+    def _postings_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Cached NumPy ``(doc slots, term frequencies)`` for ``term``."""
+        if term not in self._arrays:
+            docs, tfs = self.postings.get(term, ([], []))
+            self._arrays[term] = (np.array(docs, dtype=np.int32), np.array(tfs, dtype=np.float32))
+        return self._arrays[term]
+
+    def _doc_stats(self) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Cached document lengths, live mask and average live length."""
+        if self._stats is None:
+            lengths = np.array(self.lengths, dtype=np.float32)
+            alive = np.array(self.alive, dtype=bool)
+            avgdl = float(lengths[alive].mean()) or 1.0
+            self._stats = (lengths, alive, avgdl)
+        return self._stats
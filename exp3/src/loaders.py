@@ -0,0 +1,195 @@
+"""Incremental document readers and batching helpers for large corpora."""
+
+import json
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Dict, Any
+
+JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+DEFAULT_BATCH_SIZE = 256
+
+# Characters that change nesting or string state, and those that end a bare scalar
+_STRUCTURE = re.compile(r'["\\\[\]{}]')
+_SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield documents from a JSON Lines file, one per line.
+
+    Args:
+        path: Path to JSONL file
+
+    Returns:
+        Iterator over document dictionaries
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+class _ElementScanner:
+    """Finds where one JSON value ends without decoding it.
+
+    Text is fed piece by piece and scanning resumes where the previous
+    piece stopped, so every character is scanned once. A bare scalar
+    (number, ``true``...) only ends at a following delimiter, so a number
+    split between two pieces is never taken for a shorter one.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.scalar = None
+
+    def feed(self, text: str, start: int = 0) -> int:
+        """Scan ``text[start:]``; return the index just past the value, or -1 if it continues."""
+        if self.scalar is None:
+            self.scalar = text[start] not in '{["'
+        if self.scalar:
+            match = _SCALAR_END.search(text, start)
+            return match.start() if match else -1
+
+        if self.escape and start < len(text):
+            start += 1
+            self.escape = False
+        skip = -1
+        for match in _STRUCTURE.finditer(text, start):
+            i = match.start()
+            if i < skip:
+                continue
+            c = text[i]
+            if self.in_string:
+                if c == "\\":
+                    skip = i + 2
+                    self.escape = skip > len(text)
+                elif c == '"':
+                    self.in_string = False
+                    if self.depth == 0:
+                        return i + 1
+            elif c == '"':
+                self.in_string = True
+            elif c in "[{":
+                self.depth += 1
+            elif c in "]}":
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return -1
+
+
+def iter_json_array(path: str, buffer_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """Yield the elements of a top-level JSON array without loading it whole.
+
+    The file is read in ``buffer_size`` pieces. An element is decoded once,
+    after a scan of the pieces read so far shows it is complete (or at end
+    of file), so memory is bounded by the largest element and reading time
+    is linear in the file size.
+
+    Args:
+        path: Path to JSON file containing an array of documents
+        buffer_size: Number of characters read per step
+
+    Returns:
+        Iterator over document dictionaries
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+        started = False
+
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+
+            if pos < len(buf) and not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                started = True
+                pos += 1
+                continue
+
+            if pos < len(buf) and buf[pos] == "]":
+                return
+
+            if pos < len(buf):
+                scanner = _ElementScanner()
+                if scanner.feed(buf, pos) < 0 and not eof:
+                    parts = [buf[pos:]]
+                    while True:
+                        data = f.read(buffer_size)
+                        if not data:
+                            eof = True
+                            break
+                        parts.append(data)
+                        if scanner.feed(data) >= 0:
+                            break
+                    buf, pos = "".join(parts), 0
+                item, pos = decoder.raw_decode(buf, pos)
+                yield item
+                continue
+
+            if eof:
+                if started:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                return
+
+            data = f.read(buffer_size)
+            eof = not data
+            buf = buf[pos:] + data
+            pos = 0
+
+
+def iter_shards(directory: str) -> Iterator[Dict[str, Any]]:
+    """Stream documents from every JSONL shard in a directory, in name order.
+
+    Args:
+        directory: Directory of ``.jsonl``/``.ndjson`` shards
+
+    Returns:
+        Iterator over document dictionaries
+    """
+    for shard in sorted(Path(directory).iterdir()):
+        if shard.suffix.lower() in JSONL_SUFFIXES and shard.name.startswith("docs-"):
+            yield from iter_jsonl(str(shard))
+
+
+def iter_documents(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream documents from a JSON array, a JSONL file or a shard directory.
+
+    Args:
+        path: Path to documents file; ``.jsonl``/``.ndjson`` are read line by
+            line and a directory is read as ``docs-*.jsonl`` shards
+
+    Returns:
+        Iterator over document dictionaries
+    """
+    if Path(path).is_dir():
+        return iter_shards(path)
+    if Path(path).suffix.lower() in JSONL_SUFFIXES:
+        return iter_jsonl(path)
+    return iter_json_array(path)
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most ``size`` items.
+
+    Args:
+        items: Any iterable, consumed lazily
+        size: Maximum batch length
+
+    Returns:
+        Iterator over batches
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,170 @@
+"""Local stand-in for the Anthropic Messages API with token-based latency.
+
+Answers extractively: the sentences of the prompt that share the most
+terms with the question (the prompt's last line) are returned. Latency is
+``base + input_tokens * per_input`` before the first token and
+``per_output`` per streamed token after it.
+
+Run standalone with ``python src/mock_llm_server.py --port 8765``.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any
+
+from lexical import hebrew_terms
+from tokens import RegexTokenizer, TOKEN_PATTERN
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def message_text(content) -> str:
+    """Text of a message ``content`` given as a string or a list of blocks."""
+    if isinstance(content, str):
+        return content
+    return "\n".join(block.get("text", "") for block in content if block.get("type") == "text")
+
+
+def extractive_answer(prompt: str, sentences: int = 2) -> str:
+    """Sentences of ``prompt`` sharing the most terms with its last line."""
+    lines = prompt.strip().splitlines()
+    question = set(hebrew_terms(lines[-1])) if lines else set()
+    candidates = [s for line in lines[:-1] for s in SENTENCE_END.split(line) if s.strip()]
+    ranked = sorted(candidates, key=lambda s: len(question & set(hebrew_terms(s))), reverse=True)
+    return " ".join(ranked[:sentences]) or "אין מספיק מידע."
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """Serves ``POST /v1/messages`` (plain JSON or server-sent events)."""
+
+    tokenizer = RegexTokenizer()
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/messages":
+            self.send_error(404)
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        prompt = message_text(request["messages"][-1]["content"])
+        system = message_text(request.get("system", ""))
+        input_tokens = self.tokenizer.count(system) + sum(
+            self.tokenizer.count(message_text(m["content"])) for m in request["messages"]
+        )
+        pieces = TOKEN_PATTERN.findall(extractive_answer(prompt))[: request.get("max_tokens", 1024)]
+        server = self.server
+        time.sleep((server.base_ms + input_tokens * server.per_input_ms) / 1000.0)
+
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:24]}", "type": "message", "role": "assistant",
+            "model": request.get("model", "mock"), "content": [], "stop_reason": None,
+            "usage": {"input_tokens": input_tokens, "output_tokens": 0},
+        }
+        if request.get("stream"):
+            self._stream(message, pieces)
+            return
+
+        time.sleep(len(pieces) * server.per_output_ms / 1000.0)
+        message["content"] = [{"type": "text", "text": " ".join(pieces)}]
+        message["stop_reason"] = "end_turn"
+        message["usage"]["output_tokens"] = len(pieces)
+        self._send(200, "application/json", json.dumps(message).encode("utf-8"))
+
+    def _stream(self, message: Dict[str, Any], pieces: List[str]):
+        """Emit the Messages streaming event sequence, one token per delta."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self._event("message_start", {"type": "message_start", "message": message})
+        self._event("content_block_start", {"type": "content_block_start", "index": 0,
+                                            "content_block": {"type": "text", "text": ""}})
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(self.server.per_output_ms / 1000.0)
+            self._event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                "delta": {"type": "text_delta", "text": (" " if i else "") + piece}})
+        self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self._event("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn"},
+                                      "usage": {"output_tokens": len(pieces)}})
+        self._event("message_stop", {"type": "message_stop"})
+
+    def _event(self, name: str, data: Dict[str, Any]):
+        self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep the experiment output clean."""
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """Threaded mock server; use as a context manager to run it in the background."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        base_ms: float = 50.0,
+        per_input_ms: float = 0.1,
+        per_output_ms: float = 2.0,
+    ):
+        """Bind the server (port 0 picks a free port).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind
+            base_ms: Fixed latency before the first token
+            per_input_ms: Extra first-token latency per input token
+            per_output_ms: Latency per generated token
+        """
+        super().__init__((host, port), MockLLMHandler)
+        self.base_ms = base_ms
+        self.per_input_ms = per_input_ms
+        self.per_output_ms = per_output_ms
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv=None):
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--base-ms", type=float, default=50.0)
+    parser.add_argument("--per-input-ms", type=float, default=0.1)
+    parser.add_argument("--per-output-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer("127.0.0.1", args.port, args.base_ms, args.per_input_ms, args.per_output_ms)
+    print(f"Mock Messages API listening on {server.url}/v1/messages")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
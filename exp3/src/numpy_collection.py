@@ -0,0 +1,239 @@
+"""Exact-search vector collection backed by a contiguous NumPy matrix."""
+
+import json
+from pathlib import Path
+from typing import List, Dict, Any, Callable
+
+import numpy as np
+
+
+def normalize(vectors) -> np.ndarray:
+    """Return float32 row vectors scaled to unit length."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class NumpyCollection:
+    """Minimal Chroma-compatible collection using brute-force cosine search.
+
+    Vectors live in one normalized float32 matrix so a query batch is a
+    single matmul followed by ``argpartition``. Deletes move the last row
+    into the freed slot, keeping storage contiguous. Results use Chroma's
+    shapes and cosine distances (``1 - similarity``).
+    """
+
+    def __init__(self, name: str, path: Path = None):
+        """Initialize collection, loading it from ``path`` if saved there.
+
+        Args:
+            name: Collection name
+            path: Directory holding ``vectors.npy`` and ``records.json``
+        """
+        self.name = name
+        self.path = path
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.rows: Dict[str, int] = {}
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.dirty = False
+
+        if path and (path / "vectors.npy").exists():
+            self.load(path)
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids, documents, metadatas, embeddings):
+        """Append records; ``embeddings`` are required.
+
+        Raises:
+            ValueError: If an id is repeated or already stored, or the
+                vectors do not match the collection's dimension
+        """
+        vectors = normalize(embeddings)
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Duplicate ids in add to collection {self.name}")
+        existing = [chunk_id for chunk_id in ids if chunk_id in self.rows]
+        if existing:
+            raise ValueError(
+                f"Ids already in collection {self.name}: {existing[:5]} (use upsert to replace)"
+            )
+        self._check_dimension(vectors)
+        self._make_writable()
+        n = self.count()
+        if self.matrix.shape[0] < n + len(ids) or self.matrix.shape[1] != vectors.shape[1]:
+            capacity = max(2 * self.matrix.shape[0], n + len(ids), 64)
+            grown = np.zeros((capacity, vectors.shape[1]), dtype=np.float32)
+            if n:
+                grown[:n] = self.matrix[:n]
+            self.matrix = grown
+        self.matrix[n : n + len(ids)] = vectors
+        for offset, chunk_id in enumerate(ids):
+            self.rows[chunk_id] = n + offset
+        self.ids.extend(ids)
+        self.documents.extend(documents)
+        self.metadatas.extend(metadatas)
+
+    def upsert(self, ids, documents, metadatas, embeddings):
+        """Replace existing ids and add new ones."""
+        self.delete(ids=ids)
+        self.add(ids, documents, metadatas, embeddings)
+
+    def delete(self, ids: List[str]):
+        """Remove ids by moving the last row into each freed slot."""
+        ids = [chunk_id for chunk_id in ids if chunk_id in self.rows]
+        if ids:
+            self._make_writable()
+        for chunk_id in ids:
+            row = self.rows.pop(chunk_id, None)
+            if row is None:
+                continue
+            last = self.count() - 1
+            if row != last:
+                self.matrix[row] = self.matrix[last]
+                for column in (self.ids, self.documents, self.metadatas):
+                    column[row] = column[last]
+                self.rows[self.ids[row]] = row
+            for column in (self.ids, self.documents, self.metadatas):
+                column.pop()
+
+    def _check_dimension(self, vectors: np.ndarray):
+        """Reject vectors whose dimension differs from the stored ones."""
+        if self.count() and vectors.shape[1] != self.matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match collection "
+                f"{self.name} dimension {self.matrix.shape[1]}"
+            )
+
+    def _make_writable(self):
+        """Copy a memory-mapped matrix into memory before the first write."""
+        if not self.matrix.flags.writeable:
+            self.matrix = np.array(self.matrix)
+        self.dirty = True
+
+    def get(self, ids: List[str] = None, include=None, limit: int = None, offset: int = 0) -> Dict[str, Any]:
+        """Return stored records (all of them, a ``limit``/``offset`` page, or the given ids).
+
+        Vectors are returned (normalized) only when ``include`` lists ``"embeddings"``.
+        """
+        if ids is None:
+            stop = self.count() if limit is None else min(self.count(), offset + limit)
+            rows = list(range(offset, stop))
+        else:
+            rows = [self.rows[i] for i in ids if i in self.rows]
+        results = {
+            "ids": [self.ids[r] for r in rows],
+            "documents": [self.documents[r] for r in rows],
+            "metadatas": [self.metadatas[r] for r in rows],
+        }
+        if include and "embeddings" in include:
+            results["embeddings"] = np.array(self.matrix[rows]) if rows else np.zeros((0, 0), np.float32)
+        return results
+
+    def query(self, query_embeddings, n_results: int = 3, where=None, **_) -> Dict[str, Any]:
+        """Exact top-k cosine search for a batch of query vectors.
+
+        ``where`` follows Chroma's metadata filter syntax: field equality,
+        the ``$eq``/``$ne``/``$gt``/``$gte``/``$lt``/``$lte``/``$in``/``$nin``
+        operators, and ``$and``/``$or`` over lists of filters.
+
+        Raises:
+            ValueError: On an unsupported filter operator or query vectors
+                of the wrong dimension
+        """
+        n = self.count()
+        queries = normalize(query_embeddings)
+        if n:
+            self._check_dimension(queries)
+        rows = np.flatnonzero(self._mask(where)) if where else np.arange(n)
+        k = min(n_results, len(rows))
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        if k == 0:
+            for key in results:
+                results[key] = [[] for _ in query_embeddings]
+            return results
+
+        matrix = self.matrix[rows] if where else self.matrix[:n]
+        scores = queries @ matrix.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        for q, candidates in enumerate(top):
+            order = candidates[np.argsort(-scores[q, candidates])]
+            found = rows[order]
+            results["ids"].append([self.ids[r] for r in found])
+            results["documents"].append([self.documents[r] for r in found])
+            results["metadatas"].append([self.metadatas[r] for r in found])
+            results["distances"].append((1.0 - scores[q, order]).tolist())
+        return results
+
+    _TESTS = {
+        "$eq": lambda value, arg: value == arg,
+        "$ne": lambda value, arg: value != arg,
+        "$gt": lambda value, arg: value is not None and value > arg,
+        "$gte": lambda value, arg: value is not None and value >= arg,
+        "$lt": lambda value, arg: value is not None and value < arg,
+        "$lte": lambda value, arg: value is not None and value <= arg,
+        "$in": lambda value, arg: value in arg,
+        "$nin": lambda value, arg: value not in arg,
+    }
+
+    def _mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """Boolean row mask for a Chroma-style metadata filter."""
+        match = self._matcher(where)
+        return np.fromiter(
+            (match(meta) for meta in self.metadatas), dtype=bool, count=self.count()
+        )
+
+    def _matcher(self, where: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """Compile a filter into a predicate over one metadata dict."""
+        predicates = []
+        for field, condition in where.items():
+            if field in ("$and", "$or"):
+                if not isinstance(condition, list):
+                    raise ValueError(f"{field} expects a list of filters, got {condition!r}")
+                parts = [self._matcher(part) for part in condition]
+                combine = all if field == "$and" else any
+                predicates.append(lambda meta, parts=parts, combine=combine: combine(p(meta) for p in parts))
+                continue
+            if field.startswith("$"):
+                raise ValueError(f"Unsupported filter operator {field}")
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, arg in condition.items():
+                if op not in self._TESTS:
+                    raise ValueError(f"Unsupported filter operator {op} on field {field}")
+                test = self._TESTS[op]
+                predicates.append(lambda meta, field=field, test=test, arg=arg: test(meta.get(field), arg))
+        return lambda meta: all(p(meta) for p in predicates)
+
+    def save(self, path: Path = None):
+        """Write vectors (``.npy``) and records (JSON) to ``path``."""
+        path = path or self.path
+        if not self.dirty and path == self.path and (path / "vectors.npy").exists():
+            return
+        self._make_writable()
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "vectors.npy", self.matrix[: self.count()])
+        with open(path / "records.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {"ids": self.ids, "documents": self.documents, "metadatas": self.metadatas},
+                f, ensure_ascii=False,
+            )
+        self.dirty = False
+
+    def load(self, path: Path):
+        """Load a saved collection, memory-mapping its vectors read-only.
+
+        The first write copies the matrix into memory.
+        """
+        self.matrix = np.load(path / "vectors.npy", mmap_mode="r")
+        with open(path / "records.json", "r", encoding="utf-8") as f:
+            records = json.load(f)
+        self.ids = records["ids"]
+        self.documents = records["documents"]
+        self.metadatas = records["metadatas"]
+        self.rows = {chunk_id: row for row, chunk_id in enumerate(self.ids)}
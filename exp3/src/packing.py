@@ -0,0 +1,155 @@
+"""Token-budgeted context packing with overlap and near-duplicate removal."""
+
+from typing import List, Dict, Any, Set
+
+from embeddings import EmbeddingStore
+from lexical import hebrew_terms
+from retrieval import RAGMode
+from timing import span
+from tokens import default_tokenizer
+
+
+def shingles(text: str, size: int = 3) -> Set[tuple]:
+    """Set of ``size``-term shingles used for near-duplicate detection."""
+    terms = hebrew_terms(text)
+    if len(terms) < size:
+        return {tuple(terms)} if terms else set()
+    return {tuple(terms[i : i + size]) for i in range(len(terms) - size + 1)}
+
+
+def shared_boundary(left: str, right: str, max_overlap: int = 200, min_overlap: int = 10) -> int:
+    """Length of the longest suffix of ``left`` that is a prefix of ``right``."""
+    for length in range(min(max_overlap, len(left), len(right)), min_overlap - 1, -1):
+        if left.endswith(right[:length]):
+            return length
+    return 0
+
+
+class ContextPacker:
+    """Greedily fills a token budget with the highest-scoring chunks.
+
+    Chunks are taken best first. A chunk whose shingles are mostly
+    contained in an already packed chunk is dropped; text shared with a
+    packed neighbour of the same document (the chunker's overlap) is
+    trimmed. Chunks that no longer fit are skipped so smaller ones can
+    still use the remaining budget.
+    """
+
+    def __init__(self, max_tokens: int = 512, tokenizer=None, duplicate_threshold: float = 0.8):
+        """Initialize packer.
+
+        Args:
+            max_tokens: Token budget for the packed context
+            tokenizer: Tokenizer from ``tokens`` (defaults to ``default_tokenizer()``)
+            duplicate_threshold: Shingle containment at which a chunk is a duplicate
+        """
+        self.max_tokens = max_tokens
+        self.tokenizer = tokenizer or default_tokenizer()
+        self.duplicate_threshold = duplicate_threshold
+
+    def pack(self, documents: List[Dict], scores: List[float] = None) -> Dict[str, Any]:
+        """Select chunks for the context.
+
+        Args:
+            documents: Candidate chunks (``content`` and ``metadata``)
+            scores: Relevance per chunk, higher is better (defaults to input order)
+
+        Returns:
+            Dict with ``documents`` (packed chunks, best first), ``tokens``
+            (exact token count of the packed contents) and counts of
+            ``duplicates``, ``trimmed_chars`` and ``over_budget`` chunks
+        """
+        order = range(len(documents))
+        if scores is not None:
+            order = sorted(order, key=lambda i: scores[i], reverse=True)
+
+        packed, packed_shingles = [], []
+        report = {"documents": packed, "tokens": 0, "duplicates": 0,
+                  "trimmed_chars": 0, "over_budget": 0}
+
+        for i in order:
+            document = documents[i]
+            candidate = shingles(document["content"])
+            if candidate and any(
+                len(candidate & seen) >= self.duplicate_threshold * len(candidate)
+                for seen in packed_shingles
+            ):
+                report["duplicates"] += 1
+                continue
+
+            content = self._trim_overlaps(document, packed)
+            tokens = self.tokenizer.count(content)
+            if not content.strip() or report["tokens"] + tokens > self.max_tokens:
+                report["over_budget"] += bool(content.strip())
+                continue
+
+            report["trimmed_chars"] += len(document["content"]) - len(content)
+            report["tokens"] += tokens
+            packed.append({"content": content, "metadata": document["metadata"]})
+            packed_shingles.append(candidate)
+
+        return report
+
+    @staticmethod
+    def _trim_overlaps(document: Dict, packed: List[Dict]) -> str:
+        """Remove text the chunk shares with packed neighbours of its document."""
+        content = document["content"]
+        metadata = document["metadata"]
+        for other in packed:
+            if other["metadata"].get("doc_id") != metadata.get("doc_id"):
+                continue
+            distance = int(metadata.get("chunk_idx", 0)) - int(other["metadata"].get("chunk_idx", 0))
+            if distance == 1:
+                content = content[shared_boundary(other["content"], content):]
+            elif distance == -1:
+                content = content[: len(content) - shared_boundary(content, other["content"])]
+        return content
+
+
+class PackedRAGMode(RAGMode):
+    """RAG that packs a token budget instead of returning a fixed ``k``."""
+
+    def __init__(self, store: EmbeddingStore, packer: ContextPacker, candidates: int = 20):
+        """Initialize packed RAG mode.
+
+        Args:
+            store: EmbeddingStore instance
+            packer: ContextPacker holding the token budget
+            candidates: Similarity hits considered for packing
+        """
+        super().__init__(store, k=candidates)
+        self.packer = packer
+
+    def retrieve(self, query: str) -> tuple[List[Dict], float]:
+        """Retrieve a token-budgeted context for a query."""
+        batch, elapsed = self.retrieve_many([query])
+        return batch[0], elapsed
+
+    def retrieve_many(self, queries: List[str]) -> tuple[List[List[Dict]], float]:
+        """Search all queries in one batch, then pack each result list.
+
+        Packing reports (tokens used, chunks dropped) are left in
+        ``last_stages``.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Tuple of (documents per query, total retrieval_time)
+        """
+        with span("packed_rag") as timed:
+            with span("retrieve") as retrieved:
+                results = self.store.similarity_search_many(queries, k=self.k)
+
+            documents, self.last_stages = [], []
+            with span("pack") as packed:
+                for candidates, distances in results:
+                    report = self.packer.pack(candidates, [-distance for distance in distances])
+                    documents.append(report.pop("documents"))
+                    self.last_stages.append({"budget_tokens": self.packer.max_tokens, **report})
+
+        n = max(len(queries), 1)
+        for stages in self.last_stages:
+            stages["retrieve_seconds"] = retrieved.seconds / n
+            stages["pack_seconds"] = packed.seconds / n
+        return documents, timed.seconds
@@ -0,0 +1,199 @@
+"""Parallel chunk -> embed -> write indexing pipeline."""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator
+
+from chunking import DocumentChunker
+from embeddings import EmbeddingStore
+from loaders import batched
+
+_DONE = object()
+_worker_chunker = None
+
+
+def _init_worker(chunker: DocumentChunker):
+    """Store the chunker once per worker process."""
+    global _worker_chunker
+    _worker_chunker = chunker
+
+
+def _chunk_batch(documents: List[Dict]) -> tuple[List[Dict[str, Any]], float]:
+    """Chunk a batch of documents in a worker process.
+
+    Returns:
+        Tuple of (chunks, seconds spent chunking)
+    """
+    start = time.perf_counter()
+    chunks = _worker_chunker.chunk_documents(documents)
+    return chunks, time.perf_counter() - start
+
+
+class IndexingPipeline:
+    """Chunks in a process pool, embeds in batches, and writes from one thread.
+
+    Stages are joined by bounded queues so they overlap while memory stays
+    bounded: chunking runs on ``workers`` processes with at most
+    ``2 * workers`` batches in flight, embedding runs on its own thread, and
+    a single writer inserts into the collection.
+    """
+
+    def __init__(
+        self,
+        store: EmbeddingStore,
+        chunker: DocumentChunker,
+        workers: int = None,
+        docs_per_task: int = 32,
+        embed_batch_size: int = 256,
+        queue_size: int = 4,
+    ):
+        """Initialize pipeline.
+
+        Args:
+            store: EmbeddingStore with a collection to write into
+            chunker: Chunker sent to each worker process
+            workers: Chunking processes (defaults to CPU count)
+            docs_per_task: Documents per chunking task
+            embed_batch_size: Chunks per embedding call and collection write,
+                clamped to the store's maximum batch size like ``BatchIngestor``
+            queue_size: Batches buffered between stages
+        """
+        self.store = store
+        self.chunker = chunker
+        self.workers = workers or os.cpu_count() or 1
+        self.docs_per_task = docs_per_task
+        self.embed_batch_size = max(1, min(embed_batch_size, store.max_batch_size()))
+        self.queue_size = queue_size
+        self.stats = {}
+
+    def run(self, documents: Iterable[Dict]) -> Dict[str, Any]:
+        """Incrementally index a stream of documents.
+
+        Chunks are keyed by content hash; only chunks missing from the
+        collection manifest are embedded and written, and stale ones are
+        deleted at the end (see ``EmbeddingStore.sync_documents``).
+
+        Args:
+            documents: Iterable of document dictionaries
+
+        Returns:
+            Per-stage statistics (items, busy seconds, items per second)
+        """
+        self.stats = {name: {"items": 0, "seconds": 0.0} for name in ("chunk", "embed", "write")}
+        embed_queue = queue.Queue(maxsize=self.queue_size)
+        write_queue = queue.Queue(maxsize=self.queue_size)
+        errors = []
+        manifest = self.store.load_manifest()
+
+        embedder = threading.Thread(target=self._embed_stage, args=(embed_queue, write_queue, errors))
+        writer = threading.Thread(target=self._write_stage, args=(write_queue, errors))
+        embedder.start()
+        writer.start()
+
+        start = time.perf_counter()
+        try:
+            try:
+                chunks = self.store.new_chunks(self._chunk_stage(documents), manifest)
+                for batch in batched(chunks, self.embed_batch_size):
+                    if errors:
+                        break
+                    embed_queue.put(batch)
+            finally:
+                embed_queue.put(_DONE)
+                embedder.join()
+                writer.join()
+
+            if errors:
+                raise errors[0]
+
+            self.stats["deleted"] = self.store.prune_stale(manifest)
+            self.stats["unchanged"] = manifest.seen() - self.stats["write"]["items"]
+            self.store.save()
+            manifest.save()
+        finally:
+            manifest.close()
+        self.stats["wall_seconds"] = time.perf_counter() - start
+        for name in ("chunk", "embed", "write"):
+            stage = self.stats[name]
+            stage["per_second"] = stage["items"] / stage["seconds"] if stage["seconds"] else 0.0
+        return self.stats
+
+    def _chunk_stage(self, documents: Iterable[Dict]) -> Iterator[Dict[str, Any]]:
+        """Chunk documents on the process pool, yielding chunks in order."""
+        stage = self.stats["chunk"]
+        tasks = batched(documents, self.docs_per_task)
+
+        with ProcessPoolExecutor(
+            self.workers, initializer=_init_worker, initargs=(self.chunker,)
+        ) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(_chunk_batch, task))
+                if len(pending) < 2 * self.workers:
+                    continue
+                yield from self._drain(pending.popleft(), stage)
+            while pending:
+                yield from self._drain(pending.popleft(), stage)
+
+    @staticmethod
+    def _drain(future, stage: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Wait for one chunking task and record its timing."""
+        chunks, seconds = future.result()
+        stage["seconds"] += seconds
+        stage["items"] += len(chunks)
+        return chunks
+
+    def _embed_stage(self, inbox: queue.Queue, outbox: queue.Queue, errors: List):
+        """Embed batches of chunks and forward them to the writer."""
+        stage = self.stats["embed"]
+        try:
+            while (batch := inbox.get()) is not _DONE:
+                if errors:
+                    continue
+                start = time.perf_counter()
+                embeddings = self.store.embed([chunk["content"] for _, chunk in batch])
+                stage["seconds"] += time.perf_counter() - start
+                stage["items"] += len(batch)
+                outbox.put((batch, embeddings))
+        except Exception as e:
+            errors.append(e)
+            while inbox.get() is not _DONE:
+                pass
+        finally:
+            outbox.put(_DONE)
+
+    def _write_stage(self, inbox: queue.Queue, errors: List):
+        """Upsert embedded batches into the collection (single writer)."""
+        stage = self.stats["write"]
+        while (item := inbox.get()) is not _DONE:
+            if errors:
+                continue
+            try:
+                batch, embeddings = item
+                ids = [chunk_id for chunk_id, _ in batch]
+                start = time.perf_counter()
+                self.store._add_batch(
+                    [chunk for _, chunk in batch], embeddings, ids=ids, upsert=True
+                )
+                stage["seconds"] += time.perf_counter() - start
+                stage["items"] += len(batch)
+            except Exception as e:
+                errors.append(e)
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """Render pipeline statistics as one line per stage."""
+    lines = []
+    for name in ("chunk", "embed", "write"):
+        stage = stats[name]
+        lines.append(
+            f"  {name:<6} {stage['items']:>8} items  {stage['seconds']:8.3f}s busy  "
+            f"{stage['per_second']:10.1f}/s"
+        )
+    lines.append(f"  unchanged {stats['unchanged']}  deleted {stats['deleted']}")
+    lines.append(f"  wall   {stats['wall_seconds']:.3f}s")
+    return "\n".join(lines)
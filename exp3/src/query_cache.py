@@ -0,0 +1,160 @@
+"""Result cache in front of a retrieval mode: exact LRU plus a semantic tier."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from embeddings import EmbeddingStore
+from numpy_collection import normalize
+from retrieval import RetrievalMode
+from timing import span
+
+
+class CachedMode(RetrievalMode):
+    """Serves repeated (or, optionally, paraphrased) queries from memory.
+
+    Entries expire after ``ttl_seconds`` and the least recently used one is
+    evicted beyond ``max_entries``. The whole cache is dropped when the
+    store's ``version`` changes. With ``semantic_threshold`` set, a miss is
+    embedded and matched against cached query vectors by cosine similarity.
+    Safe to call from several threads.
+    """
+
+    def __init__(
+        self,
+        mode: RetrievalMode,
+        store: EmbeddingStore,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        semantic_threshold: Optional[float] = None,
+    ):
+        """Initialize cache.
+
+        Args:
+            mode: Retrieval mode whose results are cached
+            store: Store the mode searches (its version invalidates the cache)
+            max_entries: Cached queries kept before LRU eviction
+            ttl_seconds: Lifetime of an entry
+            semantic_threshold: Minimum cosine similarity for a semantic hit
+                (None disables the semantic tier)
+        """
+        self.mode = mode
+        self.store = store
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.semantic_threshold = semantic_threshold
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.version = store.version
+        self.counts = {"exact": 0, "semantic": 0, "miss": 0, "evicted": 0, "expired": 0}
+        self._lock = threading.Lock()
+
+    def retrieve(self, query: str) -> tuple[List[Dict], float]:
+        """Retrieve documents, from the cache when possible."""
+        batch, elapsed = self.retrieve_many([query])
+        return batch[0], elapsed
+
+    def retrieve_many(self, queries: List[str]) -> tuple[List[List[Dict]], float]:
+        """Answer cached queries and forward the rest as one batch.
+
+        ``last_stages`` records ``cache`` = exact, semantic or miss per query.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Tuple of (documents per query, total retrieval_time)
+        """
+        with span("cached") as timed:
+            documents, stages = self._retrieve_many(queries)
+        self.last_stages = stages
+        return documents, timed.seconds
+
+    def _retrieve_many(self, queries: List[str]) -> tuple[List[List[Dict]], List[Dict[str, Any]]]:
+        """Serve queries from the cache tiers, forwarding misses to the mode."""
+        documents: List[Optional[List[Dict]]] = [None] * len(queries)
+        stages = [{"cache": "miss"} for _ in queries]
+
+        with self._lock, span("cache_lookup"):
+            self._expire()
+            for i, query in enumerate(queries):
+                entry = self.entries.get(query)
+                if entry:
+                    self.entries.move_to_end(query)
+                    documents[i], stages[i]["cache"] = entry["documents"], "exact"
+
+        vectors = {}
+        if self.semantic_threshold is not None:
+            pending = [i for i, docs in enumerate(documents) if docs is None]
+            embedded = self.store.embed([queries[i] for i in pending]) if pending else []
+            for i, vector in zip(pending, embedded):
+                vectors[i] = vector
+                with self._lock:
+                    match = self._nearest(vector)
+                if match:
+                    documents[i], stages[i]["cache"] = match["documents"], "semantic"
+
+        first: Dict[str, int] = {}
+        for i, docs in enumerate(documents):
+            if docs is None:
+                first.setdefault(queries[i], i)
+        misses = list(first.values())
+        if misses:
+            fetched, _ = self.mode.retrieve_many([queries[i] for i in misses])
+            inner_stages = self.mode.last_stages or [{} for _ in misses]
+            with self._lock:
+                for i, docs, inner in zip(misses, fetched, inner_stages):
+                    documents[i] = docs
+                    stages[i].update(inner)
+                    self._store(queries[i], docs, vectors.get(i))
+        for i, docs in enumerate(documents):
+            if docs is None:
+                documents[i], stages[i]["cache"] = documents[first[queries[i]]], "exact"
+
+        with self._lock:
+            for stage in stages:
+                self.counts[stage["cache"]] += 1
+        return documents, stages
+
+    def _expire(self):
+        """Drop everything on a store change, then entries past their TTL."""
+        if self.store.version != self.version:
+            self.entries.clear()
+            self.version = self.store.version
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [query for query, entry in self.entries.items() if entry["created"] < cutoff]
+        for query in expired:
+            del self.entries[query]
+        self.counts["expired"] += len(expired)
+
+    def _nearest(self, vector) -> Optional[Dict[str, Any]]:
+        """Cached entry whose query vector is most similar above the threshold."""
+        candidates = [entry for entry in self.entries.values() if entry["vector"] is not None]
+        if not candidates:
+            return None
+        similarities = np.stack([entry["vector"] for entry in candidates]) @ normalize(vector)[0]
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.semantic_threshold:
+            return None
+        return candidates[best]
+
+    def _store(self, query: str, documents: List[Dict], vector):
+        """Insert an entry and evict the least recently used beyond capacity."""
+        self.entries[query] = {
+            "documents": documents,
+            "vector": normalize(vector)[0] if vector is not None else None,
+            "created": time.monotonic(),
+        }
+        self.entries.move_to_end(query)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.counts["evicted"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counts since the cache was created."""
+        lookups = self.counts["exact"] + self.counts["semantic"] + self.counts["miss"]
+        hits = self.counts["exact"] + self.counts["semantic"]
+        return {**self.counts, "entries": len(self.entries),
+                "hit_rate": hits / lookups if lookups else 0.0}
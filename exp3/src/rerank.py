@@ -0,0 +1,232 @@
+"""Second-stage reranking of over-fetched candidates under a latency budget."""
+
+import logging
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+from embeddings import EmbeddingStore
+from lexical import hebrew_terms
+from retrieval import RAGMode
+from timing import span
+
+try:
+    from sentence_transformers import CrossEncoder
+    CROSS_ENCODER_AVAILABLE = True
+except ImportError:
+    CROSS_ENCODER_AVAILABLE = False
+
+DEFAULT_CROSS_ENCODER = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+
+logger = logging.getLogger(__name__)
+
+
+class LexicalOverlapScorer:
+    """Dependency-free scorer: fraction of query terms found in the passage."""
+
+    name = "lexical"
+
+    def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score ``(query, passage)`` pairs; higher is more relevant."""
+        scores = []
+        for query, passage in pairs:
+            query_terms = set(hebrew_terms(query))
+            passage_terms = set(hebrew_terms(passage))
+            scores.append(len(query_terms & passage_terms) / len(query_terms) if query_terms else 0.0)
+        return scores
+
+
+def model_cached(model_name: str) -> bool:
+    """Whether ``model_name`` is a local path or already in the Hugging Face cache."""
+    if Path(model_name).exists():
+        return True
+    from huggingface_hub import try_to_load_from_cache
+    return isinstance(try_to_load_from_cache(model_name, "config.json"), str)
+
+
+class CrossEncoderScorer:
+    """Local cross-encoder scorer (requires ``sentence-transformers``)."""
+
+    def __init__(self, model_name: str = DEFAULT_CROSS_ENCODER, allow_download: bool = False):
+        """Load a cross-encoder model.
+
+        Args:
+            model_name: Hugging Face model name or local path
+            allow_download: Fetch the model if it is not cached locally;
+                otherwise a missing model raises ``OSError``
+        """
+        if not CROSS_ENCODER_AVAILABLE:
+            raise ImportError(
+                "sentence-transformers is not installed. "
+                "Install with: pip install sentence-transformers"
+            )
+        if not allow_download and not model_cached(model_name):
+            raise OSError(
+                f"Cross-encoder {model_name} is not available offline. "
+                "Download it first or pass allow_download=True"
+            )
+        self.model = CrossEncoder(model_name)
+        self.name = model_name
+
+    def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score ``(query, passage)`` pairs; higher is more relevant."""
+        return [float(score) for score in self.model.predict(pairs)]
+
+
+def default_scorer(cross_encoder: bool = False, allow_download: bool = False):
+    """Return the lexical scorer, or a cross-encoder when asked for.
+
+    The cross-encoder is opt-in. If ``sentence-transformers`` is missing or
+    the model is not available offline (and ``allow_download`` is off), a
+    warning is logged and the lexical scorer is used instead; the scorer's
+    ``name`` tells which one actually runs.
+    """
+    if cross_encoder:
+        try:
+            return CrossEncoderScorer(allow_download=allow_download)
+        except (ImportError, OSError) as e:
+            logger.warning("Cross-encoder unavailable, reranking lexically: %s", e)
+    return LexicalOverlapScorer()
+
+
+class Reranker:
+    """Reranks many queries' candidates in shared batches, each under its own budget.
+
+    Every query may spend ``budget_ms`` of scorer time; a batch's time is
+    charged to its queries per pair. Each batch is filled from the queries
+    still within budget, in order, each contributing at most the pairs its
+    remaining budget affords at the time per pair measured so far (the
+    first call probes the scorer with a single pair). A slow query thus
+    overruns its own budget by about one pair at most and never spends
+    another query's. Queries not fully scored in time keep their
+    first-stage order.
+    """
+
+    def __init__(self, scorer=None, budget_ms: float = 50.0, batch_size: int = 32):
+        """Initialize reranker.
+
+        Args:
+            scorer: Object with ``score(pairs) -> List[float]``
+            budget_ms: Per-query latency budget in milliseconds
+            batch_size: ``(query, passage)`` pairs per scoring call
+        """
+        self.scorer = scorer or default_scorer()
+        self.budget_ms = budget_ms
+        self.batch_size = batch_size
+        self.seconds_per_pair: Optional[float] = None
+
+    def rerank_many(
+        self, queries: List[str], candidates: List[List[Dict]], k: int
+    ) -> tuple[List[List[Dict]], List[bool]]:
+        """Reorder each query's candidates by scorer relevance.
+
+        Args:
+            queries: Query texts
+            candidates: First-stage documents per query, best first
+            k: Documents kept per query
+
+        Returns:
+            Tuple of (top-k documents per query, whether each was reranked)
+        """
+        budget = self.budget_ms / 1000.0
+        scores: List[List[float]] = [[] for _ in candidates]
+        spent = [0.0] * len(candidates)
+        active = [q for q, docs in enumerate(candidates) if docs]
+        while active:
+            part = self._next_batch(active, candidates, scores, spent, budget)
+            begin = time.perf_counter()
+            values = self.scorer.score([(queries[q], candidates[q][i]["content"]) for q, i in part])
+            self.seconds_per_pair = (time.perf_counter() - begin) / len(part)
+            for (q, _), value in zip(part, values):
+                scores[q].append(value)
+                spent[q] += self.seconds_per_pair
+            active = [q for q in active if len(scores[q]) < len(candidates[q]) and spent[q] < budget]
+
+        results, reranked = [], []
+        for docs, doc_scores in zip(candidates, scores):
+            complete = len(doc_scores) == len(docs)
+            order = range(len(docs))
+            if complete:
+                order = sorted(order, key=lambda i: doc_scores[i], reverse=True)
+            results.append([docs[i] for i in order][:k])
+            reranked.append(complete)
+        return results, reranked
+
+    def _next_batch(
+        self,
+        active: List[int],
+        candidates: List[List[Dict]],
+        scores: List[List[float]],
+        spent: List[float],
+        budget: float,
+    ) -> List[Tuple[int, int]]:
+        """Pick the ``(query, candidate)`` indices scored in the next call."""
+        room = 1 if self.seconds_per_pair is None else self.batch_size
+        part = []
+        for q in active:
+            done = len(scores[q])
+            take = len(candidates[q]) - done
+            if self.seconds_per_pair is not None:
+                take = min(take, max(1, int((budget - spent[q]) / self.seconds_per_pair)))
+            take = min(take, room - len(part))
+            part.extend((q, i) for i in range(done, done + take))
+            if len(part) == room:
+                break
+        return part
+
+
+class RerankedRAGMode(RAGMode):
+    """Two-stage RAG: over-fetch ``k * overfetch`` hits, then rerank to ``k``."""
+
+    def __init__(self, store: EmbeddingStore, reranker: Reranker, k: int = 3, overfetch: int = 4):
+        """Initialize reranked RAG mode.
+
+        Args:
+            store: EmbeddingStore instance
+            reranker: Second-stage Reranker
+            k: Number of documents to return
+            overfetch: Candidate multiplier for the first stage
+        """
+        super().__init__(store, k)
+        self.reranker = reranker
+        self.overfetch = overfetch
+
+    def retrieve(self, query: str) -> tuple[List[Dict], float]:
+        """Retrieve and rerank documents for a query."""
+        batch, elapsed = self.retrieve_many([query])
+        return batch[0], elapsed
+
+    def retrieve_many(self, queries: List[str]) -> tuple[List[List[Dict]], float]:
+        """Over-fetch for all queries in one search, then rerank in shared batches.
+
+        Per-query stage timings (batch time split evenly), context sizes and
+        the scorer that ran are left in ``last_stages``.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Tuple of (documents per query, total retrieval_time)
+        """
+        with span("reranked_rag") as timed:
+            with span("retrieve") as retrieved:
+                results = self.store.similarity_search_many(queries, k=self.k * self.overfetch)
+            candidates = [documents for documents, _ in results]
+            with span("rerank") as reranking:
+                documents, reranked = self.reranker.rerank_many(queries, candidates, self.k)
+
+        n = max(len(queries), 1)
+        self.last_stages = []
+        for docs, kept, done in zip(candidates, documents, reranked):
+            candidate_chars = sum(len(doc["content"]) for doc in docs)
+            kept_chars = sum(len(doc["content"]) for doc in kept)
+            self.last_stages.append({
+                "retrieve_seconds": retrieved.seconds / n,
+                "rerank_seconds": reranking.seconds / n,
+                "reranked": done,
+                "scorer": self.reranker.scorer.name,
+                "candidate_chars": candidate_chars,
+                "context_chars": kept_chars,
+                "saved_chars": candidate_chars - kept_chars,
+            })
+        return documents, timed.seconds
@@ -1,12 +1,32 @@
 """Retrieval strategies: RAG and full context modes."""
 
-import time
+import asyncio
+import threading
 from typing import List, Dict, Any
+from context_buffer import ContextBuffer
 from embeddings import EmbeddingStore
+from timing import span
 
 
 class RetrievalMode:
-    """Base class for retrieval modes."""
+    """Base class for retrieval modes.
+
+    Multi-stage modes leave one dict of per-stage timings and context sizes
+    per query of their last call in ``last_stages``. The attribute is
+    thread-local, so concurrent calls from worker threads do not clobber
+    each other's reports.
+    """
+
+    @property
+    def last_stages(self) -> List[Dict[str, Any]]:
+        return getattr(self._thread_state(), "stages", [])
+
+    @last_stages.setter
+    def last_stages(self, stages: List[Dict[str, Any]]):
+        self._thread_state().stages = stages
+
+    def _thread_state(self) -> threading.local:
+        return self.__dict__.setdefault("_local", threading.local())
 
     def retrieve(self, query: str) -> tuple[List[Dict], float]:
         """Retrieve documents for a query.
@@ -19,9 +39,48 @@ class RetrievalMode:
         """
         raise NotImplementedError
 
+    def retrieve_many(self, queries: List[str]) -> tuple[List[List[Dict]], float]:
+        """Retrieve documents for a batch of queries.
+
+        The default implementation calls ``retrieve`` per query; modes that
+        can vectorize the work override it.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Tuple of (documents per query, total retrieval_time)
+        """
+        results = [self.retrieve(query) for query in queries]
+        return [docs for docs, _ in results], sum(elapsed for _, elapsed in results)
+
+    async def aretrieve(self, query: str) -> tuple[List[Dict], float]:
+        """Async counterpart of ``retrieve``.
+
+        Runs ``retrieve`` in a worker thread so blocking store clients do
+        not stall the event loop; the call's ``last_stages`` are readable
+        right after the await. Modes with natively async stores override it.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Tuple of (documents, retrieval_time)
+        """
+        def run():
+            documents, elapsed = self.retrieve(query)
+            return documents, elapsed, self.last_stages
+
+        documents, elapsed, self.last_stages = await asyncio.to_thread(run)
+        return documents, elapsed
+
 
 class FullContextMode(RetrievalMode):
-    """Retrieval mode using all documents."""
+    """Retrieval mode using all documents.
+
+    The context is assembled once into an immutable ``ContextBuffer`` and
+    the same buffer is returned for every query.
+    """
 
     def __init__(self, all_documents: List[Dict[str, Any]]):
         """Initialize with all documents.
@@ -30,26 +89,24 @@ class FullContextMode(RetrievalMode):
             all_documents: List of all document chunks
         """
         self.all_documents = all_documents
+        self.context = ContextBuffer(all_documents)
 
-    def retrieve(self, query: str) -> tuple[List[Dict], float]:
+    def retrieve(self, query: str) -> tuple[ContextBuffer, float]:
         """Return all documents.
 
         Args:
             query: Query text (unused in full context mode)
 
         Returns:
-            Tuple of (all_documents, retrieval_time)
+            Tuple of (shared context buffer, retrieval_time)
         """
-        start = time.time()
-        context = [
-            {
-                "content": doc["content"],
-                "metadata": doc["metadata"],
-            }
-            for doc in self.all_documents
-        ]
-        elapsed = time.time() - start
-        return context, elapsed
+        with span("full_context") as timed:
+            context = self.context
+        return context, timed.seconds
+
+    def retrieve_many(self, queries: List[str]) -> tuple[List[ContextBuffer], float]:
+        """Return the shared context buffer once per query."""
+        return [self.context] * len(queries), 0.0
 
 
 class RAGMode(RetrievalMode):
@@ -74,10 +131,22 @@ class RAGMode(RetrievalMode):
         Returns:
             Tuple of (relevant_documents, retrieval_time)
         """
-        start = time.time()
-        documents, _ = self.store.similarity_search(query, k=self.k)
-        elapsed = time.time() - start
-        return documents, elapsed
+        with span("rag") as timed:
+            documents, _ = self.store.similarity_search(query, k=self.k)
+        return documents, timed.seconds
+
+    def retrieve_many(self, queries: List[str]) -> tuple[List[List[Dict]], float]:
+        """Retrieve similar documents for many queries in one batched search.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Tuple of (documents per query, total retrieval_time)
+        """
+        with span("rag") as timed:
+            results = self.store.similarity_search_many(queries, k=self.k)
+        return [documents for documents, _ in results], timed.seconds
 
 
 class RetrievalComparison:
@@ -108,7 +177,64 @@ class RetrievalComparison:
         """
         full_docs, full_time = self.full_mode.retrieve(query)
         rag_docs, rag_time = self.rag_mode.retrieve(query)
+        stages = self.rag_mode.last_stages[0] if self.rag_mode.last_stages else {}
+        return self._result(query, full_docs, full_time, rag_docs, rag_time, stages)
+
+    async def acompare(self, query: str) -> Dict[str, Any]:
+        """Run both retrieval modes for a query concurrently.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Dictionary with results from both modes
+        """
+        async def staged(mode: RetrievalMode):
+            documents, elapsed = await mode.aretrieve(query)
+            return documents, elapsed, mode.last_stages
+
+        (full_docs, full_time, _), (rag_docs, rag_time, stages) = await asyncio.gather(
+            staged(self.full_mode), staged(self.rag_mode)
+        )
+        return self._result(
+            query, full_docs, full_time, rag_docs, rag_time, stages[0] if stages else {}
+        )
+
+    def compare_many(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Compare both retrieval modes over a whole query set.
+
+        Each mode retrieves for all queries in one batch; per-query
+        ``retrieval_time`` is the batch time divided by the number of queries.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            One comparison dictionary per query, in input order
+        """
+        if not queries:
+            return []
+
+        full_batch, full_time = self.full_mode.retrieve_many(queries)
+        rag_batch, rag_time = self.rag_mode.retrieve_many(queries)
+        n = len(queries)
+        stages = self.rag_mode.last_stages or [{} for _ in queries]
+
+        return [
+            self._result(query, full_docs, full_time / n, rag_docs, rag_time / n, rag_stages)
+            for query, full_docs, rag_docs, rag_stages in zip(queries, full_batch, rag_batch, stages)
+        ]
 
+    @staticmethod
+    def _result(
+        query: str,
+        full_docs: List[Dict],
+        full_time: float,
+        rag_docs: List[Dict],
+        rag_time: float,
+        rag_stages: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
+        """Build the comparison dictionary for one query."""
         return {
             "query": query,
             "full_context": {
@@ -120,5 +246,6 @@ class RetrievalComparison:
                 "documents_count": len(rag_docs),
                 "retrieval_time": rag_time,
                 "documents": rag_docs,
+                "stages": rag_stages or {},
             },
         }
@@ -0,0 +1,149 @@
+"""Category routing: predict a query's domain and search only that partition."""
+
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from embeddings import EmbeddingStore
+from numpy_collection import normalize
+from retrieval import RAGMode
+from timing import span
+
+
+class CategoryRouter:
+    """Nearest-centroid classifier over chunk embeddings per category.
+
+    Queries whose best category does not beat the runner-up by
+    ``min_margin`` cosine similarity are left unrouted (searched globally).
+    """
+
+    def __init__(self, centroids: Dict[str, np.ndarray], min_margin: float = 0.02):
+        """Initialize router.
+
+        Args:
+            centroids: Category -> mean embedding
+            min_margin: Required similarity gap between top two categories
+        """
+        self.categories = sorted(centroids)
+        self.matrix = normalize([centroids[c] for c in self.categories])
+        self.min_margin = min_margin
+
+    @classmethod
+    def from_store(
+        cls, store: EmbeddingStore, min_margin: float = 0.02, page_size: int = 1000
+    ) -> "CategoryRouter":
+        """Build centroids from the vectors already stored in ``store``.
+
+        Stored embeddings are read in pages and summed per category, so
+        nothing is re-embedded and memory stays bounded by the page size.
+
+        Args:
+            store: EmbeddingStore whose chunks carry a ``category``
+            min_margin: Required similarity gap between top two categories
+            page_size: Records read per page
+
+        Returns:
+            CategoryRouter
+        """
+        sums: Dict[str, np.ndarray] = {}
+        counts: Dict[str, int] = defaultdict(int)
+        for embeddings, metadatas in store.iter_embeddings(page_size):
+            vectors = normalize(embeddings)
+            categories = np.array([meta["category"] for meta in metadatas])
+            for category in np.unique(categories):
+                rows = vectors[categories == category]
+                sums[str(category)] = sums.get(str(category), 0) + rows.sum(axis=0)
+                counts[str(category)] += len(rows)
+
+        centroids = {category: total / counts[category] for category, total in sums.items()}
+        return cls(centroids, min_margin)
+
+    def route(self, query_embeddings: List[Any]) -> List[Optional[str]]:
+        """Predict a category per query vector (None when uncertain)."""
+        if not self.categories:
+            return [None for _ in query_embeddings]
+
+        scores = normalize(query_embeddings) @ self.matrix.T
+        routes = []
+        for row in scores:
+            order = np.argsort(-row)
+            margin = row[order[0]] - row[order[1]] if len(order) > 1 else 1.0
+            routes.append(self.categories[order[0]] if margin >= self.min_margin else None)
+        return routes
+
+
+class RoutedRAGMode(RAGMode):
+    """RAG that routes each query to a category and searches only that partition."""
+
+    def __init__(self, store: EmbeddingStore, router: CategoryRouter, k: int = 3):
+        """Initialize routed RAG mode.
+
+        Args:
+            store: EmbeddingStore instance
+            router: CategoryRouter used to pick a partition
+            k: Number of documents to retrieve
+        """
+        super().__init__(store, k)
+        self.router = router
+
+    def retrieve(self, query: str) -> tuple[List[Dict], float]:
+        """Retrieve similar documents from the query's predicted category.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Tuple of (relevant_documents, retrieval_time)
+        """
+        batch, elapsed = self.retrieve_many([query])
+        return batch[0], elapsed
+
+    def retrieve_many(self, queries: List[str]) -> tuple[List[List[Dict]], float]:
+        """Route all queries, then run one filtered search per category.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Tuple of (documents per query, total retrieval_time)
+        """
+        documents, _, elapsed = self.retrieve_routed(queries)
+        return documents, elapsed
+
+    def retrieve_routed(
+        self, queries: List[str]
+    ) -> tuple[List[List[Dict]], List[Optional[str]], float]:
+        """Like ``retrieve_many``, also returning each query's predicted category.
+
+        Routes are returned rather than stored on the mode, so concurrent
+        callers sharing one mode do not see each other's routes.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Tuple of (documents per query, category per query or None, total retrieval_time)
+        """
+        with span("routed_rag") as timed:
+            with span("embed"):
+                vectors = self.store.embed(list(queries))
+            with span("route"):
+                routes = self.router.route(vectors)
+
+            groups = defaultdict(list)
+            for i, category in enumerate(routes):
+                groups[category].append(i)
+
+            documents = [None] * len(queries)
+            for category, indices in groups.items():
+                results = self.store.similarity_search_many(
+                    [queries[i] for i in indices],
+                    k=self.k,
+                    where={"category": category} if category else None,
+                    query_embeddings=[vectors[i] for i in indices],
+                )
+                for i, (docs, _) in zip(indices, results):
+                    documents[i] = docs
+
+        return documents, routes, timed.seconds
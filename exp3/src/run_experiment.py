@@ -1,5 +1,7 @@
 """Main experiment runner script."""
 
+import argparse
+import contextlib
 import json
 from pathlib import Path
 import sys
@@ -7,10 +9,14 @@ import io
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-from chunking import DocumentChunker
-from embeddings import EmbeddingStore
-from retrieval import FullContextMode, RAGMode, RetrievalComparison
+from analysis import ResultsAnalyzer
+from answering import AnswerStage, MessagesClient
+from async_runner import run_concurrently
+from experiment_setup import STORE_BACKENDS, setup_experiment
+from retrieval import RetrievalComparison
 from evaluation import Evaluator
+from mock_llm_server import MockLLMServer
+from tokens import default_tokenizer
 
 
 def load_queries() -> list[dict]:
@@ -18,81 +24,173 @@ def load_queries() -> list[dict]:
     return [
         {
             "query": "מה הן תופעות הלוואי של תרופה X?",
-            "category": "medicine"
+            "category": "medicine",
+            "answer_keywords": ["כאבי ראש", "בחילות"],
         },
         {
             "query": "מה הם זכויות הצרכן?",
-            "category": "law"
+            "category": "law",
+            "answer_keywords": ["החזר כסף", "החלפת המוצר"],
         },
         {
             "query": "איך טכנולוגיית ענן מגנה על נתונים?",
-            "category": "technology"
+            "category": "technology",
+            "answer_keywords": ["מקצה לקצה"],
         },
         {
             "query": "איך מטפלים בסוכרת?",
-            "category": "medicine"
+            "category": "medicine",
+            "answer_keywords": ["תזונה"],
         },
         {
             "query": "מה הם חוקי הגירושין בישראל?",
-            "category": "law"
+            "category": "law",
+            "answer_keywords": ["בית דין רבני"],
         },
     ]
 
 
-def setup_experiment():
-    """Initialize experiment components."""
-    print("Loading and chunking documents...")
-    chunker = DocumentChunker(chunk_size=500, overlap=50)
-    chunked_docs = chunker.load_and_chunk("data/documents.json")
-    print(f"Created {len(chunked_docs)} chunks")
+def format_stages(stages: dict) -> str:
+    """Render a mode's per-query stage report on one line."""
+    return ", ".join(
+        f"{key[:-8]} {value * 1000:.1f} ms" if key.endswith("_seconds") else f"{key} {value}"
+        for key, value in stages.items()
+    )
 
-    print("Creating vector store...")
-    store = EmbeddingStore(persist_dir="./chroma_db")
-    store.create_collection("documents")
-    store.add_documents(chunked_docs)
-    print("Vector store ready")
 
-    all_documents = store.get_all_documents()
+def print_query_result(idx: int, query: str, result: dict, metrics: dict):
+    """Print one query's comparison."""
+    print(f"Query {idx}: {query[:50]}...")
+    print(f"  Full Context: {metrics['full_context']['doc_count']} docs, "
+          f"{metrics['full_context']['context_size']} chars, "
+          f"{metrics['full_context']['context_tokens']} tokens, "
+          f"{metrics['full_context']['relevance_score']:.2f} relevance")
+    print(f"  RAG: {metrics['rag']['doc_count']} docs, "
+          f"{metrics['rag']['context_size']} chars, "
+          f"{metrics['rag']['context_tokens']} tokens, "
+          f"{metrics['rag']['relevance_score']:.2f} relevance")
+    stages = result["rag"]["stages"]
+    if stages:
+        print(f"  Stages: {format_stages(stages)}")
+    for mode, label in (("full_context", "Full Context"), ("rag", "RAG")):
+        answer = metrics[mode].get("answer")
+        if answer:
+            print(f"  {label} answer: TTFT {answer['ttft_ms']:.0f} ms, "
+                  f"total {answer['latency_ms']:.0f} ms, "
+                  f"{answer['input_tokens']} in / {answer['output_tokens']} out tokens, "
+                  f"{answer['correctness']:.2f} correctness")
+    print(f"  Size reduction: {metrics['comparison']['size_reduction']:.1f}%\n")
 
-    full_mode = FullContextMode(all_documents)
-    rag_mode = RAGMode(store, k=3)
 
-    return RetrievalComparison(full_mode, rag_mode), all_documents
+def run_queries(
+    comparison: RetrievalComparison,
+    evaluator: Evaluator,
+    queries: list[dict],
+    batch: bool = False,
+    concurrency: int = 1,
+    answer_stage: AnswerStage = None,
+):
+    """Compare, optionally answer, and evaluate every query.
 
+    Args:
+        comparison: RetrievalComparison holding both modes
+        evaluator: Evaluator receiving each result
+        queries: Query dicts from ``load_queries``
+        batch: Retrieve for the whole query set in one batched search
+        concurrency: Queries in flight at once (asyncio runner above 1)
+        answer_stage: Optional AnswerStage generating answers per result
 
-def run_experiment():
-    """Run the complete experiment."""
-    print("=" * 60)
-    print("RAG vs Full Context Comparison Experiment")
-    print("=" * 60)
-
-    comparison, all_docs = setup_experiment()
-    evaluator = Evaluator()
-    queries = load_queries()
+    Raises:
+        ValueError: If ``batch`` is combined with ``concurrency`` above 1
+    """
+    if batch and concurrency > 1:
+        raise ValueError("batch retrieval runs sequentially; use concurrency=1")
+    if concurrency > 1:
+        run_concurrently(
+            comparison, evaluator, queries, concurrency,
+            on_result=print_query_result, answer_stage=answer_stage,
+        )
+        return
 
-    print(f"\nRunning {len(queries)} test queries...\n")
+    batch_results = None
+    if batch:
+        batch_results = comparison.compare_many([q["query"] for q in queries])
 
     for idx, q_data in enumerate(queries, 1):
         query = q_data["query"]
-        category = q_data["category"]
-
-        print(f"Query {idx}: {query[:50]}...")
-
-        result = comparison.compare(query)
+        if batch_results:
+            result = batch_results[idx - 1]
+        else:
+            result = comparison.compare(query)
+        answers = None
+        if answer_stage:
+            answers = answer_stage.answer_result(result, q_data.get("answer_keywords"))
         metrics = evaluator.evaluate_result(
             query,
             result["full_context"],
             result["rag"],
-            expected_category=category
+            expected_category=q_data["category"],
+            answers=answers,
         )
+        print_query_result(idx, query, result, metrics)
+
 
-        print(f"  Full Context: {metrics['full_context']['doc_count']} docs, "
-              f"{metrics['full_context']['context_size']} chars, "
-              f"{metrics['full_context']['relevance_score']:.2f} relevance")
-        print(f"  RAG: {metrics['rag']['doc_count']} docs, "
-              f"{metrics['rag']['context_size']} chars, "
-              f"{metrics['rag']['relevance_score']:.2f} relevance")
-        print(f"  Size reduction: {metrics['comparison']['size_reduction']:.1f}%\n")
+def run_experiment(
+    workers: int = 1,
+    batch: bool = False,
+    backend: str = "chroma",
+    route: bool = False,
+    hybrid: bool = False,
+    rerank: str = None,
+    token_budget: int = None,
+    cache: bool = False,
+    passes: int = 1,
+    concurrency: int = 1,
+    answer: bool = False,
+    llm_url: str = None,
+):
+    """Run the complete experiment.
+
+    Args:
+        workers: Chunking processes used during setup
+        batch: Retrieve for the whole query set in one batched search
+        backend: Vector store backend ("chroma" or "numpy")
+        route: Use category-routed RAG instead of a global search
+        hybrid: Use BM25 + dense hybrid retrieval
+        rerank: Use two-stage retrieval with this reranking scorer
+        token_budget: Use token-budgeted context packing
+        cache: Cache RAG results across queries
+        passes: Times the query set is run (repeats exercise the cache)
+        concurrency: Queries in flight at once; above 1 both modes also run
+            concurrently per query and results are evaluated as they complete
+        answer: Generate an answer from each mode's context and score it
+        llm_url: Messages API root used for answers; a local mock server
+            is started when omitted
+    """
+    print("=" * 60)
+    print("RAG vs Full Context Comparison Experiment")
+    print("=" * 60)
+
+    comparison, all_docs = setup_experiment(
+        workers=workers, backend=backend, route=route, hybrid=hybrid, rerank=rerank,
+        token_budget=token_budget, cache=cache,
+    )
+    evaluator = Evaluator(tokenizer=default_tokenizer())
+    queries = load_queries() * passes
+
+    print(f"\nRunning {len(queries)} test queries...\n")
+
+    with contextlib.ExitStack() as stack:
+        answer_stage = None
+        if answer:
+            if not llm_url:
+                llm_url = stack.enter_context(MockLLMServer()).url
+            client = MessagesClient(base_url=llm_url)
+            stack.callback(client.close)
+            answer_stage = AnswerStage(client)
+            print(f"Answering with {llm_url}")
+
+        run_queries(comparison, evaluator, queries, batch, concurrency, answer_stage)
 
     print("=" * 60)
     print("Aggregate Results")
@@ -105,13 +203,69 @@ def run_experiment():
         else:
             print(f"{key}: {value}")
 
+    if cache:
+        stats = comparison.rag_mode.stats()
+        print(f"query_cache: {stats['exact']} exact hits, {stats['semantic']} semantic hits, "
+              f"{stats['miss']} misses ({stats['hit_rate']:.1%} hit rate)")
+
+    embedding_cache = comparison.rag_mode.store.embedding_cache
+    if embedding_cache:
+        stats = embedding_cache.stats()
+        print(f"embedding_cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.1%} hit rate), {stats['entries']} entries")
+
+    print("\nLatency by stage:")
+    print(ResultsAnalyzer().latency_table(evaluator.latency_report()["stages"]), end="")
+
     evaluator.save_results("results.json")
-    print("\nResults saved to results.json")
+    evaluator.save_latency("latency.json")
+    print("\nResults saved to results.json, latency percentiles to latency.json")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="chunking processes for the indexing pipeline")
+    parser.add_argument("--batch", action="store_true",
+                        help="embed and search all queries in one batched call")
+    parser.add_argument("--backend", choices=sorted(STORE_BACKENDS), default="chroma",
+                        help="vector store: Chroma HNSW or exact NumPy search")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--route", action="store_true",
+                      help="route each query to its predicted category before searching")
+    mode.add_argument("--hybrid", action="store_true",
+                      help="fuse BM25 keyword and dense results (reciprocal rank fusion)")
+    mode.add_argument("--rerank", nargs="?", const="lexical", choices=["lexical", "cross-encoder"],
+                      help="over-fetch candidates and rerank them under a latency budget "
+                           "(falls back to lexical if the cross-encoder is not downloaded)")
+    mode.add_argument("--token-budget", type=int, metavar="TOKENS",
+                      help="pack retrieved chunks into a token budget instead of k=3")
+    parser.add_argument("--cache", action="store_true",
+                        help="cache RAG results (exact match plus semantic near-duplicates)")
+    parser.add_argument("--passes", type=int, default=1,
+                        help="run the query set this many times")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="queries evaluated concurrently (asyncio runner; not with --batch)")
+    parser.add_argument("--answer", action="store_true",
+                        help="generate and score an answer from each mode's context")
+    parser.add_argument("--llm-url", metavar="URL",
+                        help="Messages API root for --answer (default: local mock server)")
+    args = parser.parse_args(argv)
+    if args.batch and args.concurrency > 1:
+        parser.error("--batch cannot be combined with --concurrency above 1")
+    return args
 
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        run_experiment()
+        run_experiment(
+            workers=args.workers, batch=args.batch, backend=args.backend,
+            route=args.route, hybrid=args.hybrid, rerank=args.rerank,
+            token_budget=args.token_budget, cache=args.cache, passes=args.passes,
+            concurrency=args.concurrency, answer=args.answer, llm_url=args.llm_url,
+        )
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,156 @@
+"""Scale benchmark: index time, query latency and memory vs corpus size.
+
+For each scale a synthetic corpus (``synthetic.py``) is generated, then
+chunked with ``DocumentChunker`` and indexed into a vector store in a fresh
+process, so peak RSS is measured per scale. Planted-fact queries give
+recall: a query hits when its fact's document is among the top k.
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any
+
+from analysis import ResultsAnalyzer
+from chunking import DocumentChunker
+from embeddings import EmbeddingStore
+from hnsw_benchmark import directory_size
+from numpy_store import NumpyEmbeddingStore
+from synthetic import generate_corpus, iter_queries
+from timing import LatencyHistogram
+
+SCALES = [1_000, 10_000, 100_000]
+STORE_CLASSES = {"chroma": EmbeddingStore, "numpy": NumpyEmbeddingStore}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_scale(corpus_dir: str, store_dir: str, backend: str = "chroma", k: int = 3) -> Dict[str, Any]:
+    """Chunk, index and query one corpus; meant to run in its own process.
+
+    Args:
+        corpus_dir: Directory written by ``synthetic.generate_corpus``
+        store_dir: Scratch persist directory for the vector store
+        backend: Key of ``STORE_CLASSES``
+        k: Documents retrieved per query
+
+    Returns:
+        Result row with timings, sizes, latency percentiles and recall
+    """
+    shutil.rmtree(store_dir, ignore_errors=True)
+    chunker = DocumentChunker(chunk_size=500, overlap=50)
+    baseline_mb = peak_rss_mb()
+
+    start = time.perf_counter()
+    chunks = chars = 0
+    for record in chunker.stream_chunks(corpus_dir):
+        chunks += 1
+        chars += record.end - record.start
+    chunk_seconds = time.perf_counter() - start
+
+    store = STORE_CLASSES[backend](persist_dir=store_dir)
+    store.create_collection("scale")
+    start = time.perf_counter()
+    store.sync_documents(chunker.stream_chunks(corpus_dir))
+    index_seconds = time.perf_counter() - start
+
+    latency = LatencyHistogram()
+    hits = 0
+    queries = list(iter_queries(corpus_dir))
+    for query in queries:
+        begin = time.perf_counter_ns()
+        documents, _ = store.similarity_search(query["query"], k=k)
+        latency.record(time.perf_counter_ns() - begin)
+        hits += any(str(doc["metadata"]["doc_id"]) == str(query["doc_id"]) for doc in documents)
+
+    with open(Path(corpus_dir) / "manifest.json", "r", encoding="utf-8") as f:
+        documents = json.load(f)["documents"]
+    return {
+        "documents": documents,
+        "chunks": chunks,
+        "corpus_chars": chars,
+        "backend": backend,
+        "chunk_seconds": chunk_seconds,
+        "index_seconds": index_seconds,
+        "index_bytes": directory_size(Path(store_dir)),
+        "baseline_rss_mb": baseline_mb,
+        "peak_rss_mb": peak_rss_mb(),
+        "latency": latency.summary(),
+        "recall_at_k": hits / len(queries) if queries else 0.0,
+        "k": k,
+    }
+
+
+def run_scale_benchmark(
+    scales: List[int] = None,
+    backend: str = "chroma",
+    k: int = 3,
+    workdir: str = "./scale_bench",
+    seed: int = 0,
+    num_queries: int = 100,
+) -> List[Dict[str, Any]]:
+    """Generate a corpus per scale and benchmark each in a spawned process.
+
+    Args:
+        scales: Corpus sizes in documents (defaults to ``SCALES``)
+        backend: Vector store backend
+        k: Documents retrieved per query
+        workdir: Scratch directory for corpora and stores
+        seed: Corpus generator seed
+        num_queries: Planted-fact queries per scale
+
+    Returns:
+        One result row per scale
+    """
+    workdir = Path(workdir)
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    for scale in scales or SCALES:
+        corpus_dir = workdir / f"corpus-{scale}"
+        start = time.perf_counter()
+        generate_corpus(str(corpus_dir), scale, seed=seed, num_queries=num_queries)
+        generate_seconds = time.perf_counter() - start
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            row = executor.submit(
+                benchmark_scale, str(corpus_dir), str(workdir / f"store-{scale}"), backend, k
+            ).result()
+        row["generate_seconds"] = generate_seconds
+        rows.append(row)
+        print(f"{scale} documents: {row['chunks']} chunks, indexed in {row['index_seconds']:.1f}s, "
+              f"p95 {row['latency']['p95_ms']:.2f} ms, peak {row['peak_rss_mb']:.0f} MB")
+    return rows
+
+
+def main(argv=None):
+    """Run the benchmark and report it."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--backend", choices=sorted(STORE_CLASSES), default="chroma")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--workdir", default="./scale_bench")
+    parser.add_argument("--output", default="scale_results.json")
+    args = parser.parse_args(argv)
+
+    rows = run_scale_benchmark(args.scales, args.backend, args.k, args.workdir, args.seed, args.queries)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2)
+
+    analyzer = ResultsAnalyzer()
+    print(analyzer.scale_table(rows))
+    analyzer.create_scale_chart(rows, "charts/scale.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Deterministic synthetic corpus with planted facts for scale testing.
+
+Every document is generated from ``(seed, doc_id)`` alone, so any shard can
+be produced by any process and a corpus of N documents is a prefix of one
+of 10N. Each document plants one fact (a unique entity's approval number),
+which gives every document a matching query with a known answer.
+
+Run with ``python src/synthetic.py --documents 100000 --output data/synthetic``.
+"""
+
+import argparse
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Dict, Any
+
+SHARD_PATTERN = "docs-{:05d}.jsonl"
+SYLLABLES = ["בר", "גל", "דן", "זו", "חן", "טל", "כר", "לי", "מו", "נע", "סה", "פז", "צו", "קר", "רם", "שי"]
+
+VOCABULARY = {
+    "medicine": {
+        "entity": "תרופה",
+        "subjects": ["המטופל", "הרופא", "הטיפול", "המחקר הקליני", "האחות", "המינון"],
+        "verbs": ["מפחית", "מגביר", "מונע", "מאבחן", "מלווה", "משפר"],
+        "objects": ["לחץ דם", "כאבי ראש", "רמת סוכר", "דלקת כרונית", "תופעות לוואי", "ספיגת ויטמינים"],
+    },
+    "law": {
+        "entity": "חוק",
+        "subjects": ["בית המשפט", "הצרכן", "המעסיק", "עורך הדין", "החוזה", "הרגולטור"],
+        "verbs": ["מחייב", "מתיר", "אוסר", "מגדיר", "מבטל", "מסדיר"],
+        "objects": ["החזר כספי", "פיצויי פיטורים", "זכויות יוצרים", "תקופת התיישנות", "הסכם ממון", "ביטול עסקה"],
+    },
+    "technology": {
+        "entity": "מערכת",
+        "subjects": ["השרת", "האלגוריתם", "מסד הנתונים", "הרשת", "המעבד", "שירות הענן"],
+        "verbs": ["מצפין", "מאחסן", "מעבד", "מסנכרן", "מגבה", "מאמת"],
+        "objects": ["נתוני משתמשים", "תעבורת רשת", "מפתחות הצפנה", "יומני מערכת", "בקשות API", "גיבויים יומיים"],
+    },
+}
+CATEGORIES = sorted(VOCABULARY)
+MODIFIERS = ["באופן קבוע", "במקרים נדירים", "לאורך זמן", "בתנאים מסוימים", "כבר בשלב מוקדם", "ברוב המקרים"]
+
+
+def entity_name(doc_id: int) -> str:
+    """Unique pronounceable name for a document id (base-16 over syllables)."""
+    digits = [SYLLABLES[doc_id % 16]]
+    doc_id //= 16
+    while doc_id:
+        digits.append(SYLLABLES[doc_id % 16])
+        doc_id //= 16
+    return "".join(reversed(digits))
+
+
+def planted_fact(doc_id: int, seed: int = 0) -> Dict[str, Any]:
+    """The fact planted in a document and the query that asks for it.
+
+    Returns:
+        Dict with ``query``, ``category``, ``answer``, ``doc_id``,
+        ``answer_keywords`` and the ``sentence`` planted in the document
+    """
+    rng = random.Random((seed << 40) ^ doc_id)
+    category = CATEGORIES[rng.randrange(len(CATEGORIES))]
+    entity = f"{VOCABULARY[category]['entity']} {entity_name(doc_id)}"
+    answer = str(rng.randrange(100000, 1000000))
+    return {
+        "query": f"מה מספר האישור של {entity}?",
+        "category": category,
+        "answer": answer,
+        "doc_id": doc_id,
+        "answer_keywords": [answer],
+        "entity": entity,
+        "sentence": f"מספר האישור של {entity} הוא {answer}.",
+    }
+
+
+def generate_document(doc_id: int, seed: int = 0, min_sentences: int = 4, max_sentences: int = 12) -> Dict[str, Any]:
+    """Generate one document in the ``data/documents.json`` format."""
+    fact = planted_fact(doc_id, seed)
+    words = VOCABULARY[fact["category"]]
+    rng = random.Random((seed << 40) ^ doc_id ^ (1 << 39))
+    sentences = [
+        f"{rng.choice(words['subjects'])} {rng.choice(words['verbs'])} "
+        f"{rng.choice(words['objects'])} {rng.choice(MODIFIERS)}."
+        for _ in range(rng.randint(min_sentences, max_sentences))
+    ]
+    sentences.insert(rng.randrange(len(sentences) + 1), fact["sentence"])
+    return {
+        "id": doc_id,
+        "title": f"{fact['entity']}: {rng.choice(words['objects'])}",
+        "category": fact["category"],
+        "content": " ".join(sentences),
+    }
+
+
+def _write_shard(task: tuple) -> Dict[str, Any]:
+    """Write documents ``[start, end)`` to one JSONL shard (worker process)."""
+    path, start, end, seed = task
+    size = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for doc_id in range(start, end):
+            line = json.dumps(generate_document(doc_id, seed), ensure_ascii=False) + "\n"
+            size += f.write(line)
+    return {"path": Path(path).name, "documents": end - start, "chars": size}
+
+
+def sample_queries(num_documents: int, count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Planted-fact queries for ``count`` distinct documents (seeded sample)."""
+    doc_ids = random.Random(seed).sample(range(num_documents), min(count, num_documents))
+    queries = []
+    for doc_id in sorted(doc_ids):
+        fact = planted_fact(doc_id, seed)
+        del fact["sentence"], fact["entity"]
+        queries.append(fact)
+    return queries
+
+
+def generate_corpus(
+    output_dir: str,
+    num_documents: int,
+    seed: int = 0,
+    shard_size: int = 100_000,
+    workers: int = None,
+    num_queries: int = 100,
+) -> Dict[str, Any]:
+    """Write a sharded corpus, its queries and a manifest.
+
+    Args:
+        output_dir: Directory for ``docs-*.jsonl``, ``queries.jsonl`` and ``manifest.json``
+        num_documents: Number of documents to generate
+        seed: Generator seed
+        shard_size: Documents per shard
+        workers: Writer processes (defaults to CPU count)
+        num_queries: Planted-fact queries to sample
+
+    Returns:
+        Manifest dictionary
+    """
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    for stale in output.glob(SHARD_PATTERN.replace("{:05d}", "*")):
+        stale.unlink()
+
+    tasks = [
+        (str(output / SHARD_PATTERN.format(i)), start, min(start + shard_size, num_documents), seed)
+        for i, start in enumerate(range(0, num_documents, shard_size))
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shards = list(executor.map(_write_shard, tasks))
+
+    with open(output / "queries.jsonl", "w", encoding="utf-8") as f:
+        for query in sample_queries(num_documents, num_queries, seed):
+            f.write(json.dumps(query, ensure_ascii=False) + "\n")
+
+    manifest = {"documents": num_documents, "seed": seed, "categories": CATEGORIES, "shards": shards}
+    with open(output / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def iter_queries(corpus_dir: str) -> Iterator[Dict[str, Any]]:
+    """Yield the planted-fact queries of a generated corpus."""
+    with open(Path(corpus_dir) / "queries.jsonl", "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv=None):
+    """Generate a corpus from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--output", default="data/synthetic")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    manifest = generate_corpus(
+        args.output, args.documents, args.seed, args.shard_size, args.workers, args.queries
+    )
+    chars = sum(shard["chars"] for shard in manifest["shards"])
+    print(f"Wrote {args.documents} documents ({chars / 1e6:.1f}M chars) "
+          f"in {len(manifest['shards'])} shards to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
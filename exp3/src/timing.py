@@ -0,0 +1,128 @@
+"""Nanosecond timing spans aggregated into HDR-style latency histograms."""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond durations.
+
+    Values are bucketed by their top ``precision_bits`` bits, so every
+    recorded value is reproduced within ``2 ** -(precision_bits - 1)``
+    relative error (1.6% by default). Memory is bounded by the value range
+    (64 counters per power of two by default), not by the number of values.
+    """
+
+    def __init__(self, precision_bits: int = 7):
+        """Initialize an empty histogram.
+
+        Args:
+            precision_bits: Significant bits kept per value
+        """
+        self.precision_bits = precision_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def _bucket(self, value: int) -> int:
+        shift = max(value.bit_length() - self.precision_bits, 0)
+        return (shift << self.precision_bits) | (value >> shift)
+
+    def _value(self, bucket: int) -> int:
+        shift = bucket >> self.precision_bits
+        mantissa = bucket & ((1 << self.precision_bits) - 1)
+        return (mantissa << shift) + ((1 << shift) >> 1)
+
+    def record(self, ns: int):
+        """Add one duration in nanoseconds."""
+        ns = max(int(ns), 0)
+        bucket = self._bucket(ns)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ns += ns
+        self.min_ns = ns if self.min_ns is None else min(self.min_ns, ns)
+        self.max_ns = max(self.max_ns, ns)
+
+    def percentile(self, p: float) -> int:
+        """Duration in nanoseconds at or below which ``p`` percent fall."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(max(self._value(bucket), self.min_ns), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean, percentiles and max in milliseconds."""
+        result = {"count": self.count, "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0}
+        for p in PERCENTILES:
+            result[f"p{p}_ms"] = self.percentile(p) / 1e6
+        result["max_ms"] = self.max_ns / 1e6
+        return result
+
+
+class Span:
+    """Duration of one timed block, available after the block exits."""
+
+    __slots__ = ("name", "start_ns", "ns")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start_ns = time.perf_counter_ns()
+        self.ns = 0
+
+    @property
+    def seconds(self) -> float:
+        return self.ns / 1e9
+
+
+class SpanRecorder:
+    """Thread-safe registry of one latency histogram per span name."""
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        """Time the enclosed block with ``perf_counter_ns`` and record it."""
+        timed = Span(name)
+        try:
+            yield timed
+        finally:
+            timed.ns = time.perf_counter_ns() - timed.start_ns
+            self.record(name, timed.ns)
+
+    def record(self, name: str, ns: int):
+        """Add a duration to the histogram of ``name``."""
+        with self._lock:
+            self.histograms.setdefault(name, LatencyHistogram()).record(ns)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Percentile summary per span name."""
+        with self._lock:
+            return {name: hist.summary() for name, hist in sorted(self.histograms.items())}
+
+    def reset(self):
+        """Forget all recorded spans."""
+        with self._lock:
+            self.histograms.clear()
+
+    def save(self, filepath: str):
+        """Write the summary to JSON."""
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+SPANS = SpanRecorder()
+span = SPANS.span
@@ -0,0 +1,89 @@
+"""Tokenizers used to measure chunk and context sizes in tokens."""
+
+import re
+from typing import List, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+class RegexTokenizer:
+    """Dependency-free tokenizer: words and individual punctuation marks."""
+
+    name = "regex"
+
+    def token_spans(self, text: str, start: int = 0, end: int = None) -> List[Tuple[int, int]]:
+        """Return ``(start, end)`` offsets of tokens in ``text[start:end]``.
+
+        Args:
+            text: Text to tokenize
+            start: Offset to start at
+            end: Offset to stop at (defaults to end of text)
+
+        Returns:
+            List of token offsets into ``text``
+        """
+        end = len(text) if end is None else end
+        return [m.span() for m in TOKEN_PATTERN.finditer(text, start, end)]
+
+    def count(self, text: str, start: int = 0, end: int = None) -> int:
+        """Count tokens in ``text[start:end]`` without slicing."""
+        end = len(text) if end is None else end
+        return sum(1 for _ in TOKEN_PATTERN.finditer(text, start, end))
+
+
+class TiktokenTokenizer:
+    """BPE tokenizer backed by ``tiktoken`` (optional dependency)."""
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        """Initialize with a tiktoken encoding.
+
+        Args:
+            encoding: Name of the tiktoken encoding
+        """
+        if not TIKTOKEN_AVAILABLE:
+            raise ImportError("tiktoken is not installed. Install with: pip install tiktoken")
+        self.encoding = tiktoken.get_encoding(encoding)
+        self.name = encoding
+
+    def token_spans(self, text: str, start: int = 0, end: int = None) -> List[Tuple[int, int]]:
+        """Return ``(start, end)`` character offsets of BPE tokens.
+
+        A token that ends inside a multi-byte character has no width of its
+        own; it is merged into the next span, so one span can hold several
+        tokens and every token belongs to some span.
+        """
+        end = len(text) if end is None else end
+        piece = text[start:end]
+        tokens = self.encoding.encode(piece)
+        _, offsets = self.encoding.decode_with_offsets(tokens)
+        bounds = offsets[1:] + [len(piece)]
+        spans = []
+        pending = None
+        for a, b in zip(offsets, bounds):
+            a = a if pending is None else pending
+            if b > a:
+                spans.append((start + a, start + b))
+                pending = None
+            else:
+                pending = a
+        if pending is not None and spans:
+            spans[-1] = (spans[-1][0], end)
+        return spans
+
+    def count(self, text: str, start: int = 0, end: int = None) -> int:
+        """Count BPE tokens in ``text[start:end]``."""
+        end = len(text) if end is None else end
+        return len(self.encoding.encode(text[start:end]))
+
+
+def default_tokenizer():
+    """Return a tiktoken tokenizer when available, else the regex tokenizer."""
+    if TIKTOKEN_AVAILABLE:
+        return TiktokenTokenizer()
+    return RegexTokenizer()
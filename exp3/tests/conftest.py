@@ -0,0 +1,46 @@
+"""Make the flat modules in ``src`` importable by bare name, as the scripts do."""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+class HashingEmbedding:
+    """Deterministic bag-of-words embedding, so tests need no model download."""
+
+    name = "hashing"
+
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            vector = np.zeros(64, dtype=np.float32)
+            for word in text.split():
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+            vectors.append(vector)
+        return vectors
+
+
+def make_chunk(doc_id, content, category="general", chunk_idx=0):
+    """A chunk in the shape produced by ``DocumentChunker``."""
+    return {
+        "id": f"{doc_id}_{chunk_idx}",
+        "doc_id": doc_id,
+        "title": f"doc {doc_id}",
+        "category": category,
+        "chunk_idx": chunk_idx,
+        "content": content,
+    }
+
+
+@pytest.fixture
+def numpy_store(tmp_path):
+    from numpy_store import NumpyEmbeddingStore
+
+    store = NumpyEmbeddingStore(persist_dir=str(tmp_path / "store"), embedding_function=HashingEmbedding())
+    store.create_collection("test")
+    return store
@@ -0,0 +1,35 @@
+import json
+
+import httpx
+import pytest
+
+from answering import MessagesClient, StreamError
+
+
+def sse(*events):
+    return "".join(f"event: {e['type']}\ndata: {json.dumps(e)}\n\n" for e in events).encode()
+
+
+def client_for(body: bytes) -> MessagesClient:
+    client = MessagesClient(base_url="http://mock")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    client.http = httpx.Client(base_url="http://mock", transport=transport)
+    return client
+
+
+START = {"type": "message_start", "message": {"usage": {"input_tokens": 12}}}
+DELTA = {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "שלום"}}
+
+
+def test_streamed_answer():
+    end = {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 3}}
+    result = client_for(sse(START, DELTA, end, {"type": "message_stop"})).complete("system", "prompt")
+    assert result["text"] == "שלום"
+    assert (result["input_tokens"], result["output_tokens"]) == (12, 3)
+
+
+def test_error_event_raises():
+    error = {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}
+    with pytest.raises(StreamError, match="overloaded_error") as raised:
+        client_for(sse(START, DELTA, error)).complete("system", "prompt")
+    assert raised.value.error_type == "overloaded_error"
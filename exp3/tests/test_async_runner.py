@@ -0,0 +1,88 @@
+"""The concurrent runner reproduces the serial results and keeps stages per query."""
+
+import threading
+
+from async_runner import run_concurrently
+from conftest import make_chunk
+from evaluation import Evaluator
+from packing import ContextPacker, PackedRAGMode
+from retrieval import FullContextMode, RetrievalComparison, RetrievalMode
+from tokens import RegexTokenizer
+
+CHUNKS = [
+    make_chunk(1, "contract breach damages court", category="law"),
+    make_chunk(2, "tenant lease deposit court", category="law"),
+    make_chunk(3, "fever headache dosage tablet", category="medicine"),
+    make_chunk(4, "nausea dosage side effects", category="medicine"),
+    make_chunk(5, "cloud encryption keys backup", category="technology"),
+]
+QUERIES = [
+    {"query": "court damages", "category": "law"},
+    {"query": "dosage headache", "category": "medicine"},
+    {"query": "encryption backup", "category": "technology"},
+    {"query": "side effects", "category": "medicine"},
+    {"query": "lease deposit", "category": "law"},
+]
+
+
+def without_timings(metrics):
+    for mode in ("full_context", "rag"):
+        metrics[mode].pop("retrieval_time")
+    metrics["comparison"].pop("time_difference")
+    return metrics
+
+
+def without_seconds(stages):
+    return {key: value for key, value in stages.items() if not key.endswith("_seconds")}
+
+
+def test_concurrent_results_match_serial(numpy_store):
+    numpy_store.add_documents(CHUNKS)
+    packer = ContextPacker(max_tokens=12, tokenizer=RegexTokenizer())
+    comparison = RetrievalComparison(
+        FullContextMode(numpy_store.get_all_documents()), PackedRAGMode(numpy_store, packer, candidates=4)
+    )
+
+    serial_evaluator = Evaluator(tokenizer=RegexTokenizer())
+    serial, serial_results = [], []
+    for q in QUERIES:
+        result = comparison.compare(q["query"])
+        serial_results.append(result)
+        serial.append(serial_evaluator.evaluate_result(
+            q["query"], result["full_context"], result["rag"], expected_category=q["category"]
+        ))
+
+    results = {}
+    concurrent = run_concurrently(
+        comparison, Evaluator(tokenizer=RegexTokenizer()), QUERIES, concurrency=3,
+        on_result=lambda idx, query, result, metrics: results.__setitem__(idx, result),
+    )
+
+    assert [without_timings(m) for m in concurrent] == [without_timings(m) for m in serial]
+    for idx, expected in enumerate(serial_results, 1):
+        assert results[idx]["rag"]["documents"] == expected["rag"]["documents"]
+        assert without_seconds(results[idx]["rag"]["stages"]) == without_seconds(expected["rag"]["stages"])
+
+
+class EchoStagesMode(RetrievalMode):
+    """Reports its query in ``last_stages`` and waits until every query has done so."""
+
+    def __init__(self, parties):
+        self.barrier = threading.Barrier(parties)
+
+    def retrieve(self, query):
+        self.last_stages = [{"query": query}]
+        self.barrier.wait(timeout=5)
+        return [{"content": query, "metadata": {"category": "law"}}], 0.0
+
+
+def test_stages_stay_per_query_under_concurrency():
+    queries = QUERIES[:4]
+    documents = [{"content": chunk["content"], "metadata": chunk} for chunk in CHUNKS]
+    comparison = RetrievalComparison(FullContextMode(documents), EchoStagesMode(len(queries)))
+    seen = {}
+    run_concurrently(
+        comparison, Evaluator(tokenizer=RegexTokenizer()), queries, concurrency=len(queries),
+        on_result=lambda idx, query, result, metrics: seen.__setitem__(query, result["rag"]["stages"]),
+    )
+    assert seen == {q["query"]: {"query": q["query"]} for q in queries}
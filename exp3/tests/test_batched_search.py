@@ -0,0 +1,62 @@
+"""Batched search and comparison match their one-query-at-a-time versions."""
+
+from conftest import make_chunk
+from packing import ContextPacker, PackedRAGMode
+from retrieval import FullContextMode, RAGMode, RetrievalComparison
+from tokens import RegexTokenizer
+
+CHUNKS = [
+    make_chunk(1, "contract breach damages court", category="law"),
+    make_chunk(2, "tenant lease deposit court", category="law"),
+    make_chunk(3, "fever headache dosage tablet", category="medicine"),
+    make_chunk(4, "nausea dosage side effects", category="medicine"),
+    make_chunk(5, "cloud encryption keys backup", category="technology"),
+]
+QUERIES = ["court damages", "dosage headache", "encryption backup", "side effects"]
+
+
+def strip_times(result):
+    for mode in ("full_context", "rag"):
+        result[mode].pop("retrieval_time")
+        result[mode].get("stages", {}).pop("retrieve_seconds", None)
+        result[mode].get("stages", {}).pop("pack_seconds", None)
+    return result
+
+
+def test_search_many_matches_single_searches(numpy_store, monkeypatch):
+    numpy_store.add_documents(CHUNKS)
+    expected = [numpy_store.similarity_search(query, k=2) for query in QUERIES]
+
+    calls = []
+    embed = numpy_store.embed
+    monkeypatch.setattr(numpy_store, "embed", lambda texts: calls.append(texts) or embed(texts))
+    assert numpy_store.similarity_search_many(QUERIES, k=2) == expected
+    assert calls == [QUERIES]
+
+
+def test_search_many_with_filter_and_precomputed_vectors(numpy_store):
+    numpy_store.add_documents(CHUNKS)
+    vectors = numpy_store.embed(QUERIES)
+    results = numpy_store.similarity_search_many(
+        QUERIES, k=5, where={"category": "law"}, query_embeddings=vectors
+    )
+    for documents, distances in results:
+        assert {doc["metadata"]["category"] for doc in documents} == {"law"}
+        assert distances == sorted(distances)
+
+
+def test_search_many_without_collection_or_queries(numpy_store):
+    assert numpy_store.similarity_search_many([]) == []
+    numpy_store.collection = None
+    assert numpy_store.similarity_search_many(["query"]) == [([], [])]
+
+
+def test_compare_many_matches_compare(numpy_store):
+    numpy_store.add_documents(CHUNKS)
+    full = FullContextMode(numpy_store.get_all_documents())
+    packer = ContextPacker(max_tokens=12, tokenizer=RegexTokenizer())
+    for rag in (RAGMode(numpy_store, k=2), PackedRAGMode(numpy_store, packer, candidates=4)):
+        comparison = RetrievalComparison(full, rag)
+        serial = [strip_times(comparison.compare(query)) for query in QUERIES]
+        batched = [strip_times(result) for result in comparison.compare_many(QUERIES)]
+        assert batched == serial
@@ -0,0 +1,84 @@
+"""Token budgets and overlap handling of ``BoundaryChunker``."""
+
+from boundary_chunking import BoundaryChunker
+from tokens import RegexTokenizer, TiktokenTokenizer
+
+
+class ByteEncoding:
+    """Byte-level stand-in for a tiktoken encoding: one token per UTF-8 byte.
+
+    ``decode_with_offsets`` follows tiktoken: a token starting with a UTF-8
+    continuation byte is attributed to the character it continues.
+    """
+
+    def encode(self, text):
+        return list(text.encode("utf-8"))
+
+    def decode_with_offsets(self, tokens):
+        offsets, text_len = [], 0
+        for token in tokens:
+            offsets.append(max(0, text_len - (0x80 <= token < 0xC0)))
+            text_len += not 0x80 <= token < 0xC0
+        return bytes(tokens).decode("utf-8"), offsets
+
+
+def byte_tokenizer():
+    tokenizer = TiktokenTokenizer.__new__(TiktokenTokenizer)
+    tokenizer.encoding = ByteEncoding()
+    tokenizer.name = "bytes"
+    return tokenizer
+
+
+HEBREW = "בראשית ברא אלהים את השמים ואת הארץ. והארץ היתה תהו ובהו וחשך על פני תהום. "
+
+
+def test_token_spans_keep_every_token_of_multibyte_text():
+    tokenizer = byte_tokenizer()
+    spans = tokenizer.token_spans(HEBREW)
+    # Spans tile the text, so no token is dropped
+    assert spans[0][0] == 0 and spans[-1][1] == len(HEBREW)
+    assert all(a < b for a, b in spans)
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(spans, spans[1:]))
+
+
+def test_hebrew_chunks_stay_within_token_budget():
+    tokenizer = byte_tokenizer()
+    text = HEBREW * 20
+    for detector in (None, "sentence", "word"):
+        chunker = BoundaryChunker(max_size=25, detector=detector, tokenizer=tokenizer)
+        spans = list(chunker.chunk_spans(text))
+        assert spans
+        for start, end in spans:
+            assert tokenizer.count(text, start, end) <= 25
+
+
+def test_exact_token_chunks_without_detector():
+    tokenizer = RegexTokenizer()
+    text = " ".join(f"w{i}" for i in range(23))
+    chunker = BoundaryChunker(max_size=5, detector=None, tokenizer=tokenizer)
+    counts = [tokenizer.count(text, a, b) for a, b in chunker.chunk_spans(text)]
+    assert counts == [5, 5, 5, 5, 3]
+
+
+def test_character_budget_includes_gaps_between_segments():
+    text = "Aa bb. " * 30
+    chunker = BoundaryChunker(max_size=20, detector="sentence")
+    for start, end in chunker.chunk_spans(text):
+        assert end - start <= 20
+
+
+def test_overlap_repeats_trailing_segment():
+    text = "One two. Three four. Five six. Seven eight. "
+    chunker = BoundaryChunker(max_size=6, tokenizer=RegexTokenizer(), overlap_segments=1)
+    chunks = [text[a:b] for a, b in chunker.chunk_spans(text)]
+    assert chunks == ["One two. Three four.", "Three four. Five six.", "Five six. Seven eight."]
+
+
+def test_oversized_segment_does_not_reemit_overlap():
+    text = "One two. Three four. Five six. " + "x " * 20 + ". Seven eight. "
+    chunker = BoundaryChunker(max_size=6, tokenizer=RegexTokenizer(), overlap_segments=1)
+    chunks = [text[a:b] for a, b in chunker.chunk_spans(text)]
+    assert chunks[:2] == ["One two. Three four.", "Three four. Five six."]
+    sentences = [chunk for chunk in chunks if not chunk.startswith("x")]
+    assert len(sentences) == len(set(sentences))
+    assert chunks[-1] == "Seven eight."
@@ -0,0 +1,50 @@
+"""Offset-based chunk records and tables agree with plain chunk dicts."""
+
+import pytest
+
+from chunk_records import Chunk
+from chunking import DocumentChunker
+
+DOCUMENTS = [
+    {"id": 1, "title": "Law", "category": "law", "content": "word " * 60},
+    {"id": 2, "title": "Medicine", "category": "medicine", "content": "תרופה " * 40},
+    {"id": 3, "title": "Blank", "category": "law", "content": "   "},
+]
+
+
+def test_records_match_sliced_chunks():
+    chunker = DocumentChunker(chunk_size=50, overlap=10)
+    records = list(chunker.iter_chunk_records(DOCUMENTS))
+    for record in records:
+        text = f"{record.title}. " + next(d["content"] for d in DOCUMENTS if d["id"] == record.doc_id)
+        assert record.content == text[record.start : record.end]
+        assert len(record) == len(record.content)
+    assert [r.id for r in records] == list(range(len(records)))
+
+
+def test_chunks_of_a_document_share_one_source():
+    records = list(DocumentChunker(chunk_size=50, overlap=10).iter_chunk_records(DOCUMENTS[:1]))
+    assert len(records) > 1
+    assert all(record.source is records[0].source for record in records)
+
+
+def test_dict_access():
+    chunk = Chunk(7, 1, "title", "law", 0, 2, 5, "abcdefg")
+    assert chunk["content"] == "cde"
+    assert chunk["category"] == "law"
+    assert chunk.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        chunk["source_text"]
+    assert chunk.to_dict() == {
+        "id": 7, "doc_id": 1, "title": "title", "category": "law", "chunk_idx": 0, "content": "cde",
+    }
+
+
+def test_table_matches_records():
+    chunker = DocumentChunker(chunk_size=50, overlap=10)
+    table = chunker.build_table(DOCUMENTS)
+    records = list(chunker.iter_chunk_records(DOCUMENTS))
+    assert len(table) == len(records)
+    assert [chunk.to_dict() for chunk in table] == [record.to_dict() for record in records]
+    assert [table.content(i) for i in range(len(table))] == [r.content for r in records]
+    assert table.span_bytes() < sum(len(r.content.encode()) for r in records)
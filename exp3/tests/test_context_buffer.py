@@ -0,0 +1,55 @@
+"""The shared full-context buffer reads like the document list it was built from."""
+
+import pytest
+
+from context_buffer import ContextBuffer
+from evaluation import Evaluator
+from tokens import RegexTokenizer
+
+DOCUMENTS = [
+    {"content": "first chunk text", "metadata": {"category": "law", "chunk_idx": "0"}},
+    {"content": "second", "metadata": {"category": "medicine", "chunk_idx": "1"}},
+    {"content": "third chunk, with punctuation.", "metadata": {"category": "law", "chunk_idx": "2"}},
+]
+
+
+def test_views_match_the_documents():
+    buffer = ContextBuffer(DOCUMENTS)
+    assert len(buffer) == 3
+    assert [view["content"] for view in buffer] == [doc["content"] for doc in DOCUMENTS]
+    assert [view.get("metadata") for view in buffer] == [doc["metadata"] for doc in DOCUMENTS]
+    assert buffer[-1]["content"] == DOCUMENTS[-1]["content"]
+    assert buffer.text == "\n\n".join(doc["content"] for doc in DOCUMENTS)
+
+
+def test_out_of_range_and_unknown_keys():
+    buffer = ContextBuffer(DOCUMENTS)
+    with pytest.raises(IndexError):
+        buffer[3]
+    with pytest.raises(KeyError):
+        buffer[0]["id"]
+    assert buffer[0].get("id", "missing") == "missing"
+
+
+def test_precomputed_totals_match_evaluator_on_plain_lists():
+    evaluator = Evaluator(tokenizer=RegexTokenizer())
+    buffer = ContextBuffer(DOCUMENTS)
+    assert evaluator.calculate_context_size(buffer) == evaluator.calculate_context_size(DOCUMENTS)
+    assert evaluator.calculate_context_tokens(buffer) == evaluator.calculate_context_tokens(DOCUMENTS)
+    assert evaluator.calculate_relevance_score(buffer, "law") == pytest.approx(
+        evaluator.calculate_relevance_score(DOCUMENTS, "law")
+    )
+
+
+def test_token_count_is_cached_per_tokenizer():
+    class CountingTokenizer(RegexTokenizer):
+        calls = 0
+
+        def count(self, text, start=0, end=None):
+            CountingTokenizer.calls += 1
+            return super().count(text, start, end)
+
+    buffer = ContextBuffer(DOCUMENTS)
+    tokenizer = CountingTokenizer()
+    assert buffer.token_count(tokenizer) == buffer.token_count(tokenizer)
+    assert CountingTokenizer.calls == len(DOCUMENTS)
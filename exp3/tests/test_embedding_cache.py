@@ -0,0 +1,58 @@
+"""Persistent embedding cache: hits, model separation, LRU eviction and reopening."""
+
+import itertools
+
+import numpy as np
+
+import embedding_cache
+from embedding_cache import EmbeddingCache
+
+
+class CountingEmbed:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_only_misses_are_embedded(tmp_path):
+    cache, embed = EmbeddingCache(str(tmp_path / "cache.sqlite3")), CountingEmbed()
+    first = cache.embed("model", ["a", "bb"], embed)
+    second = cache.embed("model", ["bb", "ccc"], embed)
+    assert embed.calls == [["a", "bb"], ["ccc"]]
+    np.testing.assert_array_equal(first[1], second[0])
+    assert second[0].dtype == np.float32
+    assert cache.stats() == {"hits": 1, "misses": 3, "hit_rate": 0.25, "entries": 3}
+
+
+def test_models_do_not_share_entries(tmp_path):
+    cache, embed = EmbeddingCache(str(tmp_path / "cache.sqlite3")), CountingEmbed()
+    cache.embed("model-a", ["text"], embed)
+    cache.embed("model-b", ["text"], embed)
+    assert len(embed.calls) == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(clock)))
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.put_many("model", ["old"], [[1.0]])
+    cache.put_many("model", ["kept"], [[2.0]])
+    cache.get_many("model", ["old"])  # touch "old" so "kept" is least recently used
+    cache.put_many("model", ["new"], [[3.0]])
+    found = cache.get_many("model", ["old", "kept", "new"])
+    assert [v is not None for v in found] == [True, False, True]
+    assert cache.stats()["entries"] == 2
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EmbeddingCache(path)
+    cache.put_many("model", ["text"], [[0.5, 0.25]])
+    cache.close()
+
+    reopened = EmbeddingCache(path)
+    assert reopened.stats()["entries"] == 1
+    np.testing.assert_array_equal(reopened.get_many("model", ["text"])[0], [0.5, 0.25])
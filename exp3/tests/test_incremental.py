@@ -0,0 +1,58 @@
+import pytest
+
+from conftest import HashingEmbedding, make_chunk
+from numpy_store import NumpyEmbeddingStore
+
+CORPUS = [make_chunk(str(i), f"document number {i} about topic {i % 3}") for i in range(10)]
+
+
+def reopen(store):
+    """A fresh store over the same directory, as the next run would see it."""
+    other = NumpyEmbeddingStore(persist_dir=store.persist_dir, embedding_function=HashingEmbedding())
+    other.create_collection("test")
+    return other
+
+
+def test_add_skip_prune(numpy_store):
+    assert numpy_store.sync_documents(CORPUS) == {"added": 10, "unchanged": 0, "deleted": 0}
+
+    store = reopen(numpy_store)
+    assert store.sync_documents(CORPUS + CORPUS[:2]) == {"added": 0, "unchanged": 10, "deleted": 0}
+
+    changed = CORPUS[:8] + [make_chunk("3", "rewritten"), make_chunk("new", "fresh text")]
+    store = reopen(store)
+    assert store.sync_documents(changed) == {"added": 2, "unchanged": 8, "deleted": 2}
+    assert store.collection.count() == 10
+    assert sorted(doc["content"] for doc in store.get_all_documents()) == sorted(
+        chunk["content"] for chunk in changed
+    )
+
+
+def test_prune_bumps_version(numpy_store):
+    numpy_store.sync_documents(CORPUS)
+    version = numpy_store.version
+    numpy_store.sync_documents(CORPUS)
+    assert numpy_store.version == version
+    numpy_store.sync_documents(CORPUS[:5])
+    assert numpy_store.version > version
+    assert numpy_store.collection.count() == 5
+
+
+def test_manifest_bootstrapped_from_existing_collection(numpy_store):
+    numpy_store.add_documents(CORPUS[:4])
+    counts = numpy_store.sync_documents(CORPUS[4:])
+    # ids from add_documents are not content hashes, so they are stale
+    assert counts == {"added": 6, "unchanged": 0, "deleted": 4}
+    assert numpy_store.collection.count() == 6
+
+
+def test_failed_save_leaves_manifest_uncommitted(numpy_store, monkeypatch):
+    numpy_store.sync_documents(CORPUS[:5])
+
+    store = reopen(numpy_store)
+    monkeypatch.setattr(store, "save", lambda: (_ for _ in ()).throw(OSError("disk full")))
+    with pytest.raises(OSError):
+        store.sync_documents(CORPUS)
+
+    # the five new chunks were never saved, so the next run adds them again
+    assert reopen(numpy_store).sync_documents(CORPUS) == {"added": 5, "unchanged": 5, "deleted": 0}
@@ -0,0 +1,47 @@
+"""Batched ingestion: batch sizes, progress reports and prefetch."""
+
+import pytest
+
+from conftest import make_chunk
+from ingest import BatchIngestor
+
+
+def pairs(n):
+    return ((f"id{i}", make_chunk(i, f"chunk number {i}")) for i in range(n))
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_writes_every_chunk_in_fixed_batches(numpy_store, prefetch):
+    progress, written = [], []
+    ingestor = BatchIngestor(numpy_store, batch_size=4, prefetch=prefetch, on_progress=progress.append)
+    final = ingestor.run(pairs(10), on_written=written.append)
+
+    assert [len(ids) for ids in written] == [4, 4, 2]
+    assert [p["documents"] for p in progress] == [4, 8, 10]
+    assert final["batches"] == 3 and final["documents"] == 10
+    stored = numpy_store.collection.get()
+    assert sorted(stored["ids"]) == sorted(f"id{i}" for i in range(10))
+    assert dict(zip(stored["ids"], stored["documents"]))["id7"] == "chunk number 7"
+
+
+def test_prefetch_stores_the_same_vectors(tmp_path):
+    from conftest import HashingEmbedding
+    from numpy_store import NumpyEmbeddingStore
+
+    stores = []
+    for prefetch in (False, True):
+        store = NumpyEmbeddingStore(str(tmp_path / str(prefetch)), embedding_function=HashingEmbedding())
+        store.create_collection("test")
+        BatchIngestor(store, batch_size=3, prefetch=prefetch).run(pairs(7))
+        stores.append(store.collection.get(include=["embeddings"]))
+    assert stores[0]["ids"] == stores[1]["ids"]
+    assert (stores[0]["embeddings"] == stores[1]["embeddings"]).all()
+
+
+def test_empty_stream(numpy_store):
+    assert BatchIngestor(numpy_store, prefetch=True).run(iter([]))["documents"] == 0
+
+
+def test_batch_size_clamped_to_store_limit(numpy_store, monkeypatch):
+    monkeypatch.setattr(numpy_store, "max_batch_size", lambda: 2)
+    assert BatchIngestor(numpy_store, batch_size=100).batch_size == 2
@@ -0,0 +1,107 @@
+"""BM25 scoring, reciprocal rank fusion and hybrid index freshness."""
+
+import math
+
+import pytest
+from conftest import make_chunk
+
+from hybrid import HybridMode, reciprocal_rank_fusion
+from lexical import BM25Index, hebrew_terms
+
+DOCS = {
+    "a": "the cat sat on the mat",
+    "b": "the dog chased the cat",
+    "c": "birds sing in the morning",
+    "d": "a cat and a dog and a cat",
+}
+
+
+def build_index():
+    index = BM25Index()
+    index.add(DOCS, [{"content": text, "metadata": {"id": key}} for key, text in DOCS.items()])
+    return index
+
+
+def reference_bm25(query, docs, k1=1.5, b=0.75):
+    """Textbook Okapi BM25 over every document."""
+    terms = {key: hebrew_terms(text) for key, text in docs.items()}
+    avgdl = sum(len(t) for t in terms.values()) / len(terms)
+    scores = {}
+    for key, doc_terms in terms.items():
+        score = 0.0
+        for term in set(hebrew_terms(query)):
+            df = sum(term in t for t in terms.values())
+            tf = doc_terms.count(term)
+            if not df or not tf:
+                continue
+            idf = math.log(1.0 + (len(terms) - df + 0.5) / (df + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc_terms) / avgdl))
+        if score:
+            scores[key] = score
+    return scores
+
+
+def test_bm25_matches_reference_scores():
+    results = build_index().search("cat dog", k=10)
+    expected = reference_bm25("cat dog", DOCS)
+    assert {doc["metadata"]["id"]: score for doc, score in results} == pytest.approx(expected, rel=1e-5)
+    assert [doc["metadata"]["id"] for doc, _ in results] == sorted(expected, key=expected.get, reverse=True)
+
+
+def test_bm25_top_k_and_removed_documents():
+    index = build_index()
+    assert len(index.search("cat", k=2)) == 2
+    index.remove(["d"])
+    remaining = {key: text for key, text in DOCS.items() if key != "d"}
+    results = index.search("cat", k=10)
+    assert {doc["metadata"]["id"] for doc, _ in results} == {"a", "b"}
+    assert dict((doc["metadata"]["id"], s) for doc, s in results) == pytest.approx(
+        reference_bm25("cat", remaining), rel=1e-5
+    )
+
+
+def test_hebrew_prefix_matches_stem():
+    index = BM25Index()
+    index.add(["x"], [{"content": "התרופה עובדת", "metadata": {}}])
+    assert index.search("בתרופה")
+
+
+def test_reciprocal_rank_fusion_scores():
+    def doc(doc_id):
+        return {"content": doc_id, "metadata": {"doc_id": doc_id, "chunk_idx": 0}}
+
+    fused = reciprocal_rank_fusion([[doc("a"), doc("b"), doc("c")], [doc("c"), doc("b")]], k=60)
+    # c: 1/63 + 1/61 > b: 1/62 + 1/62 > a: 1/61
+    assert [d["content"] for d in fused] == ["c", "b", "a"]
+
+
+def test_hybrid_index_follows_store_changes(numpy_store):
+    numpy_store.add_documents([make_chunk(1, "alpha beta gamma")])
+    mode = HybridMode(numpy_store, BM25Index(), k=2)
+    assert len(mode.index) == 1
+
+    numpy_store.add_documents([make_chunk(2, "delta epsilon zeta")])
+    documents, _ = mode.retrieve("epsilon")
+    assert len(mode.index) == 2
+    assert documents[0]["metadata"]["doc_id"] == "2"
+
+
+def test_index_follows_store_writes_without_rescanning(numpy_store, monkeypatch):
+    chunks = [make_chunk(1, "alpha beta"), make_chunk(2, "gamma delta")]
+    numpy_store.sync_documents(chunks)
+    index = BM25Index()
+    index.attach(numpy_store)
+    assert len(index) == 2
+
+    def no_rescan(*args, **kwargs):
+        raise AssertionError("collection rescanned")
+
+    monkeypatch.setattr(numpy_store.collection, "get", no_rescan)
+    numpy_store.sync_documents([chunks[0], make_chunk(3, "epsilon zeta")])
+    assert len(index) == 2
+    assert [doc["content"] for doc, _ in index.search("epsilon")] == ["epsilon zeta"]
+    assert index.search("gamma") == []
+
+    monkeypatch.undo()
+    numpy_store.clear()
+    assert len(index) == 0
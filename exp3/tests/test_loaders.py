@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from loaders import iter_json_array
+
+ELEMENTS = [
+    {"id": "1", "content": "שלום עולם", "n": 123456789},
+    {"id": "2", "content": 'quote \\" and backslash \\\\ and [brackets] {braces}', "nested": [[1, 2], {"a": []}]},
+    1234567890123,
+    -0.5e10,
+    'a \\"string\\" element',
+    True,
+    None,
+    [],
+    {},
+]
+
+
+@pytest.fixture
+def array_file(tmp_path):
+    path = tmp_path / "docs.json"
+    path.write_text(json.dumps(ELEMENTS, ensure_ascii=False, indent=1), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("buffer_size", [1, 2, 3, 5, 7, 64, 1 << 16])
+def test_matches_json_load_at_any_buffer_size(array_file, buffer_size):
+    assert list(iter_json_array(str(array_file), buffer_size)) == ELEMENTS
+
+
+def test_number_split_at_buffer_boundary(tmp_path):
+    path = tmp_path / "numbers.json"
+    path.write_text("[12345,67890]", encoding="utf-8")
+    for buffer_size in range(1, 14):
+        assert list(iter_json_array(str(path), buffer_size)) == [12345, 67890]
+
+
+def test_each_element_decoded_once(tmp_path, monkeypatch):
+    path = tmp_path / "large.json"
+    docs = [{"id": str(i), "content": "x" * 5000} for i in range(3)]
+    path.write_text(json.dumps(docs), encoding="utf-8")
+    calls = []
+    raw_decode = json.JSONDecoder.raw_decode
+    monkeypatch.setattr(json.JSONDecoder, "raw_decode",
+                        lambda self, s, idx=0: calls.append(idx) or raw_decode(self, s, idx))
+    assert list(iter_json_array(str(path), buffer_size=100)) == docs
+    assert len(calls) == len(docs)
+
+
+@pytest.mark.parametrize("text, error", [
+    ('{"a": 1}', "expected a JSON array"),
+    ('[{"a": 1}, {"b": 2}', "unterminated JSON array"),
+])
+def test_malformed_files(tmp_path, text, error):
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError, match=error):
+        list(iter_json_array(str(path), buffer_size=4))
+
+
+def test_truncated_element_raises(tmp_path):
+    path = tmp_path / "truncated.json"
+    path.write_text('[{"a": "unfinished', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(str(path), buffer_size=4))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from numpy_collection import NumpyCollection
+
+META = [
+    {"category": "a", "year": 2020},
+    {"category": "b", "year": 2021},
+    {"category": "a", "year": 2022},
+    {"category": "c", "year": 2023},
+]
+
+
+@pytest.fixture
+def collection():
+    collection = NumpyCollection("test")
+    vectors = np.eye(4, dtype=np.float32)
+    collection.add(["0", "1", "2", "3"], ["d0", "d1", "d2", "d3"], META, vectors)
+    return collection
+
+
+def matching(collection, where):
+    results = collection.query(np.ones((1, 4)), n_results=10, where=where)
+    return sorted(results["ids"][0])
+
+
+def test_add_rejects_duplicate_ids(collection):
+    with pytest.raises(ValueError, match="already in collection"):
+        collection.add(["1"], ["again"], [{}], np.ones((1, 4)))
+    with pytest.raises(ValueError, match="Duplicate ids"):
+        collection.add(["x", "x"], ["a", "b"], [{}, {}], np.ones((2, 4)))
+    assert collection.count() == 4
+
+    collection.upsert(["1"], ["replaced"], [{}], np.ones((1, 4)))
+    assert collection.get(ids=["1"])["documents"] == ["replaced"]
+
+
+def test_dimension_checked_on_non_empty_collection(collection):
+    with pytest.raises(ValueError, match="dimension 3 does not match"):
+        collection.add(["4"], ["d4"], [{}], np.ones((1, 3)))
+    with pytest.raises(ValueError, match="dimension 3 does not match"):
+        collection.query(np.ones((1, 3)))
+
+    empty = NumpyCollection("empty")
+    empty.add(["0"], ["d0"], [{}], np.ones((1, 3)))
+    assert empty.query(np.ones((1, 3)), n_results=1)["ids"] == [["0"]]
+
+
+def test_field_filters(collection):
+    assert matching(collection, {"category": "a"}) == ["0", "2"]
+    assert matching(collection, {"category": {"$nin": ["a", "b"]}}) == ["3"]
+    assert matching(collection, {"year": {"$gte": 2022}}) == ["2", "3"]
+
+
+def test_logical_filters(collection):
+    assert matching(collection, {"$and": [{"category": "a"}, {"year": {"$gt": 2020}}]}) == ["2"]
+    assert matching(collection, {"$or": [{"category": "b"}, {"year": {"$lt": 2021}}]}) == ["0", "1"]
+    nested = {"$or": [{"$and": [{"category": "a"}, {"year": 2022}]}, {"category": "c"}]}
+    assert matching(collection, nested) == ["2", "3"]
+
+
+@pytest.mark.parametrize("where", [
+    {"$not": {"category": "a"}}, {"category": {"$regex": "a"}}, {"$and": {"category": "a"}},
+])
+def test_unsupported_filters_raise(collection, where):
+    with pytest.raises(ValueError):
+        collection.query(np.ones((1, 4)), where=where)
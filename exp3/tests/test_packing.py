@@ -0,0 +1,67 @@
+"""Token-budgeted packing: near-duplicate removal, overlap trimming and the budget."""
+
+from packing import ContextPacker, shared_boundary
+from tokens import RegexTokenizer
+
+
+def doc(content, doc_id="d1", chunk_idx=0):
+    return {"content": content, "metadata": {"doc_id": doc_id, "chunk_idx": str(chunk_idx)}}
+
+
+def packer(max_tokens=1000):
+    return ContextPacker(max_tokens=max_tokens, tokenizer=RegexTokenizer())
+
+
+def test_near_duplicate_shingles_are_dropped():
+    original = doc("the quick brown fox jumps over the lazy dog near the river bank", "a")
+    copy = doc("the quick brown fox jumps over the lazy dog near the river", "b")
+    other = doc("cloud storage encrypts data at rest and in transit", "c")
+    report = packer().pack([original, copy, other])
+    assert [d["content"] for d in report["documents"]] == [original["content"], other["content"]]
+    assert report["duplicates"] == 1
+
+
+def test_best_scoring_copy_is_kept():
+    low = doc("alpha beta gamma delta epsilon zeta eta theta", "a")
+    high = doc("alpha beta gamma delta epsilon zeta eta theta iota", "b")
+    report = packer().pack([low, high], scores=[0.1, 0.9])
+    assert [d["metadata"]["doc_id"] for d in report["documents"]] == ["b"]
+
+
+def test_overlap_with_neighbouring_chunks_is_trimmed():
+    shared = "shared overlap text between chunks"
+    first = doc("first chunk opening words " + shared, chunk_idx=0)
+    second = doc(shared + " second chunk closing words", chunk_idx=1)
+    report = packer().pack([first, second])
+    assert report["documents"][1]["content"] == " second chunk closing words"
+    assert report["trimmed_chars"] == len(shared)
+
+
+def test_overlap_is_trimmed_when_the_later_chunk_packs_first():
+    shared = "shared overlap text between chunks"
+    first = doc("first chunk opening words " + shared, chunk_idx=0)
+    second = doc(shared + " second chunk closing words", chunk_idx=1)
+    report = packer().pack([second, first])
+    assert report["documents"][1]["content"] == "first chunk opening words "
+
+
+def test_chunks_of_other_documents_are_not_trimmed():
+    shared = "shared overlap text between chunks"
+    first = doc("first chunk opening words " + shared, "a", chunk_idx=0)
+    second = doc(shared + " second chunk closing words", "b", chunk_idx=1)
+    report = packer().pack([first, second])
+    assert report["documents"][1]["content"] == second["content"]
+
+
+def test_budget_skips_large_chunks_but_packs_smaller_ones():
+    large = doc("one two three four five six seven eight", "a")
+    small = doc("nine ten", "b")
+    report = packer(max_tokens=5).pack([large, small])
+    assert [d["metadata"]["doc_id"] for d in report["documents"]] == ["b"]
+    assert report["tokens"] == 2
+    assert report["over_budget"] == 1
+
+
+def test_shared_boundary_requires_min_overlap():
+    assert shared_boundary("abc shared", "shared xyz", min_overlap=6) == 6
+    assert shared_boundary("abc shared", "shared xyz", min_overlap=7) == 0
@@ -0,0 +1,23 @@
+from chunking import DocumentChunker
+from pipeline import IndexingPipeline
+
+DOCS = [{"id": str(i), "title": f"t{i}", "category": "c", "content": f"word{i} " * 200} for i in range(6)]
+
+
+def test_write_batches_clamped_to_store_limit(numpy_store, monkeypatch):
+    monkeypatch.setattr(numpy_store, "max_batch_size", lambda: 3)
+    sizes = []
+    add_batch = numpy_store._add_batch
+
+    def recording(documents, *args, **kwargs):
+        sizes.append(len(documents))
+        return add_batch(documents, *args, **kwargs)
+
+    monkeypatch.setattr(numpy_store, "_add_batch", recording)
+    pipeline = IndexingPipeline(numpy_store, DocumentChunker(chunk_size=500, overlap=50),
+                                workers=1, embed_batch_size=256)
+    assert pipeline.embed_batch_size == 3
+
+    stats = pipeline.run(DOCS)
+    assert max(sizes) == 3
+    assert sum(sizes) == stats["write"]["items"] == numpy_store.collection.count()
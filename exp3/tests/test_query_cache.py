@@ -0,0 +1,107 @@
+"""Exact and semantic cache tiers, TTL expiry and store-version invalidation."""
+
+import numpy as np
+
+from query_cache import CachedMode
+from retrieval import RetrievalMode
+
+VECTORS = {
+    "side effects of X": [1.0, 0.0, 0.0],
+    "X side effects": [0.98, 0.2, 0.0],
+    "consumer rights": [0.0, 1.0, 0.0],
+}
+
+
+class FakeStore:
+    version = 1
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed(self, texts):
+        self.embedded.extend(texts)
+        return [np.array(VECTORS[text]) for text in texts]
+
+
+class CountingMode(RetrievalMode):
+    """Returns one document naming the query, counting the queries it was asked."""
+
+    def __init__(self):
+        self.asked = []
+
+    def retrieve(self, query):
+        batch, elapsed = self.retrieve_many([query])
+        return batch[0], elapsed
+
+    def retrieve_many(self, queries):
+        self.asked.extend(queries)
+        self.last_stages = [{"inner": True} for _ in queries]
+        return [[{"content": query, "metadata": {}}] for query in queries], 0.0
+
+
+def make_cache(**kwargs):
+    mode, store = CountingMode(), FakeStore()
+    return CachedMode(mode, store, **kwargs), mode, store
+
+
+def test_exact_hit_skips_the_mode():
+    cache, mode, _ = make_cache()
+    first, _ = cache.retrieve("consumer rights")
+    second, _ = cache.retrieve("consumer rights")
+    assert second == first
+    assert mode.asked == ["consumer rights"]
+    assert cache.last_stages == [{"cache": "exact"}]
+    assert cache.stats()["exact"] == 1 and cache.stats()["miss"] == 1
+
+
+def test_duplicates_in_one_batch_are_fetched_once():
+    cache, mode, _ = make_cache()
+    documents, _ = cache.retrieve_many(["consumer rights", "consumer rights"])
+    assert mode.asked == ["consumer rights"]
+    assert documents[0] == documents[1]
+    assert [stage["cache"] for stage in cache.last_stages] == ["miss", "exact"]
+
+
+def test_semantic_hit_above_threshold():
+    cache, mode, _ = make_cache(semantic_threshold=0.95)
+    cache.retrieve("side effects of X")
+    documents, _ = cache.retrieve("X side effects")
+    assert mode.asked == ["side effects of X"]
+    assert documents[0]["content"] == "side effects of X"
+    assert cache.last_stages == [{"cache": "semantic"}]
+
+
+def test_semantic_miss_below_threshold():
+    cache, mode, _ = make_cache(semantic_threshold=0.995)
+    cache.retrieve("side effects of X")
+    cache.retrieve("X side effects")
+    assert mode.asked == ["side effects of X", "X side effects"]
+    assert cache.last_stages[0]["cache"] == "miss"
+
+
+def test_entries_expire_after_ttl():
+    cache, mode, _ = make_cache(ttl_seconds=60)
+    cache.retrieve("consumer rights")
+    cache.entries["consumer rights"]["created"] -= 61
+    cache.retrieve("consumer rights")
+    assert mode.asked == ["consumer rights", "consumer rights"]
+    assert cache.stats()["expired"] == 1
+
+
+def test_store_version_bump_invalidates():
+    cache, mode, store = make_cache(semantic_threshold=0.95)
+    cache.retrieve("side effects of X")
+    store.version += 1
+    cache.retrieve("X side effects")
+    cache.retrieve("side effects of X")
+    assert mode.asked == ["side effects of X", "X side effects"]
+    assert [stage["cache"] for stage in cache.last_stages] == ["semantic"]
+
+
+def test_lru_eviction():
+    cache, mode, _ = make_cache(max_entries=1)
+    cache.retrieve("consumer rights")
+    cache.retrieve("side effects of X")
+    cache.retrieve("consumer rights")
+    assert mode.asked == ["consumer rights", "side effects of X", "consumer rights"]
+    assert cache.stats()["evicted"] == 2
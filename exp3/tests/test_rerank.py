@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+import rerank
+from conftest import make_chunk
+from rerank import LexicalOverlapScorer, RerankedRAGMode, Reranker, default_scorer
+
+
+class SleepyScorer:
+    """Scores passages by length, sleeping per pair for queries marked slow."""
+
+    def __init__(self, seconds_per_pair):
+        self.seconds_per_pair = seconds_per_pair
+        self.calls = []
+
+    def score(self, pairs):
+        self.calls.append(len(pairs))
+        for query, _ in pairs:
+            time.sleep(self.seconds_per_pair.get(query, 0.0))
+        return [float(len(passage)) for _, passage in pairs]
+
+
+def docs(*lengths):
+    return [{"id": str(n), "content": "x" * n} for n in lengths]
+
+
+def test_reranks_each_query():
+    reranker = Reranker(SleepyScorer({}), budget_ms=1000)
+    results, reranked = reranker.rerank_many(["a", "b"], [docs(1, 3, 2), docs(5, 4)], k=2)
+    assert [[d["id"] for d in r] for r in results] == [["3", "2"], ["5", "4"]]
+    assert reranked == [True, True]
+
+
+def test_batches_are_shared_across_queries():
+    scorer = SleepyScorer({})
+    reranker = Reranker(scorer, budget_ms=1000)
+    _, reranked = reranker.rerank_many(["a", "b", "c"], [docs(1, 2, 3, 4)] * 3, k=2)
+    assert reranked == [True, True, True]
+    assert scorer.calls == [1, 11]  # probe, then every remaining pair in one call
+
+
+def test_slow_query_does_not_spend_later_budgets():
+    reranker = Reranker(SleepyScorer({"slow": 0.01}), budget_ms=30)
+    results, reranked = reranker.rerank_many(
+        ["slow", "fast"], [docs(*range(1, 21)), docs(1, 2, 3)], k=3
+    )
+    assert reranked == [False, True]
+    assert [d["id"] for d in results[0]] == ["1", "2", "3"]  # first-stage order kept
+    assert [d["id"] for d in results[1]] == ["3", "2", "1"]
+
+
+def test_deadline_checked_between_batches():
+    scorer = SleepyScorer({"slow": 0.005})
+    reranker = Reranker(scorer, budget_ms=40, batch_size=32)
+    start = time.perf_counter()
+    _, reranked = reranker.rerank_many(["slow"], [docs(*range(1, 101))], k=3)
+    elapsed = time.perf_counter() - start
+    assert reranked == [False]
+    assert scorer.calls[0] == 1  # first call probes the scorer's speed
+    assert max(scorer.calls) < 32
+    assert elapsed < 0.040 + 0.030
+
+
+def test_lexical_scorer_is_the_default():
+    assert isinstance(default_scorer(), LexicalOverlapScorer)
+    assert isinstance(Reranker().scorer, LexicalOverlapScorer)
+
+
+def test_cross_encoder_falls_back_to_lexical(monkeypatch, caplog):
+    monkeypatch.setattr(rerank, "CROSS_ENCODER_AVAILABLE", True)
+    monkeypatch.setattr(rerank, "model_cached", lambda name: False)
+    with caplog.at_level("WARNING", logger="rerank"):
+        scorer = default_scorer(cross_encoder=True)
+    assert isinstance(scorer, LexicalOverlapScorer)
+    assert "not available offline" in caplog.text
+
+
+def test_stages_record_the_scorer(numpy_store):
+    numpy_store.add_documents([make_chunk(f"c{i}", f"מסמך מספר {i}") for i in range(8)])
+    mode = RerankedRAGMode(numpy_store, Reranker(LexicalOverlapScorer()), k=2)
+    mode.retrieve_many(["מסמך"])
+    assert mode.last_stages[0]["scorer"] == "lexical"
@@ -0,0 +1,45 @@
+"""Nearest-centroid routing, the min_margin fallback and partitioned search."""
+
+import numpy as np
+
+from conftest import make_chunk
+from routing import CategoryRouter, RoutedRAGMode
+
+CENTROIDS = {"law": np.array([1.0, 0.0]), "medicine": np.array([0.0, 1.0])}
+
+
+def test_routes_to_nearest_centroid():
+    router = CategoryRouter(CENTROIDS, min_margin=0.02)
+    assert router.route([[0.9, 0.1], [0.2, 0.8]]) == ["law", "medicine"]
+
+
+def test_ambiguous_query_is_left_unrouted():
+    router = CategoryRouter(CENTROIDS, min_margin=0.2)
+    # similarities 0.78 vs 0.62: margin 0.16 is below 0.2
+    assert router.route([[0.78, 0.62], [1.0, 0.0]]) == [None, "law"]
+
+
+def test_single_category_always_routes():
+    router = CategoryRouter({"law": np.array([1.0, 0.0])}, min_margin=0.5)
+    assert router.route([[0.0, 1.0]]) == ["law"]
+
+
+def test_empty_router_routes_nothing():
+    assert CategoryRouter({}).route([[1.0, 0.0]]) == [None]
+
+
+def test_centroids_from_store_and_filtered_search(numpy_store):
+    numpy_store.add_documents([
+        make_chunk(1, "contract breach damages", category="law"),
+        make_chunk(2, "contract tenant lease", category="law"),
+        make_chunk(3, "fever headache dosage", category="medicine"),
+        make_chunk(4, "dosage tablet nausea", category="medicine"),
+    ])
+    router = CategoryRouter.from_store(numpy_store, min_margin=0.0, page_size=3)
+    assert router.categories == ["law", "medicine"]
+
+    mode = RoutedRAGMode(numpy_store, router, k=3)
+    documents, routes, _ = mode.retrieve_routed(["contract damages", "dosage headache"])
+    assert routes == ["law", "medicine"]
+    assert {d["metadata"]["category"] for d in documents[0]} == {"law"}
+    assert {d["metadata"]["category"] for d in documents[1]} == {"medicine"}
@@ -0,0 +1,45 @@
+"""Determinism and planted facts of the synthetic corpus."""
+
+import json
+
+from synthetic import entity_name, generate_corpus, generate_document, iter_queries, planted_fact
+
+
+def read_corpus(directory):
+    documents = []
+    for shard in sorted(directory.glob("docs-*.jsonl")):
+        with open(shard, encoding="utf-8") as f:
+            documents.extend(json.loads(line) for line in f)
+    return documents
+
+
+def test_same_seed_same_corpus(tmp_path):
+    first = generate_corpus(str(tmp_path / "a"), 50, seed=7, shard_size=20, workers=2, num_queries=10)
+    second = generate_corpus(str(tmp_path / "b"), 50, seed=7, shard_size=20, workers=1, num_queries=10)
+    assert first == second
+    for name in ["docs-00000.jsonl", "docs-00001.jsonl", "docs-00002.jsonl", "queries.jsonl"]:
+        assert (tmp_path / "a" / name).read_bytes() == (tmp_path / "b" / name).read_bytes()
+
+
+def test_different_seed_differs():
+    assert generate_document(3, seed=1) != generate_document(3, seed=2)
+
+
+def test_planted_facts_are_in_their_documents(tmp_path):
+    generate_corpus(str(tmp_path), 40, seed=3, shard_size=15, workers=1, num_queries=40)
+    documents = {doc["id"]: doc for doc in read_corpus(tmp_path)}
+    assert sorted(documents) == list(range(40))
+
+    queries = list(iter_queries(str(tmp_path)))
+    assert len(queries) == 40
+    for query in queries:
+        document = documents[query["doc_id"]]
+        fact = planted_fact(query["doc_id"], seed=3)
+        assert fact["sentence"] in document["content"]
+        assert query["answer"] in document["content"]
+        assert query["category"] == document["category"]
+
+
+def test_entity_names_are_unique():
+    names = [entity_name(i) for i in range(5000)]
+    assert len(set(names)) == len(names)
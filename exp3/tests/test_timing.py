@@ -0,0 +1,69 @@
+"""Latency histogram accuracy and span recording."""
+
+import random
+import threading
+
+import pytest
+
+from timing import LatencyHistogram, SpanRecorder
+
+
+def exact_percentile(values, p):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+@pytest.mark.parametrize("precision_bits", [5, 7])
+def test_percentiles_within_relative_error(precision_bits):
+    rng = random.Random(0)
+    values = [int(rng.lognormvariate(15, 1.5)) for _ in range(5000)]
+    histogram = LatencyHistogram(precision_bits)
+    for value in values:
+        histogram.record(value)
+    bound = 2.0 ** -(precision_bits - 1)
+    for p in (1, 25, 50, 90, 95, 99, 99.9, 100):
+        expected = exact_percentile(values, p)
+        assert abs(histogram.percentile(p) - expected) <= bound * expected
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in range(100):
+        histogram.record(value)
+    assert [histogram.percentile(p) for p in (1, 50, 100)] == [0, 49, 99]
+
+
+def test_summary_in_milliseconds():
+    histogram = LatencyHistogram()
+    for ms in (1, 2, 3, 4):
+        histogram.record(ms * 1_000_000)
+    summary = histogram.summary()
+    assert summary["count"] == 4
+    assert summary["mean_ms"] == pytest.approx(2.5)
+    assert summary["max_ms"] == 4.0
+    assert summary["p50_ms"] == pytest.approx(2.0, rel=1 / 64)
+
+
+def test_empty_histogram():
+    assert LatencyHistogram().summary()["p99_ms"] == 0.0
+
+
+def test_span_recorder_counts_every_span_across_threads():
+    recorder = SpanRecorder()
+
+    def work():
+        for _ in range(200):
+            with recorder.span("stage") as timed:
+                pass
+            assert timed.ns >= 0
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert recorder.summary()["stage"]["count"] == 800
+    recorder.reset()
+    assert recorder.summary() == {}